@@ -0,0 +1,108 @@
+"""Memory and speed of the channel models on large result sets.
+
+Compares :class:`rarapla.models.channel.Channel` with a plain mutable
+dataclass holding the same fields, the way Channel used to be defined.
+Run from the repository root::
+
+    python benchmarks/bench_models.py [--count 10000]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any
+
+from rarapla.models.channel import Channel
+from rarapla.services.channel_diff import diff_channels
+
+
+@dataclass
+class PlainChannel:
+    id: str
+    name: str
+    logo_url: str | None
+    program_title: str
+    program_image: str | None
+    stream_url: str | None = None
+    program_end: datetime | None = None
+
+
+def _rows(count: int) -> list[tuple[Any, ...]]:
+    """Build raw fields the way parsed JSON hands them over: fresh strings."""
+    rows = []
+    for i in range(count):
+        tag = i % 200
+        rows.append(
+            (
+                "".join(["st", str(i)]),
+                "".join(["Station ", str(tag)]),
+                "".join(["https://cdn.example/logo/", str(tag), ".png"]),
+                "".join(["Program ", str(i % 50)]),
+                "".join(["https://cdn.example/img/", str(i % 50), ".jpg"]),
+                "".join(["https://stream.example/", str(i)]),
+                None,
+            )
+        )
+    return rows
+
+
+def _retained(build: Callable[[], list[Any]]) -> tuple[list[Any], int]:
+    """Return what ``build`` made and the bytes still held once it returns."""
+    gc.collect()
+    tracemalloc.start()
+    items = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return items, size
+
+
+def _timeit(fn: Callable[[], object], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000)
+    count = parser.parse_args().count
+
+    print(f"{count} channels")
+    print(
+        f"{'model':<14}{'memory KiB':>12}{'build ms':>10}"
+        f"{'equal ms':>10}{'differ ms':>11}"
+    )
+    results: dict[str, list[Any]] = {}
+    for label, cls in (("PlainChannel", PlainChannel), ("Channel", Channel)):
+        items, size = _retained(lambda: [cls(*r) for r in _rows(count)])
+        raw = _rows(count)
+        build = _timeit(lambda: [cls(*r) for r in raw])
+        twins = [cls(*r) for r in _rows(count)]
+        others = [replace(ch, program_title="Other") for ch in twins]
+        equal = _timeit(lambda: [a == b for a, b in zip(items, twins)])
+        differ = _timeit(lambda: [a == b for a, b in zip(items, others)])
+        results[label] = items
+        print(
+            f"{label:<14}{size / 1024:>12.0f}{build * 1000:>10.1f}"
+            f"{equal * 1000:>10.2f}{differ * 1000:>11.2f}"
+        )
+
+    old = results["Channel"]
+    new = [
+        replace(ch, program_title=ch.program_title + "!") if i % 10 == 0 else ch
+        for i, ch in enumerate(old)
+    ]
+    diff_ms = _timeit(lambda: diff_channels(old, new)) * 1000
+    print(f"diff with 10% changed: {diff_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
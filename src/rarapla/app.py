@@ -1,20 +1,28 @@
 import os
 import sys
+import time
 from textwrap import dedent
 
+# Imported before anything heavy so the startup clock covers those imports.
+from rarapla import startup_profile
 from PySide6.QtCore import (
     QLoggingCategory,
     QMessageLogContext,
+    QTimer,
     QtMsgType,
     qInstallMessageHandler,
 )
 from PySide6.QtGui import QColor, QFont, QIcon, QPalette
 from PySide6.QtWidgets import QApplication
-from rarapla.config import PROXY_HOST, PROXY_PORT
+from rarapla.config import PROXY_HOST, PROXY_PORT, STARTUP_TIMING_TIMEOUT_SEC
 from rarapla.logging_config import setup_logging
-from rarapla.proxy.radiko_proxy import RadikoProxyServer
+from rarapla.proxy.background import BackgroundProxy
+from rarapla.proxy.ports import find_open_port
+from rarapla.startup_profile import PROFILE_FLAG, TIMING_FLAG, profile_startup
 from rarapla.ui.main_window import MainWindow
 
+startup_profile.mark("imports")
+
 os.environ["QT_LOGGING_RULES"] = ";".join(
     [
         "qt.multimedia.debug=false",
@@ -36,10 +44,33 @@ def _qt_msg_filter(
         return
 
 
+def _quit_when_started(app: QApplication, proxy: BackgroundProxy) -> None:
+    """For ``--startup-timing``: report the marks once the proxy is up.
+
+    A proxy that failed to start ends the run as well.
+    """
+    deadline = time.monotonic() + STARTUP_TIMING_TIMEOUT_SEC
+    timer = QTimer(app)
+
+    def _check() -> None:
+        ended = proxy.ready.is_set() or proxy.error is not None
+        if ended or time.monotonic() > deadline:
+            timer.stop()
+            startup_profile.emit_marks()
+            app.quit()
+
+    timer.timeout.connect(_check)
+    timer.start(10)
+
+
 def main() -> None:
+    if PROFILE_FLAG in sys.argv[1:]:
+        sys.exit(profile_startup([a for a in sys.argv[1:] if a != PROFILE_FLAG]))
+    timing = TIMING_FLAG in sys.argv[1:]
     print("=== __main__ started ===")
     setup_logging()
-    app = QApplication(sys.argv)
+    app = QApplication([a for a in sys.argv if a != TIMING_FLAG])
+    startup_profile.mark("qapplication")
     app.setWindowIcon(QIcon("icon.ico"))
     font = QFont("Meiryo UI", 10)
     app.setFont(font)
@@ -60,66 +91,28 @@ def main() -> None:
         import qdarkstyle
 
         base = qdarkstyle.load_stylesheet()
-        app.setStyleSheet(
-            base
-            + dedent(
-                """
-                /* QListWidget のデフォルト矩形ハイライトを消す */
-                QListWidget::item:selected {
-                    background: transparent;
-                }
-
-                /* 通常は枠のみ（完全透明） */
-                #ChannelCard {
-                    border: 1px solid rgba(255,255,255,0.18);
-                    border-radius: 4px;
-                    background: transparent;
-                }
-
-                /* hover */
-                #ChannelCard:hover {
-                    border-color: rgba(255,255,255,0.30);
-                    background: rgba(255,255,255,0.04);
-                }
-
-                /* ダイナミックプロパティ selected=true のときだけ色を付ける */
-                #ChannelCard[selected="true"] {
-                    border-color: #3daee9;
-                    background: rgba(61,174,233,0.2);
-                }
-
-                /* ラベルは透過（ロゴ・文字の四角防止） */
-                #ChannelCard QLabel {
-                    background: transparent;
-                }
-
-                #ChannelCard QLabel#ChannelIcon {
-                    background: white;
-                    border-radius: 4px;
-                }
-
-                /* タイトルを太字・大きめ */
-                #ChannelCard #ChannelName {
-                    font-weight: bold;
-                    font-size: 14pt;
-                }
+        app.setStyleSheet(base + dedent("""
                 #DetailTitle {
                     font-weight: bold;
                     font-size: 14pt;
                 }
-                """
-            )
-        )
+                """))
     except Exception:
         pass
     pal = app.palette()
     pal.setColor(QPalette.ColorRole.Link, QColor("#5CC9F5"))
     pal.setColor(QPalette.ColorRole.LinkVisited, QColor("#3DAEE9"))
     app.setPalette(pal)
-    proxy = RadikoProxyServer(host=PROXY_HOST, port=PROXY_PORT)
-    proxy.start_in_thread()
-    w = MainWindow(proxy_host=PROXY_HOST, proxy_port=proxy.port)
+    startup_profile.mark("style")
+    port = find_open_port(PROXY_HOST, PROXY_PORT)
+    proxy = BackgroundProxy(PROXY_HOST, port)
+    w = MainWindow(proxy_host=PROXY_HOST, proxy_port=port, proxy=proxy)
+    startup_profile.mark("main window")
     w.show()
+    QTimer.singleShot(0, lambda: startup_profile.mark("first frame"))
+    QTimer.singleShot(0, proxy.start)
+    if timing:
+        _quit_when_started(app, proxy)
     code = app.exec()
     proxy.stop()
     sys.exit(code)
@@ -9,10 +9,67 @@ USER_AGENT = (
 # Proxy settings
 PROXY_HOST = "127.0.0.1"
 PROXY_PORT = 3032
+# How long to wait for the proxy to accept connections before giving up.
+PROXY_START_TIMEOUT_SEC = 10
+# How long shutdown waits for a proxy that is still starting.
+PROXY_STOP_TIMEOUT_SEC = 10
 
 # Network
 HTTP_TIMEOUT = 10
 
+# Radio Browser mirrors
+RB_DISCOVERY_HOST = "all.api.radio-browser.info"
+RB_FALLBACK_SERVERS = (
+    "https://de1.api.radio-browser.info",
+    "https://de2.api.radio-browser.info",
+    "https://fi1.api.radio-browser.info",
+)
+RB_CONNECT_TIMEOUT_SEC = 3
+RB_PROBE_TIMEOUT_SEC = 2
+RB_MIRROR_TTL_SEC = 30 * 60
+RB_SEARCH_LIMIT = 100
+RB_PAGE_SIZE = 25
+RB_STREAM_CHUNK_SIZE = 16 * 1024
+# Finished preset searches are reused for this long, so flipping back to a
+# preset shows its stations at once.
+RB_RESULTS_TTL_SEC = 5 * 60
+RB_RESULTS_CACHE_SIZE = 16
+
+# Radio Browser click reporting
+RB_CLICK_QUEUE_FILE = "rb_clicks.json"
+RB_CLICK_TIMEOUT_SEC = 5
+RB_CLICK_DEDUPE_SEC = 10 * 60
+RB_CLICK_RETRY_BASE_SEC = 2.0
+RB_CLICK_RETRY_MAX_SEC = 5 * 60
+RB_CLICK_MAX_ATTEMPTS = 6
+RB_CLICK_MAX_AGE_SEC = 24 * 60 * 60
+
+# Radio Browser offline catalog
+RB_CATALOG_ENABLED = False
+RB_CATALOG_FILE = "rb_catalog.sqlite3"
+RB_CATALOG_PAGE_SIZE = 10000
+RB_CATALOG_REFRESH_SEC = 24 * 60 * 60
+RB_CATALOG_FULL_SYNC_SEC = 7 * 24 * 60 * 60
+
+# Radio Browser stream health checks
+RB_STREAM_PROBE_CONCURRENCY = 8
+RB_STREAM_PROBE_TIMEOUT_SEC = 5
+RB_STREAM_PROBE_BYTES = 4096
+RB_STREAM_PROBE_TTL_SEC = 10 * 60
+
+# Now-playing history
+HISTORY_FILE = "history.sqlite3"
+HISTORY_BATCH_SIZE = 32
+HISTORY_FLUSH_SEC = 2.0
+
+# Session state
+SESSION_FILE = "session.json"
+# Channel snapshots older than this are not shown at startup.
+SESSION_SNAPSHOT_MAX_AGE_SEC = 24 * 60 * 60
+
+# Radiko area detection
+RADIKO_AREA_TTL_SEC = 6 * 60 * 60
+
 # Window geometry
 WINDOW_MIN_HEIGHT = 400
 WINDOW_DEFAULT_HEIGHT = 720
@@ -21,6 +78,26 @@ WINDOW_DEFAULT_HEIGHT = 720
 AUDIO_MIN_VOLUME = 0
 AUDIO_MAX_VOLUME = 100
 AUDIO_DEFAULT_VOLUME = 33
+# A station loaded but not yet played starts from what the player already
+# buffered if play is pressed within this time; later it is reopened so a
+# live stream does not start behind.
+PLAYER_PRELOAD_MAX_AGE_SEC = 60
+# Switching stations while playing keeps the old one audible until the new
+# one has audio, then crossfades; a new stream that stays silent this long
+# replaces the old one anyway.
+PLAYER_CROSSFADE_MS = 400
+PLAYER_SWITCH_TIMEOUT_MS = 8000
+
+# Image cache
+IMAGE_CACHE_DIR = "image_cache"
+IMAGE_DISK_CACHE_BYTES = 64 * 1024 * 1024
+IMAGE_MEMORY_CACHE_BYTES = 32 * 1024 * 1024
+IMAGE_DECODE_WORKERS = 2
+IMAGE_BATCH_MS = 16
+
+# Text layout cache
+TEXT_LAYOUT_CACHE_SIZE = 4096
+SOFT_WRAP_CHUNK = 8
 
 # Channel card widget
 CARD_HEIGHT = 84
@@ -35,9 +112,43 @@ RADIKO_RETRY_DELAY_SEC = 0.1
 # ICY stream watcher
 ICY_STOP_TIMEOUT_SEC = 1.0
 ICY_CONNECT_TIMEOUT_SEC = 10
-ICY_READ_TIMEOUT_SEC = 2.0
 ICY_METADATA_BLOCK_SIZE = 16
 ICY_RETRY_DELAY_SEC = 1.0
+# Relay direct streams through the proxy so ICY metadata is read from the
+# same connection as the audio instead of a second one.
+ICY_RELAY_ENABLED = True
+ICY_EVENT_HEARTBEAT_SEC = 15
+ICY_EVENT_QUEUE_SIZE = 16
+
+# Direct stream relay
+RELAY_BUFFER_BYTES = 1024 * 1024
+RELAY_PREROLL_BYTES = 64 * 1024
+RELAY_IDLE_SEC = 15
+RELAY_RECONNECT_BASE_SEC = 0.5
+RELAY_RECONNECT_MAX_SEC = 5
+RELAY_MAX_OUTAGE_SEC = 30
+
+# Background tasks
+TASK_WORKERS = 4
+
+# Startup
+# Pressing play should be audible within this budget; the last station is
+# resolved while the window loads so resuming it fits comfortably.
+FIRST_AUDIO_BUDGET_MS = 2000
+# The same for picking another station while one is playing, measured from
+# the click until the new station is heard.
+SWITCH_BUDGET_MS = 2000
+# ``--startup-timing`` prints its marks once the proxy is up, or after this
+# long if it never comes up.
+STARTUP_TIMING_TIMEOUT_SEC = 10
 
 # UI refresh
-NOW_REFRESH_INTERVAL_MS = 5000
+# Now-playing titles only change at program boundaries, so the refresher
+# wakes just after the earliest upcoming one and otherwise polls slowly.
+NOW_MIN_REFRESH_MS = 5000
+NOW_SAFETY_POLL_MS = 10 * 60 * 1000
+NOW_BOUNDARY_GRACE_MS = 5000
+NOW_STALE_RETRY_SEC = 2 * 60
+NOW_ERROR_BACKOFF_MAX_MS = 5 * 60 * 1000
+# Source switches wait this long for the selection to settle.
+SOURCE_SWITCH_DEBOUNCE_MS = 250
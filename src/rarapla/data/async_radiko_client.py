@@ -0,0 +1,180 @@
+"""Asyncio-native client for the Radiko HTTP APIs."""
+
+import asyncio
+import time
+from types import TracebackType
+
+import aiohttp
+from rarapla.config import HTTP_TIMEOUT, RADIKO_AREA_TTL_SEC, USER_AGENT
+from rarapla.data.radiko_client import (
+    AREA_URL,
+    jst_now,
+    now_programs_url,
+    parse_area_id,
+    parse_now_programs,
+    parse_program_from_date,
+    parse_program_from_weekly,
+    parse_station_logos,
+    program_date_url,
+    program_weekly_url,
+    station_list_url,
+)
+from rarapla.models.channel import Channel
+from rarapla.models.program import Program
+
+
+class AsyncRadikoClient:
+    """Interact with the public Radiko HTTP APIs from an asyncio loop.
+
+    All requests go through a single :class:`aiohttp.ClientSession`, so
+    several calls awaited concurrently on the same loop share its
+    connection pool. Pass the session of an existing component (such as
+    the proxy server) to reuse its pool as well.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession | None = None,
+        area_ttl_sec: float = RADIKO_AREA_TTL_SEC,
+    ) -> None:
+        """Create a new client.
+
+        Args:
+            session: Optional session to share. When omitted the client
+                creates its own on first use and closes it in :meth:`close`.
+            area_ttl_sec: How long a detected area identifier stays valid.
+        """
+        self._session: aiohttp.ClientSession | None = session
+        self._owns_session: bool = session is None
+        self._area_ttl_sec: float = area_ttl_sec
+        self._area_id: str | None = None
+        self._area_checked_at: float = 0.0
+        self._area_lock: asyncio.Lock | None = None
+        self._logos: dict[str, dict[str, str]] = {}
+        self._logos_lock: asyncio.Lock | None = None
+
+    async def __aenter__(self) -> "AsyncRadikoClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the session if it was created by this client."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _http(self) -> aiohttp.ClientSession:
+        """Return the session, creating it on the running loop if needed."""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT),
+                headers={"User-Agent": USER_AGENT},
+            )
+        return self._session
+
+    async def _get_text(self, url: str) -> tuple[int, str]:
+        """GET ``url`` and return its status code and body."""
+        async with self._http().get(url) as r:
+            return r.status, await r.text()
+
+    async def _get_ok_text(self, url: str) -> str:
+        """GET ``url`` and return its body, raising on HTTP errors."""
+        async with self._http().get(url) as r:
+            r.raise_for_status()
+            return await r.text()
+
+    async def get_area_id(self, refresh: bool = False) -> str:
+        """Return the listener's area identifier.
+
+        See :meth:`rarapla.data.radiko_client.RadikoClient.get_area_id`.
+        Concurrent callers wait for a single detection request.
+
+        Args:
+            refresh: Ignore the cached value and detect the area again.
+        """
+        if self._area_lock is None:
+            self._area_lock = asyncio.Lock()
+        async with self._area_lock:
+            now = time.monotonic()
+            if (
+                not refresh
+                and self._area_id is not None
+                and now - self._area_checked_at < self._area_ttl_sec
+            ):
+                return self._area_id
+            area = parse_area_id(await self._get_ok_text(AREA_URL))
+            self._area_id = area
+            self._area_checked_at = now
+            return area
+
+    def invalidate_area_id(self) -> None:
+        """Forget the cached area so the next lookup detects it again."""
+        self._area_id = None
+        self._area_checked_at = 0.0
+        self._logos.clear()
+
+    async def station_logos(self, area_id: str) -> dict[str, str]:
+        """Return station logo URLs for an area.
+
+        See :meth:`rarapla.data.radiko_client.RadikoClient.station_logos`.
+        Concurrent callers wait for a single download.
+        """
+        if self._logos_lock is None:
+            self._logos_lock = asyncio.Lock()
+        async with self._logos_lock:
+            logos = self._logos.get(area_id)
+            if logos is None:
+                logos = await self.fetch_station_logos(area_id)
+                self._logos[area_id] = logos
+            return logos
+
+    async def fetch_station_logos(self, area_id: str) -> dict[str, str]:
+        """Fetch station logo URLs for an area, bypassing the cache."""
+        return parse_station_logos(await self._get_ok_text(station_list_url(area_id)))
+
+    async def fetch_now_programs(self, area_id: str) -> list[Channel]:
+        """Fetch currently airing programs for all stations in an area.
+
+        The station list and the program XML are requested concurrently.
+
+        Args:
+            area_id: Area identifier returned from :meth:`get_area_id`.
+
+        Returns:
+            List of channels with their current program information.
+        """
+        logo_map, text = await asyncio.gather(
+            self.station_logos(area_id),
+            self._get_ok_text(now_programs_url(area_id)),
+        )
+        return parse_now_programs(text, logo_map)
+
+    async def fetch_program_detail(self, station_id: str) -> Program | None:
+        """Fetch detailed information about the program currently airing.
+
+        Args:
+            station_id: Station identifier.
+
+        Returns:
+            Program details or ``None`` if the API request fails.
+        """
+        now = jst_now()
+        ymd = now.strftime("%Y%m%d")
+        now_str = now.strftime("%Y%m%d%H%M%S")
+        try:
+            status, text = await self._get_text(program_date_url(ymd, station_id))
+            if status == 404:
+                weekly = await self._get_ok_text(program_weekly_url(station_id))
+                return parse_program_from_weekly(weekly, now_str, ymd)
+            if status >= 400:
+                return None
+            return parse_program_from_date(text, now_str)
+        except (asyncio.TimeoutError, aiohttp.ClientError):
+            return None
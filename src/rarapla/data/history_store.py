@@ -0,0 +1,252 @@
+"""Append-only SQLite log of titles heard on each station."""
+
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from rarapla.config import HISTORY_BATCH_SIZE, HISTORY_FLUSH_SEC
+from rarapla.models.play import Play
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS plays (
+    id INTEGER PRIMARY KEY,
+    station TEXT NOT NULL,
+    station_name TEXT NOT NULL DEFAULT '',
+    ts REAL NOT NULL,
+    title TEXT NOT NULL,
+    artist TEXT,
+    album TEXT,
+    source TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_plays_station_ts ON plays (station, ts);
+CREATE INDEX IF NOT EXISTS idx_plays_artist ON plays (artist COLLATE NOCASE, ts);
+CREATE INDEX IF NOT EXISTS idx_plays_ts ON plays (ts);
+"""
+
+_INSERT = """
+INSERT INTO plays (station, station_name, ts, title, artist, album, source)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_COLUMNS = "station, station_name, ts, title, artist, album, source"
+
+
+def split_artist_title(title: str) -> tuple[str | None, str]:
+    """Split an ICY ``"Artist - Title"`` string into its parts.
+
+    Args:
+        title: Stream title.
+
+    Returns:
+        ``(artist, title)``; ``artist`` is ``None`` if there is no separator.
+    """
+    artist, sep, rest = title.partition(" - ")
+    if not sep or not artist.strip() or not rest.strip():
+        return None, title.strip()
+    return artist.strip(), rest.strip()
+
+
+class HistoryStore:
+    """Record now-playing titles and answer history queries.
+
+    :meth:`record` only queues the entry; a background thread writes queued
+    entries in batches, one transaction per batch, so callers on the GUI
+    thread never wait for the disk. The database runs in WAL mode so
+    queries from other threads are not blocked by the writer. Indexes cover
+    "what played on station X around time T" and "where did artist Y play".
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = HISTORY_BATCH_SIZE,
+        flush_sec: float = HISTORY_FLUSH_SEC,
+    ) -> None:
+        """Open (and create if needed) the history database.
+
+        Args:
+            path: SQLite database file, or ``":memory:"`` for tests.
+            batch_size: Write as soon as this many entries are queued.
+            flush_sec: Write queued entries at least this often.
+        """
+        self.path: str = path
+        self._batch_size = max(1, batch_size)
+        self._flush_sec = flush_sec
+        self._lock = threading.Lock()
+        self._shared: sqlite3.Connection | None = None
+        if path == ":memory:":
+            self._shared = sqlite3.connect(path, check_same_thread=False)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        self._queue: "queue.Queue[Play | None]" = queue.Queue()
+        self._last: dict[str, str] = {}
+        self._thread: threading.Thread | None = None
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Yield a connection and commit (or roll back) when done."""
+        if self._shared is not None:
+            with self._lock:
+                with self._shared:
+                    yield self._shared
+            return
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def start(self) -> None:
+        """Start the background writer."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="HistoryStore", daemon=True
+        )
+        self._thread.start()
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Write everything still queued and stop the writer."""
+        t = self._thread
+        self._thread = None
+        if t is None:
+            self.flush()
+            return
+        self._queue.put(None)
+        t.join(timeout)
+
+    def record(
+        self,
+        station_id: str,
+        station_name: str,
+        title: str,
+        artist: str | None = None,
+        album: str | None = None,
+        source: str = "",
+        ts: float | None = None,
+    ) -> bool:
+        """Queue a title for writing.
+
+        Repeats of the title last recorded for the same station are ignored.
+        When no artist is given it is taken from an ``"Artist - Title"``
+        string.
+
+        Returns:
+            ``True`` if the entry was queued.
+        """
+        title = title.strip()
+        if not title or self._last.get(station_id) == title:
+            return False
+        self._last[station_id] = title
+        if not artist:
+            artist, _ = split_artist_title(title)
+        self._queue.put(
+            Play(
+                station_id=station_id,
+                station_name=station_name,
+                ts=time.time() if ts is None else ts,
+                title=title,
+                artist=artist or None,
+                album=album or None,
+                source=source,
+            )
+        )
+        return True
+
+    def flush(self) -> int:
+        """Write every queued entry on the calling thread.
+
+        Returns:
+            Number of entries written.
+        """
+        batch: list[Play] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                batch.append(item)
+        self._write(batch)
+        return len(batch)
+
+    def around(
+        self, station_id: str, ts: float, window_sec: float = 30 * 60, limit: int = 50
+    ) -> list[Play]:
+        """Return what played on a station within ``window_sec`` of ``ts``."""
+        return self._query(
+            f"SELECT {_COLUMNS} FROM plays WHERE station = ? AND ts BETWEEN ? AND ? "
+            "ORDER BY ts LIMIT ?",
+            (station_id, ts - window_sec, ts + window_sec, limit),
+        )
+
+    def by_artist(self, artist: str, limit: int = 100) -> list[Play]:
+        """Return plays by ``artist`` (case-insensitive), newest first."""
+        return self._query(
+            f"SELECT {_COLUMNS} FROM plays WHERE artist = ? COLLATE NOCASE "
+            "ORDER BY ts DESC LIMIT ?",
+            (artist.strip(), limit),
+        )
+
+    def recent(self, limit: int = 50) -> list[Play]:
+        """Return the most recent plays across all stations."""
+        return self._query(
+            f"SELECT {_COLUMNS} FROM plays ORDER BY ts DESC LIMIT ?", (limit,)
+        )
+
+    def _run(self) -> None:
+        batch: list[Play] = []
+        deadline = time.monotonic() + self._flush_sec
+        while True:
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+                stop = False
+            else:
+                stop = item is None
+            if item is not None:
+                batch.append(item)
+            due = time.monotonic() >= deadline
+            if stop or due or len(batch) >= self._batch_size:
+                self._write(batch)
+                batch = []
+                deadline = time.monotonic() + self._flush_sec
+            if stop:
+                self.flush()
+                return
+
+    def _write(self, batch: list[Play]) -> None:
+        if not batch:
+            return
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    _INSERT,
+                    [
+                        (
+                            p.station_id,
+                            p.station_name,
+                            p.ts,
+                            p.title,
+                            p.artist,
+                            p.album,
+                            p.source,
+                        )
+                        for p in batch
+                    ],
+                )
+        except sqlite3.Error:
+            pass
+
+    def _query(self, sql: str, params: tuple[Any, ...]) -> list[Play]:
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [Play(*row) for row in rows]
@@ -2,52 +2,247 @@
 
 from datetime import datetime, timedelta, timezone
 import re
+import threading
+import time
 import xml.etree.ElementTree as ET
 import requests
-from rarapla.config import HTTP_TIMEOUT, USER_AGENT
+from rarapla.config import HTTP_TIMEOUT, RADIKO_AREA_TTL_SEC, USER_AGENT
 from rarapla.models.channel import Channel
 from rarapla.models.program import Program
 
+AREA_URL = "https://api.radiko.jp/apparea/area"
+
+_JST = timezone(timedelta(hours=9))
+
+
+def station_list_url(area_id: str) -> str:
+    """Return the URL of the station list XML for an area."""
+    return f"https://radiko.jp/v2/station/list/{area_id}.xml"
+
+
+def now_programs_url(area_id: str) -> str:
+    """Return the URL of the now-airing programs XML for an area."""
+    return f"http://radiko.jp/v3/program/now/{area_id}.xml"
+
+
+def program_date_url(ymd: str, station_id: str) -> str:
+    """Return the URL of a station's daily program XML."""
+    return f"https://radiko.jp/v3/program/station/date/{ymd}/{station_id}.xml"
+
+
+def program_weekly_url(station_id: str) -> str:
+    """Return the URL of a station's weekly program XML."""
+    return f"https://radiko.jp/v3/program/station/weekly/{station_id}.xml"
+
+
+def jst_now() -> datetime:
+    """Return the current time in Japan Standard Time."""
+    return datetime.now(_JST)
+
+
+def parse_radiko_time(value: str) -> datetime | None:
+    """Parse a ``YYYYMMDDHHMMSS`` program time as a JST datetime."""
+    try:
+        return datetime.strptime(value.strip(), "%Y%m%d%H%M%S").replace(tzinfo=_JST)
+    except ValueError:
+        return None
+
+
+def parse_area_id(text: str) -> str:
+    """Extract the area identifier from the area API response.
+
+    Raises:
+        RuntimeError: If the response does not contain an area identifier.
+    """
+    m = re.search('class="(JP\\d{2})"', text)
+    if not m:
+        raise RuntimeError("AreaId not found")
+    return m.group(1)
+
+
+def parse_station_logos(text: str) -> dict[str, str]:
+    """Map station identifiers to logo URLs from a station list XML."""
+    root = ET.fromstring(text)
+    logos: dict[str, str] = {}
+    for st in root.findall(".//station"):
+        sid = (st.findtext("id") or "").strip()
+        logo = (
+            (st.findtext("logo_medium") or "").strip()
+            or (st.findtext("logo_large") or "").strip()
+            or (st.findtext("logo_small") or "").strip()
+            or (st.findtext("logo_xsmall") or "").strip()
+        )
+        if sid and logo:
+            logos[sid] = logo
+    return logos
+
+
+def parse_now_programs(text: str, logo_map: dict[str, str]) -> list[Channel]:
+    """Build channels from a now-airing programs XML.
+
+    Args:
+        text: Body of the now-airing programs XML.
+        logo_map: Station logos as returned by :func:`parse_station_logos`.
+    """
+    root = ET.fromstring(text)
+    now = jst_now().strftime("%Y%m%d%H%M%S")
+    channels: list[Channel] = []
+    for st in root.findall(".//station"):
+        sid = st.get("id") or ""
+        name = (st.findtext("name") or "").strip()
+        progs = st.findall(".//prog")
+        prog_node = None
+        for p in progs:
+            ft = (p.get("ft") or "").strip()
+            to = (p.get("to") or "").strip()
+            if ft and to and (ft <= now <= to):
+                prog_node = p
+                break
+        if prog_node is None and progs:
+            prog_node = progs[0]
+        title = ""
+        img = None
+        end = None
+        if prog_node is not None:
+            title = (prog_node.findtext("title") or "").strip()
+            img = prog_node.findtext("img") or None
+            end = parse_radiko_time(prog_node.get("to") or "")
+        logo = logo_map.get(sid)
+        if not logo and sid:
+            logo = f"http://radiko.jp/station/logo/{sid}/logo_small.png"
+        channels.append(Channel(sid, name, logo, title, img, program_end=end))
+    return channels
+
+
+def parse_program_from_date(text: str, now_str: str) -> Program | None:
+    """Pick the program matching ``now_str`` from a date XML."""
+    root = ET.fromstring(text)
+    for prog in root.findall(".//prog"):
+        ft = prog.get("ft") or ""
+        to = prog.get("to") or ""
+        if ft <= now_str <= to:
+            return _program_from_xml(prog)
+    return None
+
+
+def parse_program_from_weekly(text: str, now_str: str, ymd: str) -> Program | None:
+    """Pick the program matching ``now_str`` from a weekly XML."""
+    root = ET.fromstring(text)
+    for day in root.findall(".//date"):
+        if day.get("yyyymmdd") != ymd:
+            continue
+        for prog in day.findall(".//prog"):
+            ft = prog.get("ft") or ""
+            to = prog.get("to") or ""
+            if ft <= now_str <= to:
+                return _program_from_xml(prog)
+    return None
+
+
+def _program_from_xml(prog: ET.Element) -> Program:
+    """Create a :class:`Program` instance from an XML node."""
+
+    # Radiko occasionally stores the long description in <info>
+    # while <desc> may be empty.  Fallback to <info> if needed.
+    def _get_desc(node: ET.Element) -> str | None:
+        text = (node.findtext("desc") or "").strip()
+        if not text:
+            text = (node.findtext("info") or "").strip()
+        return text or None
+
+    return Program(
+        title=(prog.findtext("title") or "").strip(),
+        pfm=prog.findtext("pfm") or None,
+        desc=_get_desc(prog),
+        image=prog.findtext("img") or None,
+    )
+
 
 class RadikoClient:
-    """Interact with the public Radiko HTTP APIs."""
+    """Interact with the public Radiko HTTP APIs.
 
-    def __init__(self, session: requests.Session | None = None) -> None:
+    This is the blocking counterpart of
+    :class:`rarapla.data.async_radiko_client.AsyncRadikoClient`; both share
+    the URL builders and XML parsers defined in this module.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        area_ttl_sec: float = RADIKO_AREA_TTL_SEC,
+    ) -> None:
         """Create a new client.
 
         Args:
             session: Optional preconfigured requests session.
+            area_ttl_sec: How long a detected area identifier stays valid.
         """
         self.s: requests.Session = session or requests.Session()
         self.s.headers.update({"User-Agent": USER_AGENT})
+        self._area_ttl_sec: float = area_ttl_sec
+        self._area_id: str | None = None
+        self._area_checked_at: float = 0.0
+        self._area_lock = threading.Lock()
+        self._logos: dict[str, dict[str, str]] = {}
+        self._logos_lock = threading.Lock()
+
+    def get_area_id(self, refresh: bool = False) -> str:
+        """Return the listener's area identifier.
+
+        The area is detected once and cached for the session so periodic
+        refreshes do not pay an extra round trip. Call
+        :meth:`invalidate_area_id` when the network changes or playback
+        fails because of an area restriction.
+
+        Args:
+            refresh: Ignore the cached value and detect the area again.
+        """
+        with self._area_lock:
+            now = time.monotonic()
+            if (
+                not refresh
+                and self._area_id is not None
+                and now - self._area_checked_at < self._area_ttl_sec
+            ):
+                return self._area_id
+            area = self._detect_area_id()
+            self._area_id = area
+            self._area_checked_at = now
+            return area
+
+    def invalidate_area_id(self) -> None:
+        """Forget the cached area so the next lookup detects it again."""
+        with self._area_lock:
+            self._area_id = None
+            self._area_checked_at = 0.0
+        with self._logos_lock:
+            self._logos.clear()
 
-    def get_area_id(self) -> str:
-        """Return the listener's area identifier."""
-        r = self.s.get("https://api.radiko.jp/apparea/area", timeout=HTTP_TIMEOUT)
+    def _detect_area_id(self) -> str:
+        """Query the area API and extract the area identifier."""
+        r = self.s.get(AREA_URL, timeout=HTTP_TIMEOUT)
         r.raise_for_status()
-        m = re.search('class="(JP\\d{2})"', r.text)
-        if not m:
-            raise RuntimeError("AreaId not found")
-        return m.group(1)
-
-    def _fetch_station_logos(self, area_id: str) -> dict[str, str]:
-        """Fetch station logo URLs for an area."""
-        url = f"https://radiko.jp/v2/station/list/{area_id}.xml"
-        r = self.s.get(url, timeout=HTTP_TIMEOUT)
+        return parse_area_id(r.text)
+
+    def station_logos(self, area_id: str) -> dict[str, str]:
+        """Return station logo URLs for an area.
+
+        The station list rarely changes, so it is fetched once per area and
+        kept until :meth:`invalidate_area_id`. Concurrent callers share one
+        download.
+        """
+        with self._logos_lock:
+            logos = self._logos.get(area_id)
+            if logos is None:
+                logos = self.fetch_station_logos(area_id)
+                self._logos[area_id] = logos
+            return logos
+
+    def fetch_station_logos(self, area_id: str) -> dict[str, str]:
+        """Fetch station logo URLs for an area, bypassing the cache."""
+        r = self.s.get(station_list_url(area_id), timeout=HTTP_TIMEOUT)
         r.raise_for_status()
-        root = ET.fromstring(r.text)
-        logos: dict[str, str] = {}
-        for st in root.findall(".//station"):
-            sid = (st.findtext("id") or "").strip()
-            logo = (
-                (st.findtext("logo_medium") or "").strip()
-                or (st.findtext("logo_large") or "").strip()
-                or (st.findtext("logo_small") or "").strip()
-                or (st.findtext("logo_xsmall") or "").strip()
-            )
-            if sid and logo:
-                logos[sid] = logo
-        return logos
+        return parse_station_logos(r.text)
 
     def fetch_now_programs(self, area_id: str) -> list[Channel]:
         """Fetch currently airing programs for all stations in an area.
@@ -58,37 +253,10 @@ class RadikoClient:
         Returns:
             List of channels with their current program information.
         """
-        logo_map = self._fetch_station_logos(area_id)
-        url = f"http://radiko.jp/v3/program/now/{area_id}.xml"
-        r = self.s.get(url, timeout=HTTP_TIMEOUT)
+        r = self.s.get(now_programs_url(area_id), timeout=HTTP_TIMEOUT)
         r.raise_for_status()
-        root = ET.fromstring(r.text)
-        jst = timezone(timedelta(hours=9))
-        now = datetime.now(jst).strftime("%Y%m%d%H%M%S")
-        channels: list[Channel] = []
-        for st in root.findall(".//station"):
-            sid = st.get("id") or ""
-            name = (st.findtext("name") or "").strip()
-            progs = st.findall(".//prog")
-            prog_node = None
-            for p in progs:
-                ft = (p.get("ft") or "").strip()
-                to = (p.get("to") or "").strip()
-                if ft and to and (ft <= now <= to):
-                    prog_node = p
-                    break
-            if prog_node is None and progs:
-                prog_node = progs[0]
-            title = ""
-            img = None
-            if prog_node is not None:
-                title = (prog_node.findtext("title") or "").strip()
-                img = prog_node.findtext("img") or None
-            logo = logo_map.get(sid)
-            if not logo and sid:
-                logo = f"http://radiko.jp/station/logo/{sid}/logo_small.png"
-            channels.append(Channel(sid, name, logo, title, img))
-        return channels
+        # Usually already cached, or fetched meanwhile by the startup warm-up.
+        return parse_now_programs(r.text, self.station_logos(area_id))
 
     def fetch_program_detail(self, station_id: str) -> Program | None:
         """Fetch detailed information about the program currently airing.
@@ -99,66 +267,16 @@ class RadikoClient:
         Returns:
             Program details or ``None`` if the API request fails.
         """
-        jst = timezone(timedelta(hours=9))
-        now = datetime.now(jst)
+        now = jst_now()
         ymd = now.strftime("%Y%m%d")
         now_str = now.strftime("%Y%m%d%H%M%S")
-        date_url = f"https://radiko.jp/v3/program/station/date/{ymd}/{station_id}.xml"
         try:
-            r = self.s.get(date_url, timeout=HTTP_TIMEOUT)
+            r = self.s.get(program_date_url(ymd, station_id), timeout=HTTP_TIMEOUT)
             if r.status_code == 404:
-                weekly_url = (
-                    f"https://radiko.jp/v3/program/station/weekly/{station_id}.xml"
-                )
-                rw = self.s.get(weekly_url, timeout=HTTP_TIMEOUT)
+                rw = self.s.get(program_weekly_url(station_id), timeout=HTTP_TIMEOUT)
                 rw.raise_for_status()
-                root = ET.fromstring(rw.text)
-                return self._pick_now_program_from_weekly(root, now_str, ymd)
+                return parse_program_from_weekly(rw.text, now_str, ymd)
             r.raise_for_status()
-            root = ET.fromstring(r.text)
-            return self._pick_now_program_from_date(root, now_str)
+            return parse_program_from_date(r.text, now_str)
         except requests.RequestException:
             return None
-
-    def _pick_now_program_from_date(
-        self, root: ET.Element, now_str: str
-    ) -> Program | None:
-        """Pick the program matching ``now_str`` from a date XML."""
-        for prog in root.findall(".//prog"):
-            ft = prog.get("ft") or ""
-            to = prog.get("to") or ""
-            if ft <= now_str <= to:
-                return self._program_from_xml(prog)
-        return None
-
-    def _pick_now_program_from_weekly(
-        self, root: ET.Element, now_str: str, ymd: str
-    ) -> Program | None:
-        """Pick the program matching ``now_str`` from a weekly XML."""
-        for day in root.findall(".//date"):
-            if day.get("yyyymmdd") != ymd:
-                continue
-            for prog in day.findall(".//prog"):
-                ft = prog.get("ft") or ""
-                to = prog.get("to") or ""
-                if ft <= now_str <= to:
-                    return self._program_from_xml(prog)
-        return None
-
-    def _program_from_xml(self, prog: ET.Element) -> Program:
-        """Create a :class:`Program` instance from an XML node."""
-
-        # Radiko occasionally stores the long description in <info>
-        # while <desc> may be empty.  Fallback to <info> if needed.
-        def _get_desc(node: ET.Element) -> str | None:
-            text = (node.findtext("desc") or "").strip()
-            if not text:
-                text = (node.findtext("info") or "").strip()
-            return text or None
-
-        return Program(
-            title=(prog.findtext("title") or "").strip(),
-            pfm=prog.findtext("pfm") or None,
-            desc=_get_desc(prog),
-            image=prog.findtext("img") or None,
-        )
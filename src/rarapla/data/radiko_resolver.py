@@ -1,9 +1,26 @@
 """Resolve Radiko live stream URLs using Streamlink."""
 
+import threading
+from typing import TYPE_CHECKING
+
 import requests
-from streamlink import Streamlink  # type: ignore[attr-defined]
 from rarapla.config import USER_AGENT
 
+if TYPE_CHECKING:
+    from streamlink import Streamlink as _Streamlink  # type: ignore[attr-defined]
+
+# Streamlink is slow to import, so it is only loaded once a resolver needs it.
+Streamlink: "type[_Streamlink] | None" = None
+
+
+def _streamlink_class() -> "type[_Streamlink]":
+    global Streamlink
+    if Streamlink is None:
+        from streamlink import Streamlink as cls  # type: ignore[attr-defined]
+
+        Streamlink = cls
+    return Streamlink
+
 
 class ResolvedStream:
     """Container for a resolved Radiko stream."""
@@ -20,12 +37,28 @@ class ResolvedStream:
 
 
 class RadikoResolver:
-    """Resolve Radiko station IDs into playable stream URLs."""
+    """Resolve Radiko station IDs into playable stream URLs.
+
+    Streamlink takes a noticeable time to import and set up, so its session
+    is only created on first use or by :meth:`warm_up`.
+    """
 
     def __init__(self) -> None:
-        """Create a new resolver with a preconfigured Streamlink session."""
-        self._session: Streamlink = Streamlink()
-        self._session.set_option("http-headers", {"User-Agent": USER_AGENT})
+        """Create a resolver; the Streamlink session is created lazily."""
+        self._session: "_Streamlink | None" = None
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """Import Streamlink and create its session ahead of the first use."""
+        self._streamlink()
+
+    def _streamlink(self) -> "_Streamlink":
+        with self._lock:
+            if self._session is None:
+                session = _streamlink_class()()
+                session.set_option("http-headers", {"User-Agent": USER_AGENT})
+                self._session = session
+            return self._session
 
     def resolve_live(self, station_id: str) -> ResolvedStream | None:
         """Resolve the live stream for a station.
@@ -37,7 +70,7 @@ class RadikoResolver:
             The resolved stream information or ``None`` if not available.
         """
         url = f"https://radiko.jp/#!/live/{station_id}"
-        streams = self._session.streams(url)
+        streams = self._streamlink().streams(url)
         stream = streams.get("best")
         if not stream:
             return None
@@ -46,4 +79,4 @@ class RadikoResolver:
     @property
     def http(self) -> requests.Session:
         """Expose the underlying requests session used by Streamlink."""
-        return self._session.http
+        return self._streamlink().http
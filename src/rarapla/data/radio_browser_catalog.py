@@ -0,0 +1,451 @@
+"""Local SQLite copy of the Radio Browser station list."""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from rarapla.config import (
+    RB_CATALOG_FULL_SYNC_SEC,
+    RB_CATALOG_PAGE_SIZE,
+    RB_CATALOG_REFRESH_SEC,
+)
+from rarapla.models.channel import Channel
+
+if TYPE_CHECKING:
+    from rarapla.data.radio_browser_client import RadioBrowserClient
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stations (
+    id INTEGER PRIMARY KEY,
+    uuid TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    favicon TEXT,
+    tags TEXT NOT NULL DEFAULT '',
+    countrycode TEXT NOT NULL DEFAULT '',
+    codec TEXT NOT NULL DEFAULT '',
+    bitrate INTEGER NOT NULL DEFAULT 0,
+    clickcount INTEGER NOT NULL DEFAULT 0,
+    ok INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_stations_country
+    ON stations (countrycode, clickcount DESC);
+CREATE INDEX IF NOT EXISTS idx_stations_codec ON stations (codec);
+CREATE INDEX IF NOT EXISTS idx_stations_bitrate ON stations (bitrate);
+CREATE INDEX IF NOT EXISTS idx_stations_clicks ON stations (clickcount DESC);
+CREATE TABLE IF NOT EXISTS station_tags (
+    tag TEXT NOT NULL,
+    station INTEGER NOT NULL REFERENCES stations (id) ON DELETE CASCADE,
+    PRIMARY KEY (tag, station)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_station_tags_station ON station_tags (station);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS stations_fts USING fts5 (
+    name, tags, content='stations', content_rowid='id', tokenize='{tokenize}'
+);
+CREATE TRIGGER IF NOT EXISTS stations_ai AFTER INSERT ON stations BEGIN
+    INSERT INTO stations_fts (rowid, name, tags)
+    VALUES (new.id, new.name, new.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS stations_ad AFTER DELETE ON stations BEGIN
+    INSERT INTO stations_fts (stations_fts, rowid, name, tags)
+    VALUES ('delete', old.id, old.name, old.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS stations_au AFTER UPDATE ON stations BEGIN
+    INSERT INTO stations_fts (stations_fts, rowid, name, tags)
+    VALUES ('delete', old.id, old.name, old.tags);
+    INSERT INTO stations_fts (rowid, name, tags)
+    VALUES (new.id, new.name, new.tags);
+END;
+"""
+
+_STATION_COLUMNS = (
+    "uuid, name, url, favicon, tags, countrycode, codec, bitrate, clickcount, ok"
+)
+
+_UPSERT_SET = """
+ON CONFLICT (uuid) DO UPDATE SET
+    name = excluded.name,
+    url = excluded.url,
+    favicon = excluded.favicon,
+    tags = excluded.tags,
+    countrycode = excluded.countrycode,
+    codec = excluded.codec,
+    bitrate = excluded.bitrate,
+    clickcount = excluded.clickcount,
+    ok = excluded.ok
+"""
+
+_UPSERT = (
+    f"INSERT INTO stations ({_STATION_COLUMNS}) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)" + _UPSERT_SET
+)
+
+# A full sync collects the download here page by page and then swaps it
+# into ``stations`` in one transaction.
+_STAGING_SCHEMA = """
+DROP TABLE IF EXISTS staged_stations;
+DROP TABLE IF EXISTS staged_tags;
+CREATE TABLE staged_stations (
+    uuid TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    favicon TEXT,
+    tags TEXT NOT NULL,
+    countrycode TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    bitrate INTEGER NOT NULL,
+    clickcount INTEGER NOT NULL,
+    ok INTEGER NOT NULL,
+    changed TEXT NOT NULL
+);
+CREATE TABLE staged_tags (
+    uuid TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (uuid, tag)
+) WITHOUT ROWID;
+"""
+
+_COLUMNS = "s.uuid, s.name, s.url, s.favicon, s.tags"
+
+# The trigram tokenizer only matches terms of at least three characters.
+_FTS_MIN_QUERY = 3
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def split_tags(tags: str) -> list[str]:
+    """Split Radio Browser's comma separated tags into sorted lower-case tags."""
+    return sorted({t.strip().lower() for t in tags.split(",") if t.strip()})
+
+
+class RadioBrowserCatalog:
+    """Searchable offline catalog of Radio Browser stations.
+
+    Stations are stored in a single SQLite file with an FTS5 index over
+    names and tags plus regular indexes on tag, country, codec and bitrate.
+    Searches mirror the parameters used by
+    :class:`~rarapla.data.radio_browser_client.RadioBrowserClient` (hide
+    broken stations, order by click count) but never touch the network.
+    The database runs in WAL mode so a background :meth:`sync` does not
+    block readers on other threads.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open (and create if needed) the catalog database.
+
+        Args:
+            path: SQLite database file, or ``":memory:"`` for tests.
+        """
+        self.path: str = path
+        self._lock = threading.Lock()
+        self._shared: sqlite3.Connection | None = None
+        self._populated = False
+        if path == ":memory:":
+            self._shared = sqlite3.connect(path, check_same_thread=False)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            try:
+                conn.executescript(_FTS_SCHEMA.format(tokenize="trigram"))
+            except sqlite3.OperationalError:
+                conn.executescript(_FTS_SCHEMA.format(tokenize="unicode61"))
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Yield a connection and commit (or roll back) when done."""
+        if self._shared is not None:
+            with self._lock:
+                with self._shared:
+                    yield self._shared
+            return
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA foreign_keys=ON")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _meta(self, key: str) -> str | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def count(self) -> int:
+        """Return the number of stored stations."""
+        with self._connect() as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM stations").fetchone()[0])
+
+    def is_populated(self) -> bool:
+        """Return whether the catalog holds any stations.
+
+        Searches ask this every time, so once stations exist the answer is
+        kept until a full replace.
+        """
+        if self._populated:
+            return True
+        with self._connect() as conn:
+            row = conn.execute("SELECT EXISTS (SELECT 1 FROM stations)").fetchone()
+        self._populated = bool(row[0])
+        return self._populated
+
+    def age_sec(self) -> float | None:
+        """Return seconds since the last successful sync, if any."""
+        ts = self._meta("synced_at")
+        return time.time() - float(ts) if ts else None
+
+    def needs_refresh(self) -> bool:
+        """Return whether a background sync is due."""
+        age = self.age_sec()
+        return age is None or age >= RB_CATALOG_REFRESH_SEC
+
+    def store(self, items: Iterable[dict[str, Any]], replace: bool = False) -> int:
+        """Insert or update stations from Radio Browser JSON objects.
+
+        Args:
+            items: Station objects as returned by the ``/json/stations`` API.
+            replace: Drop stations that are not part of ``items``.
+
+        Returns:
+            Number of stations written.
+        """
+        written = 0
+        newest = self._meta("last_change_time") or ""
+        with self._connect() as conn:
+            if replace:
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen (uuid TEXT)")
+                conn.execute("DELETE FROM seen")
+            for it in items:
+                row = self._row(it)
+                if row is None:
+                    continue
+                conn.execute(_UPSERT, row)
+                sid = conn.execute(
+                    "SELECT id FROM stations WHERE uuid = ?", (row[0],)
+                ).fetchone()[0]
+                conn.execute("DELETE FROM station_tags WHERE station = ?", (sid,))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO station_tags (tag, station) VALUES (?, ?)",
+                    [(t, sid) for t in split_tags(row[4])],
+                )
+                if replace:
+                    conn.execute("INSERT INTO seen (uuid) VALUES (?)", (row[0],))
+                newest = max(newest, str(it.get("lastchangetime_iso8601") or ""))
+                written += 1
+            if replace:
+                conn.execute(
+                    "DELETE FROM stations WHERE uuid NOT IN (SELECT uuid FROM seen)"
+                )
+                conn.execute(
+                    "DELETE FROM station_tags WHERE station NOT IN "
+                    "(SELECT id FROM stations)"
+                )
+                conn.execute("DROP TABLE seen")
+                self._populated = False
+            if newest:
+                self._set_meta(conn, "last_change_time", newest)
+        return written
+
+    def _row(self, it: dict[str, Any]) -> tuple[Any, ...] | None:
+        uuid = (it.get("stationuuid") or "").strip()
+        name = (it.get("name") or "").strip()
+        stream = (it.get("url_resolved") or it.get("url") or "").strip()
+        if not (uuid and name and stream):
+            return None
+        return (
+            uuid,
+            name,
+            stream,
+            (it.get("favicon") or "").strip() or None,
+            (it.get("tags") or "").strip(),
+            (it.get("countrycode") or "").strip().upper(),
+            (it.get("codec") or "").strip().upper(),
+            _int(it.get("bitrate")),
+            _int(it.get("clickcount")),
+            1 if _int(it.get("lastcheckok", 1)) else 0,
+        )
+
+    def sync(self, client: "RadioBrowserClient") -> int:
+        """Refresh the catalog from the API.
+
+        A full download is performed when the catalog is empty or its last
+        full download is older than ``RB_CATALOG_FULL_SYNC_SEC``; otherwise
+        only stations changed since the newest stored change are fetched.
+
+        Args:
+            client: Client used to talk to the API.
+
+        Returns:
+            Number of stations written.
+        """
+        last_change = self._meta("last_change_time")
+        full_at = self._meta("full_synced_at")
+        full_due = (
+            not full_at or time.time() - float(full_at) >= RB_CATALOG_FULL_SYNC_SEC
+        )
+        if last_change and not full_due and self.is_populated():
+            written = self._sync_changes(client, last_change)
+        else:
+            written = self._sync_full(client)
+        with self._connect() as conn:
+            self._set_meta(conn, "synced_at", str(time.time()))
+        return written
+
+    def _sync_full(self, client: "RadioBrowserClient") -> int:
+        # Each page goes to the staging tables in its own short transaction,
+        # so neither the download nor the whole list is held at once.
+        with self._connect() as conn:
+            conn.executescript(_STAGING_SCHEMA)
+        offset = 0
+        while True:
+            page = client.fetch_stations_page(offset, RB_CATALOG_PAGE_SIZE)
+            self._stage(page)
+            if len(page) < RB_CATALOG_PAGE_SIZE:
+                break
+            offset += len(page)
+        return self._swap_staged()
+
+    def _stage(self, items: Iterable[dict[str, Any]]) -> None:
+        rows: list[tuple[Any, ...]] = []
+        tags: list[tuple[str, str]] = []
+        for it in items:
+            row = self._row(it)
+            if row is None:
+                continue
+            rows.append((*row, str(it.get("lastchangetime_iso8601") or "")))
+            tags.extend((row[0], t) for t in split_tags(row[4]))
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO staged_stations "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO staged_tags (uuid, tag) VALUES (?, ?)", tags
+            )
+
+    def _swap_staged(self) -> int:
+        """Replace the stations with the staged ones in one transaction."""
+        with self._connect() as conn:
+            written, newest = conn.execute(
+                "SELECT COUNT(*), MAX(changed) FROM staged_stations"
+            ).fetchone()
+            conn.execute(
+                f"INSERT INTO stations ({_STATION_COLUMNS}) "
+                f"SELECT {_STATION_COLUMNS} FROM staged_stations WHERE true"
+                + _UPSERT_SET
+            )
+            conn.execute(
+                "DELETE FROM stations WHERE uuid NOT IN "
+                "(SELECT uuid FROM staged_stations)"
+            )
+            conn.execute("DELETE FROM station_tags")
+            conn.execute(
+                "INSERT INTO station_tags (tag, station) "
+                "SELECT t.tag, s.id FROM staged_tags t "
+                "JOIN stations s ON s.uuid = t.uuid"
+            )
+            conn.execute("DROP TABLE staged_stations")
+            conn.execute("DROP TABLE staged_tags")
+            if newest:
+                self._set_meta(conn, "last_change_time", newest)
+            self._set_meta(conn, "full_synced_at", str(time.time()))
+        self._populated = False
+        return int(written)
+
+    def _sync_changes(self, client: "RadioBrowserClient", since: str) -> int:
+        written = 0
+        offset = 0
+        while True:
+            page = client.fetch_changed_stations(offset, RB_CATALOG_PAGE_SIZE)
+            fresh = [
+                it
+                for it in page
+                if str(it.get("lastchangetime_iso8601") or "") >= since
+            ]
+            written += self.store(fresh)
+            if len(fresh) < len(page) or len(page) < RB_CATALOG_PAGE_SIZE:
+                return written
+            offset += len(page)
+
+    def search_japan(self, limit: int = 100) -> list[Channel]:
+        """Return the most popular Japanese stations."""
+        return self._query(
+            f"SELECT {_COLUMNS} FROM stations s "
+            "WHERE s.countrycode = 'JP' AND s.ok = 1 "
+            "ORDER BY s.clickcount DESC LIMIT ?",
+            (limit,),
+        )
+
+    def search_by_tag(self, tag: str, limit: int = 50) -> list[Channel]:
+        """Return the most popular stations with a tag containing ``tag``.
+
+        Like the API's ``tag`` filter this matches anywhere in a tag, so
+        ``rock`` also finds ``classic rock``.
+        """
+        t = tag.strip().lower().replace("%", "").replace("_", "")
+        return self._query(
+            f"SELECT {_COLUMNS} FROM stations s WHERE s.ok = 1 AND s.id IN ("
+            "SELECT station FROM station_tags WHERE tag LIKE '%' || ? || '%'"
+            ") ORDER BY s.clickcount DESC LIMIT ?",
+            (t, limit),
+        )
+
+    def search_text(self, query: str, limit: int = 100) -> list[Channel]:
+        """Full-text search over station names and tags."""
+        q = query.strip()
+        if not q:
+            return []
+        if len(q) < _FTS_MIN_QUERY:
+            like = "%" + q.replace("%", "").replace("_", "") + "%"
+            return self._query(
+                f"SELECT {_COLUMNS} FROM stations s WHERE s.ok = 1 "
+                "AND (s.name LIKE ? OR s.tags LIKE ?) "
+                "ORDER BY s.clickcount DESC LIMIT ?",
+                (like, like, limit),
+            )
+        phrase = '"' + q.replace('"', '""') + '"'
+        return self._query(
+            f"SELECT {_COLUMNS} FROM stations_fts f "
+            "JOIN stations s ON s.id = f.rowid "
+            "WHERE stations_fts MATCH ? AND s.ok = 1 "
+            "ORDER BY s.clickcount DESC LIMIT ?",
+            (phrase, limit),
+        )
+
+    def _query(self, sql: str, params: tuple[Any, ...]) -> list[Channel]:
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [
+            Channel(
+                id=f"rb:{uuid}",
+                name=name,
+                logo_url=fav,
+                program_title="",
+                program_image=None,
+                stream_url=url,
+                tags=tuple(split_tags(tags)),
+            )
+            for uuid, name, url, fav, tags in rows
+        ]
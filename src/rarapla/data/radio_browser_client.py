@@ -1,24 +1,158 @@
 """Client for the Radio Browser API."""
 
+import codecs
+import json
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
 import requests
+from rarapla.config import (
+    HTTP_TIMEOUT,
+    RB_CLICK_TIMEOUT_SEC,
+    RB_CONNECT_TIMEOUT_SEC,
+    RB_PAGE_SIZE,
+    RB_STREAM_CHUNK_SIZE,
+)
+from rarapla.data.radio_browser_catalog import RadioBrowserCatalog, split_tags
+from rarapla.data.radio_browser_mirrors import RadioBrowserMirrors
 from rarapla.models.channel import Channel
 
+_WHITESPACE = " \t\r\n"
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Decode the elements of a JSON array incrementally.
+
+    Elements are yielded as soon as they are complete, so a large response
+    never has to be held in memory as a whole.
+
+    Args:
+        chunks: UTF-8 encoded pieces of a JSON array, e.g. from
+            :meth:`requests.Response.iter_content`.
+
+    Raises:
+        ValueError: If the input is not a JSON array.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    started = False
+    for chunk in chunks:
+        buf = buf[pos:] + text.decode(chunk)
+        pos = 0
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buf):
+                break
+            c = buf[pos]
+            if not started:
+                if c != "[":
+                    raise ValueError("expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if c == "]":
+                return
+            if c == ",":
+                pos += 1
+                continue
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break
+            if end >= len(buf) and not isinstance(obj, (dict, list, str)):
+                # A scalar at the buffer end may continue in the next chunk.
+                break
+            yield obj
+            pos = end
+    if not started:
+        return
+    raise ValueError("unterminated JSON array")
+
+
+def _channel_from_item(it: Any) -> Channel | None:
+    """Convert a station object from the API into a :class:`Channel`."""
+    if not isinstance(it, dict):
+        return None
+    uuid = (it.get("stationuuid") or "").strip()
+    name = (it.get("name") or "").strip()
+    fav = (it.get("favicon") or "").strip() or None
+    stream = (it.get("url_resolved") or it.get("url") or "").strip()
+    if not (uuid and name and stream):
+        return None
+    return Channel(
+        id=f"rb:{uuid}",
+        name=name,
+        logo_url=fav,
+        program_title="",
+        program_image=None,
+        stream_url=stream,
+        tags=tuple(split_tags(it.get("tags") or "")),
+    )
+
+
+ResponseHook = Callable[[requests.Response], None]
+
+
+def abort_response(r: requests.Response) -> None:
+    """Stop a streaming response that another thread may be reading.
+
+    Closing alone does not wake a thread blocked on the socket, so the
+    socket is shut down where urllib3 supports it (2.3 and later); the
+    reader then sees the end of the body and closes the response itself.
+
+    Args:
+        r: Response opened with ``stream=True``.
+    """
+    shutdown = getattr(r.raw, "shutdown", None)
+    if shutdown is None:
+        r.close()
+        return
+    try:
+        shutdown()
+    except (OSError, RuntimeError, ValueError):
+        # Already released to the pool: nothing left to abort.
+        pass
+
+
+def _chunked(channels: list[Channel], size: int) -> Iterator[list[Channel]]:
+    for i in range(0, len(channels), size):
+        yield channels[i : i + size]
+
 
 class RadioBrowserClient:
     """Query stations from the community Radio Browser service."""
 
     def __init__(
-        self, base: str | None = None, session: requests.Session | None = None
+        self,
+        base: str | None = None,
+        session: requests.Session | None = None,
+        mirrors: RadioBrowserMirrors | None = None,
+        catalog: RadioBrowserCatalog | None = None,
     ) -> None:
         """Initialize the client.
 
         Args:
-            base: Base URL of the Radio Browser API.
+            base: Base URL of the Radio Browser API. When omitted the
+                fastest mirror is discovered and used automatically.
             session: Optional requests session to reuse.
+            mirrors: Optional mirror selector to share between clients.
+            catalog: Optional offline catalog. Once populated, searches are
+                answered locally without network traffic.
         """
-        self.base: str = base or "https://de1.api.radio-browser.info"
         self.s: requests.Session = session or requests.Session()
         self.s.headers.update({"User-Agent": "rapla/0.1.0"})
+        self._mirrors: RadioBrowserMirrors = mirrors or RadioBrowserMirrors(
+            self.s, servers=[base] if base else None
+        )
+        self.catalog: RadioBrowserCatalog | None = catalog
+
+    @property
+    def base(self) -> str:
+        """Base URL of the server currently in use."""
+        return self._mirrors.current()
 
     def search_japan(self, limit: int = 100) -> list[Channel]:
         """Search for popular Japanese stations.
@@ -29,14 +163,32 @@ class RadioBrowserClient:
         Returns:
             List of matching channels.
         """
-        params = {
+        catalog = self._ready_catalog()
+        if catalog is not None:
+            return catalog.search_japan(limit)
+        return self._search(self._japan_params(limit))
+
+    def iter_japan(
+        self,
+        limit: int = 100,
+        page_size: int = RB_PAGE_SIZE,
+        on_response: ResponseHook | None = None,
+    ) -> Iterator[list[Channel]]:
+        """Like :meth:`search_japan` but yield results page by page."""
+        catalog = self._ready_catalog()
+        if catalog is not None:
+            return _chunked(catalog.search_japan(limit), page_size)
+        return self._iter_search(self._japan_params(limit), page_size, on_response)
+
+    @staticmethod
+    def _japan_params(limit: int) -> dict[str, str]:
+        return {
             "countrycode": "JP",
             "hidebroken": "true",
             "order": "clickcount",
             "reverse": "true",
             "limit": str(limit),
         }
-        return self._search(params)
 
     def search_by_tag(self, tag: str, limit: int = 50) -> list[Channel]:
         """Search stations by a tag.
@@ -48,14 +200,115 @@ class RadioBrowserClient:
         Returns:
             List of matching channels.
         """
-        params = {
+        catalog = self._ready_catalog()
+        if catalog is not None:
+            return catalog.search_by_tag(tag, limit)
+        return self._search(self._tag_params(tag, limit))
+
+    def iter_by_tag(
+        self,
+        tag: str,
+        limit: int = 50,
+        page_size: int = RB_PAGE_SIZE,
+        on_response: ResponseHook | None = None,
+    ) -> Iterator[list[Channel]]:
+        """Like :meth:`search_by_tag` but yield results page by page."""
+        catalog = self._ready_catalog()
+        if catalog is not None:
+            return _chunked(catalog.search_by_tag(tag, limit), page_size)
+        return self._iter_search(self._tag_params(tag, limit), page_size, on_response)
+
+    @staticmethod
+    def _tag_params(tag: str, limit: int) -> dict[str, str]:
+        return {
             "tag": tag,
             "hidebroken": "true",
             "order": "clickcount",
             "reverse": "true",
             "limit": str(limit),
         }
-        return self._search(params)
+
+    def search_text(self, query: str, limit: int = 100) -> list[Channel]:
+        """Search stations by free text.
+
+        Uses the offline catalog's full-text index when available and the
+        API's name search otherwise.
+
+        Args:
+            query: Text to look for in station names and tags.
+            limit: Maximum number of results to return.
+
+        Returns:
+            List of matching channels.
+        """
+        catalog = self._ready_catalog()
+        if catalog is not None:
+            return catalog.search_text(query, limit)
+        return self._search(self._text_params(query, limit))
+
+    def iter_text(
+        self,
+        query: str,
+        limit: int = 100,
+        page_size: int = RB_PAGE_SIZE,
+        on_response: ResponseHook | None = None,
+    ) -> Iterator[list[Channel]]:
+        """Like :meth:`search_text` but yield results page by page."""
+        catalog = self._ready_catalog()
+        if catalog is not None:
+            return _chunked(catalog.search_text(query, limit), page_size)
+        return self._iter_search(
+            self._text_params(query, limit), page_size, on_response
+        )
+
+    @staticmethod
+    def _text_params(query: str, limit: int) -> dict[str, str]:
+        return {
+            "name": query,
+            "hidebroken": "true",
+            "order": "clickcount",
+            "reverse": "true",
+            "limit": str(limit),
+        }
+
+    def fetch_stations_page(self, offset: int, limit: int) -> list[dict[str, Any]]:
+        """Fetch one page of the complete station list as raw JSON objects.
+
+        Args:
+            offset: Number of stations to skip.
+            limit: Page size.
+        """
+        params = {
+            "hidebroken": "false",
+            "order": "stationuuid",
+            "offset": str(offset),
+            "limit": str(limit),
+        }
+        items = self._get("/json/stations/search", params).json() or []
+        return list(items)
+
+    def fetch_changed_stations(self, offset: int, limit: int) -> list[dict[str, Any]]:
+        """Fetch stations ordered by their last change, newest first.
+
+        Args:
+            offset: Number of stations to skip.
+            limit: Page size.
+        """
+        params = {
+            "hidebroken": "false",
+            "order": "changetimestamp",
+            "reverse": "true",
+            "offset": str(offset),
+            "limit": str(limit),
+        }
+        items = self._get("/json/stations/search", params).json() or []
+        return list(items)
+
+    def _ready_catalog(self) -> RadioBrowserCatalog | None:
+        """Return the catalog if it can answer searches."""
+        if self.catalog is not None and self.catalog.is_populated():
+            return self.catalog
+        return None
 
     def notify_click(self, station_uuid: str) -> None:
         """Notify the API that a station has been clicked.
@@ -65,33 +318,110 @@ class RadioBrowserClient:
         Args:
             station_uuid: UUID of the station.
         """
-        url = f"{self.base}/json/url/{station_uuid}"
         try:
-            self.s.get(url, timeout=5)
+            self.send_click(station_uuid)
         except Exception:
             pass
 
+    def send_click(self, station_uuid: str) -> None:
+        """Notify the API that a station has been clicked.
+
+        Unlike :meth:`notify_click`, failures are raised so callers such as
+        :class:`rarapla.services.click_reporter.ClickReporter` can retry.
+
+        Args:
+            station_uuid: UUID of the station.
+        """
+        url = f"{self.base}/json/url/{station_uuid}"
+        r = self.s.get(url, timeout=RB_CLICK_TIMEOUT_SEC)
+        r.raise_for_status()
+
+    def _get(
+        self, path: str, params: dict[str, str], stream: bool = False
+    ) -> requests.Response:
+        """GET ``path`` from the fastest mirror, failing over on errors.
+
+        Connection failures, timeouts and server errors demote the mirror
+        and retry the request on the next one.
+
+        Args:
+            path: API path starting with ``/``.
+            params: Query parameters.
+            stream: Defer downloading the body (see ``requests`` streaming).
+        """
+        last: Exception | None = None
+        for base in self._mirrors.candidates():
+            try:
+                r = self.s.get(
+                    f"{base}{path}",
+                    params=params,
+                    timeout=(RB_CONNECT_TIMEOUT_SEC, HTTP_TIMEOUT),
+                    stream=stream,
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._mirrors.mark_failed(base)
+                last = e
+                continue
+            if r.status_code >= 500:
+                # Give the connection back before trying the next mirror.
+                r.close()
+                self._mirrors.mark_failed(base)
+                last = requests.HTTPError(f"{r.status_code} from {base}")
+                continue
+            r.raise_for_status()
+            return r
+        raise last or RuntimeError("no Radio Browser server available")
+
     def _search(self, params: dict[str, str]) -> list[Channel]:
         """Perform a search request against the API."""
-        url = f"{self.base}/json/stations/search"
-        r = self.s.get(url, params=params, timeout=10)
-        r.raise_for_status()
+        r = self._get("/json/stations/search", params)
         items = r.json() or []
         out: list[Channel] = []
         for it in items:
-            uuid = (it.get("stationuuid") or "").strip()
-            name = (it.get("name") or "").strip()
-            fav = (it.get("favicon") or "").strip() or None
-            stream = (it.get("url_resolved") or it.get("url") or "").strip()
-            if uuid and name and stream:
-                out.append(
-                    Channel(
-                        id=f"rb:{uuid}",
-                        name=name,
-                        logo_url=fav,
-                        program_title="",
-                        program_image=None,
-                        stream_url=stream,
-                    )
-                )
+            ch = _channel_from_item(it)
+            if ch is not None:
+                out.append(ch)
         return out
+
+    def _iter_search(
+        self,
+        params: dict[str, str],
+        page_size: int,
+        on_response: ResponseHook | None = None,
+    ) -> Iterator[list[Channel]]:
+        """Perform a search page by page using ``offset``/``limit``.
+
+        Each page is decoded incrementally while it downloads and yielded
+        as one batch, so callers can show the first results before the
+        whole result set has arrived.
+
+        Args:
+            params: Search parameters; ``limit`` caps the total result count.
+            page_size: Number of stations requested per page.
+            on_response: Called with each page's streaming response before
+                it is read. Closing the response from another thread aborts
+                the download.
+        """
+        total = int(params.get("limit") or 0)
+        offset = 0
+        while not total or offset < total:
+            size = page_size if not total else min(page_size, total - offset)
+            page = {**params, "offset": str(offset), "limit": str(size)}
+            r = self._get("/json/stations/search", page, stream=True)
+            if on_response is not None:
+                on_response(r)
+            received = 0
+            batch: list[Channel] = []
+            try:
+                for it in iter_json_array(r.iter_content(RB_STREAM_CHUNK_SIZE)):
+                    received += 1
+                    ch = _channel_from_item(it)
+                    if ch is not None:
+                        batch.append(ch)
+            finally:
+                r.close()
+            if batch:
+                yield batch
+            if received < size:
+                return
+            offset += received
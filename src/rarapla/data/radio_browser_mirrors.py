@@ -0,0 +1,199 @@
+"""Discover Radio Browser API mirrors and pick the fastest one."""
+
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import requests
+from rarapla.config import (
+    RB_DISCOVERY_HOST,
+    RB_FALLBACK_SERVERS,
+    RB_MIRROR_TTL_SEC,
+    RB_PROBE_TIMEOUT_SEC,
+)
+
+
+def parse_server_list(items: Any) -> list[str]:
+    """Convert a ``/json/servers`` response into base URLs.
+
+    Args:
+        items: Decoded JSON list of ``{"name": ..., "ip": ...}`` objects.
+
+    Returns:
+        Unique ``https://`` base URLs in their original order.
+    """
+    out: list[str] = []
+    for it in items or []:
+        if not isinstance(it, dict):
+            continue
+        name = (it.get("name") or "").strip().rstrip(".")
+        if not name:
+            continue
+        base = f"https://{name}"
+        if base not in out:
+            out.append(base)
+    return out
+
+
+class RadioBrowserMirrors:
+    """Keep track of Radio Browser API servers ordered by latency.
+
+    Servers are discovered through the ``all.api.radio-browser.info`` DNS
+    round robin (reverse-resolving each address to its host name), falling
+    back to the ``/json/servers`` list and finally to a built-in list. Each
+    candidate is probed concurrently and the fastest responding server is
+    pinned until it fails or the selection expires.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        servers: list[str] | None = None,
+        ttl_sec: float = RB_MIRROR_TTL_SEC,
+    ) -> None:
+        """Create a mirror selector.
+
+        Args:
+            session: Session used for discovery and latency probes.
+            servers: Explicit candidate base URLs; skips discovery if given.
+            ttl_sec: How long a selection stays valid before re-probing.
+        """
+        self._s = session
+        self._static: list[str] | None = list(servers) if servers else None
+        self._ttl_sec = ttl_sec
+        self._ranked: list[str] = []
+        self._latency: dict[str, float] = {}
+        self._selected_at = 0.0
+        self._lock = threading.Lock()
+        # Set while one thread discovers and probes; others wait on it.
+        self._selecting: threading.Event | None = None
+
+    def current(self) -> str:
+        """Return the base URL of the pinned (fastest healthy) server."""
+        return self.candidates()[0]
+
+    def candidates(self) -> list[str]:
+        """Return all known servers, fastest first.
+
+        Discovery and probing happen lazily on first use and again once the
+        selection has expired. Only one thread selects at a time and it does
+        so without holding the lock; meanwhile other callers get the expired
+        ranking, or wait for the first one.
+        """
+        while True:
+            with self._lock:
+                expired = time.monotonic() - self._selected_at >= self._ttl_sec
+                if self._ranked and not expired:
+                    return list(self._ranked)
+                pending = self._selecting
+                if pending is None:
+                    self._selecting = done = threading.Event()
+                    break
+                stale = list(self._ranked)
+            if stale:
+                return stale
+            pending.wait()
+        try:
+            ranked, latency = self._select()
+            with self._lock:
+                self._ranked = ranked
+                self._latency = latency
+                self._selected_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._selecting = None
+            done.set()
+        return list(ranked)
+
+    def latency(self, base: str) -> float | None:
+        """Return the last measured latency of ``base`` in seconds."""
+        return self._latency.get(base)
+
+    def mark_failed(self, base: str) -> None:
+        """Demote a server after a failed request.
+
+        The next call to :meth:`current` returns the next fastest server.
+        """
+        with self._lock:
+            if base in self._ranked and len(self._ranked) > 1:
+                self._ranked.remove(base)
+                self._ranked.append(base)
+            self._latency.pop(base, None)
+
+    def discover(self) -> list[str]:
+        """Return candidate base URLs from DNS, the server list or defaults."""
+        if self._static:
+            return list(self._static)
+        found = self._discover_dns()
+        if not found:
+            found = self._discover_http()
+        return found or list(RB_FALLBACK_SERVERS)
+
+    def probe(self, bases: list[str]) -> dict[str, float]:
+        """Measure the response time of each server concurrently.
+
+        Args:
+            bases: Base URLs to probe.
+
+        Returns:
+            Mapping of reachable base URLs to their latency in seconds.
+        """
+        if not bases:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(8, len(bases))) as ex:
+            results = list(ex.map(self._probe_one, bases))
+        return {b: t for b, t in zip(bases, results) if t is not None}
+
+    def _select(self) -> tuple[list[str], dict[str, float]]:
+        """Discover and probe servers, then rank them by latency.
+
+        Returns:
+            The ranked base URLs and the measured latencies.
+        """
+        bases = self.discover()
+        latency = self.probe(bases) if len(bases) > 1 else {}
+        reachable = sorted(latency, key=latency.__getitem__)
+        rest = [b for b in bases if b not in latency]
+        return reachable + rest, latency
+
+    def _probe_one(self, base: str) -> float | None:
+        """Return the latency of a single server or ``None`` on failure."""
+        start = time.perf_counter()
+        try:
+            r = self._s.get(f"{base}/json/stats", timeout=RB_PROBE_TIMEOUT_SEC)
+            r.raise_for_status()
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    def _discover_dns(self) -> list[str]:
+        """Reverse-resolve the addresses behind the round-robin host name."""
+        try:
+            infos = socket.getaddrinfo(RB_DISCOVERY_HOST, 443, proto=socket.IPPROTO_TCP)
+        except OSError:
+            return []
+        out: list[str] = []
+        for info in infos:
+            ip = str(info[4][0])
+            try:
+                name = socket.gethostbyaddr(ip)[0]
+            except OSError:
+                continue
+            base = f"https://{name}"
+            if base not in out:
+                out.append(base)
+        return out
+
+    def _discover_http(self) -> list[str]:
+        """Fetch the server list published by the API itself."""
+        try:
+            r = self._s.get(
+                f"https://{RB_DISCOVERY_HOST}/json/servers",
+                timeout=RB_PROBE_TIMEOUT_SEC,
+            )
+            r.raise_for_status()
+            return parse_server_list(r.json())
+        except Exception:
+            return []
@@ -0,0 +1,105 @@
+"""Persistence of the session state between runs."""
+
+import json
+import os
+from datetime import datetime
+from typing import Any
+
+from rarapla.models.channel import Channel
+from rarapla.models.session import SessionState
+
+
+def channel_to_dict(ch: Channel) -> dict[str, Any]:
+    """Convert a channel into JSON-serializable fields."""
+    return {
+        "id": ch.id,
+        "name": ch.name,
+        "logo_url": ch.logo_url,
+        "program_title": ch.program_title,
+        "program_image": ch.program_image,
+        "stream_url": ch.stream_url,
+        "program_end": ch.program_end.isoformat() if ch.program_end else None,
+        "tags": list(ch.tags),
+    }
+
+
+def channel_from_dict(data: dict[str, Any]) -> Channel:
+    """Rebuild a channel written by :func:`channel_to_dict`.
+
+    Raises:
+        KeyError: If a required field is missing.
+        TypeError: If a field has the wrong type.
+        ValueError: If ``program_end`` is not an ISO timestamp.
+    """
+    end = data.get("program_end")
+    return Channel(
+        str(data["id"]),
+        str(data["name"]),
+        data.get("logo_url") or None,
+        str(data.get("program_title") or ""),
+        data.get("program_image") or None,
+        stream_url=data.get("stream_url") or None,
+        program_end=datetime.fromisoformat(end) if end else None,
+        tags=tuple(str(t) for t in data.get("tags") or ()),
+    )
+
+
+class SessionStore:
+    """Read and write the session state as a small JSON file."""
+
+    def __init__(self, path: str) -> None:
+        """Create a store.
+
+        Args:
+            path: Location of the JSON file.
+        """
+        self._path = path
+
+    def load(self) -> SessionState | None:
+        """Return the saved state, or ``None`` if there is none.
+
+        An unreadable file counts as no saved state, and channels that
+        cannot be read back are skipped.
+        """
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        channels: list[Channel] = []
+        for it in data.get("channels") or ():
+            try:
+                channels.append(channel_from_dict(it))
+            except (AttributeError, KeyError, TypeError, ValueError):
+                continue
+        volume = data.get("volume")
+        saved_at = data.get("saved_at")
+        return SessionState(
+            source=str(data.get("source") or ""),
+            station_id=data.get("station_id") or None,
+            volume=volume if isinstance(volume, int) else None,
+            output_device=data.get("output_device") or None,
+            channels=channels,
+            saved_at=float(saved_at) if isinstance(saved_at, (int, float)) else 0.0,
+        )
+
+    def save(self, state: SessionState) -> None:
+        """Write ``state``, replacing the file atomically.
+
+        Raises:
+            OSError: If the file cannot be written.
+        """
+        data = {
+            "source": state.source,
+            "station_id": state.station_id,
+            "volume": state.volume,
+            "output_device": state.output_device,
+            "channels": [channel_to_dict(ch) for ch in state.channels],
+            "saved_at": state.saved_at,
+        }
+        tmp = self._path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self._path)
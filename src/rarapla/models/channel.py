@@ -1,12 +1,22 @@
 """Data models for representing radio channels."""
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
 
+from rarapla.models.interning import intern_optional
 
-@dataclass
+
+@dataclass(frozen=True, slots=True, eq=False)
 class Channel:
     """A radio channel currently broadcasting a program.
 
+    Instances are immutable. Identifier, name, title and URL strings are
+    interned, so the thousands of channels kept across result sets share
+    their repeated strings, and a content hash is computed once so that
+    "did this channel change" is a single integer comparison.
+
     Attributes:
         id: Station identifier.
         name: Display name for the station.
@@ -14,6 +24,9 @@ class Channel:
         program_title: Title of the program that is on air.
         program_image: URL to an image representing the program.
         stream_url: Direct stream URL when known.
+        program_end: When the program on air ends, if the source says.
+        tags: Lower-case genre or keyword tags, if the source has any.
+        content_hash: Hash over all the fields above.
     """
 
     id: str
@@ -22,3 +35,49 @@ class Channel:
     program_title: str
     program_image: str | None
     stream_url: str | None = None
+    program_end: datetime | None = None
+    tags: tuple[str, ...] = ()
+    content_hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        setattr_ = object.__setattr__
+        setattr_(self, "id", sys.intern(self.id))
+        setattr_(self, "name", sys.intern(self.name))
+        setattr_(self, "logo_url", intern_optional(self.logo_url))
+        setattr_(self, "program_title", sys.intern(self.program_title))
+        setattr_(self, "program_image", intern_optional(self.program_image))
+        setattr_(self, "stream_url", intern_optional(self.stream_url))
+        setattr_(self, "tags", tuple(sys.intern(t) for t in self.tags))
+        setattr_(self, "content_hash", hash(self._key()))
+
+    def _key(self) -> tuple[Any, ...]:
+        return (
+            self.id,
+            self.name,
+            self.logo_url,
+            self.program_title,
+            self.program_image,
+            self.stream_url,
+            self.program_end,
+            self.tags,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Channel):
+            return NotImplemented
+        return (
+            self.content_hash == other.content_hash
+            and self.id == other.id
+            and self.name == other.name
+            and self.logo_url == other.logo_url
+            and self.program_title == other.program_title
+            and self.program_image == other.program_image
+            and self.stream_url == other.stream_url
+            and self.program_end == other.program_end
+            and self.tags == other.tags
+        )
+
+    def __hash__(self) -> int:
+        return self.content_hash
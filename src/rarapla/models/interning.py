@@ -0,0 +1,15 @@
+"""String interning helpers for the model classes."""
+
+import sys
+
+
+def intern_optional(value: str | None) -> str | None:
+    """Intern ``value`` unless it is ``None``.
+
+    Args:
+        value: String to intern.
+
+    Returns:
+        The canonical copy of ``value``, or ``None``.
+    """
+    return None if value is None else sys.intern(value)
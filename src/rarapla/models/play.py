@@ -0,0 +1,26 @@
+"""Data model for now-playing history entries."""
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Play:
+    """A title heard on a station.
+
+    Attributes:
+        station_id: Station identifier (``rb:`` prefixed for Radio Browser).
+        station_name: Display name of the station at the time.
+        ts: Unix timestamp when the title was first seen.
+        title: Title as reported by the stream or program guide.
+        artist: Artist name if known.
+        album: Album name if known.
+        source: Where the title came from (``icy``, ``player`` or ``radiko``).
+    """
+
+    station_id: str
+    station_name: str
+    ts: float
+    title: str
+    artist: str | None = None
+    album: str | None = None
+    source: str = ""
@@ -1,20 +1,55 @@
 """Data model for program details."""
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
+from typing import Any
 
+from rarapla.models.interning import intern_optional
 
-@dataclass
+
+@dataclass(frozen=True, slots=True, eq=False)
 class Program:
     """Details about a radio program.
 
+    Like :class:`~rarapla.models.channel.Channel`, instances are immutable,
+    intern their short strings and carry a precomputed content hash.
+
     Attributes:
         title: Program title.
         pfm: Performer or host of the program.
         desc: Short description of the program.
         image: URL to an image representing the program.
+        content_hash: Hash over all the fields above.
     """
 
     title: str
     pfm: str | None = None
     desc: str | None = None
     image: str | None = None
+    content_hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        setattr_ = object.__setattr__
+        setattr_(self, "title", sys.intern(self.title))
+        setattr_(self, "pfm", intern_optional(self.pfm))
+        setattr_(self, "image", intern_optional(self.image))
+        setattr_(self, "content_hash", hash(self._key()))
+
+    def _key(self) -> tuple[Any, ...]:
+        return (self.title, self.pfm, self.desc, self.image)
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Program):
+            return NotImplemented
+        return (
+            self.content_hash == other.content_hash
+            and self.title == other.title
+            and self.pfm == other.pfm
+            and self.desc == other.desc
+            and self.image == other.image
+        )
+
+    def __hash__(self) -> int:
+        return self.content_hash
@@ -0,0 +1,26 @@
+"""Data model for the state restored when the application starts."""
+
+from dataclasses import dataclass, field
+
+from rarapla.models.channel import Channel
+
+
+@dataclass(slots=True)
+class SessionState:
+    """What the window showed when the application was last closed.
+
+    Attributes:
+        source: Label of the selected source, as shown in the source list.
+        station_id: Station that was selected, if any.
+        volume: Player volume.
+        output_device: Identifier of the audio output device, hex encoded.
+        channels: The selected source's channel list at the time.
+        saved_at: Unix timestamp of when the state was saved.
+    """
+
+    source: str = ""
+    station_id: str | None = None
+    volume: int | None = None
+    output_device: str | None = None
+    channels: list[Channel] = field(default_factory=list)
+    saved_at: float = 0.0
@@ -0,0 +1,128 @@
+"""Start the Radiko proxy off the GUI thread.
+
+Importing the proxy pulls in aiohttp and Streamlink, so this module only
+loads it on a worker thread once :meth:`BackgroundProxy.start` is called.
+"""
+
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import TYPE_CHECKING
+
+from rarapla.config import PROXY_START_TIMEOUT_SEC, PROXY_STOP_TIMEOUT_SEC
+
+if TYPE_CHECKING:
+    from rarapla.data.radiko_resolver import ResolvedStream
+    from rarapla.proxy.radiko_proxy import RadikoProxyServer
+
+
+class BackgroundProxy:
+    """Load and run a :class:`RadikoProxyServer` on a worker thread.
+
+    Attributes:
+        ready: Set once the proxy is accepting connections.
+        error: Why the proxy failed to start, or ``None``.
+    """
+
+    def __init__(self, host: str, port: int) -> None:
+        """Prepare the proxy; nothing is imported or started yet.
+
+        Args:
+            host: Hostname to bind.
+            port: TCP port to listen on, normally one already known to be
+                free. It is used as is; a taken port fails the start.
+        """
+        self._host = host
+        self._port = port
+        self._server: "RadikoProxyServer | None" = None
+        self._thread = threading.Thread(
+            target=self._run, name="proxy-start", daemon=True
+        )
+        self._lock = threading.Lock()
+        self._on_ready: list[Callable[[], None]] = []
+        self._on_error: list[Callable[[str], None]] = []
+        self.ready = threading.Event()
+        self.error: str | None = None
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the proxy, waiting for it first if it is still starting."""
+        if self._thread.is_alive():
+            self._thread.join(PROXY_STOP_TIMEOUT_SEC)
+        if self._server is not None:
+            self._server.stop()
+
+    def on_ready(
+        self, fn: Callable[[], None], on_error: Callable[[str], None] | None = None
+    ) -> None:
+        """Call ``fn`` once the proxy is up, at once if it already is.
+
+        If the proxy fails to start, or does not come up within
+        ``PROXY_START_TIMEOUT_SEC``, ``on_error`` gets the reason instead.
+        Either runs on the proxy start thread unless startup had already
+        ended, in which case it runs on the calling thread.
+        """
+        with self._lock:
+            error = self.error
+            if error is None and not self.ready.is_set():
+                self._on_ready.append(fn)
+                if on_error is not None:
+                    self._on_error.append(on_error)
+                return
+        if error is None:
+            fn()
+        elif on_error is not None:
+            on_error(error)
+
+    def prefetch(self, station_id: str) -> "Future[ResolvedStream | None]":
+        """Resolve a Radiko station's stream before the player asks for it.
+
+        Raises:
+            RuntimeError: If the proxy is not running yet.
+        """
+        if self._server is None or not self.ready.is_set():
+            raise RuntimeError("proxy is not running")
+        return self._server.prefetch(station_id)
+
+    def _run(self) -> None:
+        from rarapla import startup_profile
+
+        try:
+            from rarapla.proxy.radiko_proxy import RadikoProxyServer
+
+            # The UI already builds its URLs from this port, so bind exactly it.
+            server = RadikoProxyServer(
+                host=self._host, port=self._port, probe_port=False
+            )
+            server.start_in_thread()
+        except Exception as e:
+            self._finish(str(e) or type(e).__name__)
+            return
+        self._server = server
+        if not server.started.wait(PROXY_START_TIMEOUT_SEC):
+            self._finish(f"proxy did not start within {PROXY_START_TIMEOUT_SEC} s")
+            return
+        err = server.start_error
+        if err is not None:
+            self._finish(str(err) or type(err).__name__)
+            return
+        startup_profile.mark("proxy started")
+        self._finish(None)
+
+    def _finish(self, error: str | None) -> None:
+        """Record how startup ended and run the matching callbacks."""
+        with self._lock:
+            if error is None:
+                self.ready.set()
+            else:
+                self.error = error
+            ready, self._on_ready = self._on_ready, []
+            failed, self._on_error = self._on_error, []
+        if error is None:
+            for fn in ready:
+                fn()
+        else:
+            for on_error in failed:
+                on_error(error)
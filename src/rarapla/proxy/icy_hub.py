@@ -0,0 +1,54 @@
+"""Fan out ICY metadata captured by the relay to interested listeners."""
+
+from collections.abc import Callable
+
+IcyCallback = Callable[[str, dict[str, str]], None]
+
+
+class IcyMetadataHub:
+    """Publish stream titles per upstream URL.
+
+    The relay publishes every metadata block it strips from a stream and
+    subscribers receive ``(title, meta)`` for the URL they registered for.
+    Callbacks run on the proxy's event loop and must not block.
+    """
+
+    def __init__(self) -> None:
+        self._subs: dict[str, list[IcyCallback]] = {}
+        self._last: dict[str, tuple[str, dict[str, str]]] = {}
+
+    def subscribe(self, url: str, callback: IcyCallback) -> Callable[[], None]:
+        """Register ``callback`` for ``url`` and return an unsubscribe function.
+
+        The most recent metadata for ``url``, if any, is delivered right away.
+        """
+        self._subs.setdefault(url, []).append(callback)
+        last = self._last.get(url)
+        if last is not None:
+            callback(last[0], dict(last[1]))
+
+        def _unsubscribe() -> None:
+            subs = self._subs.get(url)
+            if subs and callback in subs:
+                subs.remove(callback)
+                if not subs:
+                    del self._subs[url]
+
+        return _unsubscribe
+
+    def publish(self, url: str, title: str, meta: dict[str, str]) -> None:
+        """Deliver metadata for ``url`` to its subscribers."""
+        self._last[url] = (title, dict(meta))
+        for cb in list(self._subs.get(url, ())):
+            try:
+                cb(title, dict(meta))
+            except Exception:
+                pass
+
+    def last(self, url: str) -> tuple[str, dict[str, str]] | None:
+        """Return the most recent ``(title, meta)`` published for ``url``."""
+        return self._last.get(url)
+
+    def forget(self, url: str) -> None:
+        """Drop the remembered metadata for a stream that has ended."""
+        self._last.pop(url, None)
@@ -0,0 +1,28 @@
+"""Local port selection for the proxy.
+
+Kept free of heavy imports so the application can pick the proxy port
+before the proxy itself is loaded.
+"""
+
+import socket
+
+
+def find_open_port(host: str, start: int, attempts: int = 10) -> int:
+    """Return the first available TCP port starting from ``start``.
+
+    Args:
+        host: Hostname to test binding against.
+        start: Initial port number to try.
+        attempts: How many sequential ports to probe.
+
+    Raises:
+        OSError: If no free port is found in the range.
+    """
+    for port in range(start, start + attempts):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind((host, port))
+            except OSError:
+                continue
+            return port
+    raise OSError("no free port available")
@@ -1,36 +1,54 @@
 """Lightweight proxy server that rewrites Radiko streams."""
 
 import asyncio
+import json
 import os
-import socket
 import threading
+from collections.abc import Coroutine
+from concurrent.futures import Future
+from typing import Any, TypeVar
 from urllib.parse import urlencode, urljoin, urlparse
 
 import aiohttp
+import requests
 from aiohttp import web
 from rarapla.config import (
     HTTP_TIMEOUT,
+    ICY_EVENT_HEARTBEAT_SEC,
+    ICY_EVENT_QUEUE_SIZE,
     RADIKO_CACHE_TTL_SEC,
     RADIKO_CHUNK_SIZE,
     RADIKO_RESOLVE_TTL_SEC,
     RADIKO_RETRY_DELAY_SEC,
     RADIKO_SEGMENT_RETRY_ATTEMPTS,
+    USER_AGENT,
 )
+from rarapla.data.async_radiko_client import AsyncRadikoClient
 from rarapla.data.radiko_resolver import RadikoResolver, ResolvedStream
+from rarapla.proxy.icy_hub import IcyMetadataHub
+from rarapla.proxy.ports import find_open_port
+from rarapla.proxy.stream_relay import RelayChannel, is_hls_url, rewrite_hls_playlist
+
+T = TypeVar("T")
 
 
 class RadikoProxyServer:
     """Proxy Radiko streams and rewrite playlist URLs."""
 
-    def __init__(self, host: str = "127.0.0.1", port: int = 3032) -> None:
+    def __init__(
+        self, host: str = "127.0.0.1", port: int = 3032, probe_port: bool = True
+    ) -> None:
         """Initialize the proxy server.
 
         Args:
             host: Hostname to bind.
             port: TCP port to listen on.
+            probe_port: Move on to the next free port when ``port`` is taken.
+                Pass ``False`` when the caller already picked a free port
+                and told others about it.
         """
         self.host: str = host
-        self.port: int = self._find_open_port(host, port)
+        self.port: int = find_open_port(host, port) if probe_port else port
         self._resolver: RadikoResolver = RadikoResolver()
         self._app: web.Application = web.Application()
         self._app.add_routes(
@@ -39,36 +57,23 @@ class RadikoProxyServer:
                 web.get("/seg", self.handle_seg),
                 web.get("/seg.{ext}", self.handle_seg),
                 web.post("/clear_cache", self.handle_clear_cache),
+                web.get("/relay", self.handle_relay),
+                web.get("/icy/events", self.handle_icy_events),
             ]
         )
         self._runner: web.AppRunner | None = None
         self._site: web.TCPSite | None = None
         self._loop: asyncio.AbstractEventLoop | None = None
         self._cache: dict[str, tuple[ResolvedStream, float]] = {}
+        self._resolving: dict[str, asyncio.Future[ResolvedStream | None]] = {}
         self._cache_ttl_sec: int = RADIKO_CACHE_TTL_SEC
         self._session: aiohttp.ClientSession | None = None
-
-    @staticmethod
-    def _find_open_port(host: str, start: int, attempts: int = 10) -> int:
-        """Return the first available TCP port starting from ``start``.
-
-        Args:
-            host: Hostname to test binding against.
-            start: Initial port number to try.
-            attempts: How many sequential ports to probe.
-
-        Raises:
-            OSError: If no free port is found in the range.
-        """
-
-        for port in range(start, start + attempts):
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                try:
-                    sock.bind((host, port))
-                except OSError:
-                    continue
-                return port
-        raise OSError("no free port available")
+        self._relay_session: aiohttp.ClientSession | None = None
+        self.radiko: AsyncRadikoClient | None = None
+        self.icy: IcyMetadataHub = IcyMetadataHub()
+        self._relays: dict[str, RelayChannel] = {}
+        self.started = threading.Event()
+        self.start_error: Exception | None = None
 
     async def handle_master(self, request: web.Request) -> web.Response:
         """Rewrite the master playlist to point to this proxy."""
@@ -181,6 +186,114 @@ class RadikoProxyServer:
             pass
         return web.Response(status=400, text="invalid request")
 
+    async def handle_relay(self, request: web.Request) -> web.StreamResponse:
+        """Relay a direct stream through a shared, buffered upstream.
+
+        Players connecting to the same URL share one upstream connection,
+        which survives short drops and brief player reconnects. ICY metadata
+        is stripped from the audio and published on :attr:`icy`. HLS
+        playlists are rewritten so their segments are fetched via ``/seg``.
+        """
+        url = request.query.get("u")
+        if not url:
+            return web.Response(status=400, text="missing u")
+        if is_hls_url(url):
+            return await self._relay_playlist(url)
+        channel = self._relay_channel(url)
+        await channel.wait_ready()
+        if channel.hls:
+            return await self._relay_playlist(url)
+        if not channel.headers:
+            return web.Response(status=502, text=channel.error or "upstream error")
+        resp = web.StreamResponse(status=200, headers=channel.headers)
+        await resp.prepare(request)
+        try:
+            async for part in channel.stream():
+                await resp.write(part)
+        except ConnectionResetError:
+            pass
+        return resp
+
+    async def handle_icy_events(self, request: web.Request) -> web.StreamResponse:
+        """Stream metadata captured by :meth:`handle_relay` as JSON lines.
+
+        Each line is ``{"title": ..., "meta": {...}}``. Blank lines are sent
+        as heartbeats while nothing changes.
+        """
+        url = request.query.get("u")
+        if not url:
+            return web.Response(status=400, text="missing u")
+        queue: asyncio.Queue[tuple[str, dict[str, str]]] = asyncio.Queue(
+            ICY_EVENT_QUEUE_SIZE
+        )
+
+        def _push(title: str, meta: dict[str, str]) -> None:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait((title, meta))
+
+        resp = web.StreamResponse(
+            status=200,
+            headers={
+                "Content-Type": "application/x-ndjson; charset=utf-8",
+                "Cache-Control": "no-cache",
+            },
+        )
+        await resp.prepare(request)
+        unsubscribe = self.icy.subscribe(url, _push)
+        try:
+            while True:
+                try:
+                    title, meta = await asyncio.wait_for(
+                        queue.get(), ICY_EVENT_HEARTBEAT_SEC
+                    )
+                except asyncio.TimeoutError:
+                    await resp.write(b"\n")
+                    continue
+                line = json.dumps({"title": title, "meta": meta}, ensure_ascii=False)
+                await resp.write(line.encode("utf-8") + b"\n")
+        except ConnectionResetError:
+            pass
+        finally:
+            unsubscribe()
+        return resp
+
+    def _relay_channel(self, url: str) -> RelayChannel:
+        """Return the running relay for ``url``, starting one if needed."""
+        channel = self._relays.get(url)
+        if channel is None or channel.closed:
+            assert self._relay_session is not None
+            channel = RelayChannel(
+                url, self._relay_session, self.icy, on_close=self._on_relay_closed
+            )
+            self._relays[url] = channel
+            channel.start()
+        return channel
+
+    def _on_relay_closed(self, channel: RelayChannel) -> None:
+        if self._relays.get(channel.url) is channel:
+            del self._relays[channel.url]
+
+    async def _relay_playlist(self, url: str) -> web.Response:
+        """Fetch an HLS playlist and route its entries through the proxy."""
+        assert self._relay_session is not None
+        try:
+            async with self._relay_session.get(url) as upstream:
+                if upstream.status != 200:
+                    return web.Response(status=upstream.status, text="upstream error")
+                text = await upstream.text()
+                final_url = str(upstream.url)
+        except (asyncio.TimeoutError, aiohttp.ClientError):
+            return web.Response(status=502, text="upstream error")
+        return web.Response(
+            status=200,
+            text=rewrite_hls_playlist(text, final_url),
+            headers={
+                "Content-Type": "application/vnd.apple.mpegurl",
+                "Cache-Control": "no-store, no-cache, must-revalidate",
+            },
+        )
+
     def _base_url(self, url: str) -> str:
         """Return the directory portion of a URL."""
         p = urlparse(url)
@@ -200,6 +313,16 @@ class RadikoProxyServer:
                 return cached_res
             else:
                 self._cache.pop(station, None)
+        pending = self._resolving.get(station)
+        if pending is None:
+            # A prefetch and the player asking for the playlist share one
+            # Streamlink resolve instead of racing two.
+            pending = asyncio.ensure_future(self._resolve(station, now))
+            self._resolving[station] = pending
+            pending.add_done_callback(lambda _f: self._resolving.pop(station, None))
+        return await asyncio.shield(pending)
+
+    async def _resolve(self, station: str, now: float) -> ResolvedStream | None:
         await asyncio.sleep(RADIKO_RETRY_DELAY_SEC)
         new_res: ResolvedStream | None = await asyncio.to_thread(
             self._resolver.resolve_live, station
@@ -208,13 +331,31 @@ class RadikoProxyServer:
             self._cache[station] = (new_res, now)
         return new_res
 
+    def prefetch(self, station: str) -> "Future[ResolvedStream | None]":
+        """Resolve ``station`` ahead of playback so its playlist is served at once.
+
+        Safe to call from any thread while the proxy is running.
+        """
+        return self.submit(self._ensure_resolved(station))
+
     def start_in_thread(self) -> None:
-        """Start the proxy server on a dedicated thread."""
+        """Start the proxy server on a dedicated thread.
+
+        :attr:`started` is set once the server accepts connections, or once
+        starting it failed, in which case :attr:`start_error` holds the error.
+        """
 
         def runner() -> None:
             self._loop = asyncio.new_event_loop()
             asyncio.set_event_loop(self._loop)
-            self._loop.run_until_complete(self._start())
+            try:
+                self._loop.run_until_complete(self._start())
+            except Exception as e:
+                self.start_error = e
+                self._loop.close()
+                self._loop = None
+                self.started.set()
+                return
             self._loop.run_forever()
 
         t: threading.Thread = threading.Thread(target=runner, daemon=True)
@@ -227,11 +368,13 @@ class RadikoProxyServer:
         self._site = web.TCPSite(self._runner, self.host, self.port)
         await self._site.start()
         timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+        # The same defaults Streamlink's requests session sends, without
+        # waiting for Streamlink to load; it is warmed up in the background.
         base: dict[str, str] = {
             k: v.decode() if isinstance(v, bytes) else str(v)
-            for k, v in self._resolver.http.headers.items()
+            for k, v in requests.utils.default_headers().items()
         }
-        base.setdefault("User-Agent", base.get("User-Agent", "Mozilla/5.0"))
+        base["User-Agent"] = USER_AGENT
         base.setdefault("Referer", "https://radiko.jp/")
         base.setdefault("Origin", "https://radiko.jp")
         base.setdefault("Accept", "application/vnd.apple.mpegurl,*/*")
@@ -239,6 +382,35 @@ class RadikoProxyServer:
         base.setdefault("Cache-Control", "no-cache")
         base.setdefault("Pragma", "no-cache")
         self._session = aiohttp.ClientSession(timeout=timeout, headers=base)
+        self.radiko = AsyncRadikoClient(session=self._session)
+        self._relay_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(
+                total=None, sock_connect=HTTP_TIMEOUT, sock_read=HTTP_TIMEOUT
+            ),
+            headers={"User-Agent": USER_AGENT},
+        )
+        asyncio.get_running_loop().run_in_executor(None, self._resolver.warm_up)
+        self.started.set()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "Future[T]":
+        """Schedule a coroutine on the proxy's event loop from another thread.
+
+        This lets callers outside the loop await work such as
+        :attr:`radiko` API calls on the proxy's shared connection pool.
+
+        Args:
+            coro: Coroutine to run.
+
+        Returns:
+            A future resolved with the coroutine's result.
+
+        Raises:
+            RuntimeError: If the proxy loop is not running.
+        """
+        if self._loop is None:
+            coro.close()
+            raise RuntimeError("proxy loop is not running")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
 
     def stop(self) -> None:
         """Request graceful shutdown of the proxy server."""
@@ -253,5 +425,9 @@ class RadikoProxyServer:
             await self._runner.cleanup()
         if self._session:
             await self._session.close()
+        for channel in list(self._relays.values()):
+            await channel.close()
+        if self._relay_session:
+            await self._relay_session.close()
         if self._loop:
             self._loop.stop()
@@ -0,0 +1,329 @@
+"""Persistent, buffered relay for direct Icecast/SHOUTcast streams."""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Mapping
+from urllib.parse import urlencode, urljoin
+
+import aiohttp
+from rarapla.config import (
+    RELAY_BUFFER_BYTES,
+    RELAY_IDLE_SEC,
+    RELAY_MAX_OUTAGE_SEC,
+    RELAY_PREROLL_BYTES,
+    RELAY_RECONNECT_BASE_SEC,
+    RELAY_RECONNECT_MAX_SEC,
+)
+from rarapla.proxy.icy_hub import IcyMetadataHub
+from rarapla.services.icy_demuxer import IcyDemuxer, parse_icy_metadata
+
+_HLS_TYPES = (
+    "application/vnd.apple.mpegurl",
+    "application/x-mpegurl",
+    "audio/mpegurl",
+)
+_PLAYLIST_TYPES = ("audio/x-scpls", "audio/x-mpegurl")
+_PLAYLIST_MAX_BYTES = 64 * 1024
+
+
+def is_hls_url(url: str) -> bool:
+    """Return whether ``url`` points at an HLS playlist by its extension."""
+    return url.split("?", 1)[0].lower().endswith(".m3u8")
+
+
+def relay_headers(headers: Mapping[str, str]) -> dict[str, str]:
+    """Pick the upstream headers worth passing on to the player."""
+    out = {
+        "Content-Type": headers.get("Content-Type", "application/octet-stream"),
+        "Cache-Control": "no-cache",
+    }
+    for k, v in headers.items():
+        key = k.lower()
+        if key.startswith("icy-") and key != "icy-metaint":
+            out[k] = v
+    return out
+
+
+def playlist_target(text: str) -> str | None:
+    """Return the first stream URL listed in a PLS or plain M3U playlist."""
+    for line in text.splitlines():
+        s = line.strip()
+        if not s or s.startswith(("#", "[")):
+            continue
+        if "=" in s and s.lower().startswith("file"):
+            s = s.split("=", 1)[1].strip()
+        elif "=" in s:
+            continue
+        if "://" in s:
+            return s
+    return None
+
+
+def rewrite_hls_playlist(text: str, playlist_url: str) -> str:
+    """Point every URI in an HLS playlist back at the proxy.
+
+    Nested playlists go through ``/relay`` and media segments, keys and
+    init sections through ``/seg``.
+
+    Args:
+        text: Playlist body.
+        playlist_url: Final URL the playlist was fetched from, used to
+            resolve relative references.
+
+    Returns:
+        The rewritten playlist.
+    """
+
+    def _local(uri: str) -> str:
+        abs_url = urljoin(playlist_url, uri)
+        if is_hls_url(abs_url):
+            return f"/relay?{urlencode({'u': abs_url})}"
+        return f"/seg?{urlencode({'u': abs_url})}"
+
+    out: list[str] = []
+    for line in text.splitlines():
+        s = line.strip()
+        if not s:
+            out.append(line)
+        elif s.startswith("#"):
+            if 'URI="' in s:
+                head, rest = s.split('URI="', 1)
+                uri, tail = rest.split('"', 1)
+                line = f'{head}URI="{_local(uri)}"{tail}'
+            out.append(line)
+        else:
+            out.append(_local(s))
+    return "\n".join(out) + "\n"
+
+
+class RelayChannel:
+    """Hold one upstream connection per stream and fan it out to clients.
+
+    Audio read from the upstream is kept in a bounded buffer. A new client
+    starts a little behind the live edge so playback begins immediately, and
+    clients simply wait while a dropped upstream is reconnected in the
+    background, so short network outages never reach the player. ICY
+    metadata is stripped on the way in and published on the hub.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        session: aiohttp.ClientSession,
+        hub: IcyMetadataHub,
+        on_close: Callable[["RelayChannel"], None] | None = None,
+        buffer_bytes: int = RELAY_BUFFER_BYTES,
+        preroll_bytes: int = RELAY_PREROLL_BYTES,
+        idle_sec: float = RELAY_IDLE_SEC,
+        max_outage_sec: float = RELAY_MAX_OUTAGE_SEC,
+    ) -> None:
+        self.url = url
+        self.headers: dict[str, str] = {}
+        self.hls = False
+        self.error: str | None = None
+        self._session = session
+        self._hub = hub
+        self._on_close = on_close
+        self._buffer_bytes = buffer_bytes
+        self._preroll_bytes = preroll_bytes
+        self._idle_sec = idle_sec
+        self._max_outage_sec = max_outage_sec
+        self._chunks: deque[tuple[int, bytes | memoryview]] = deque()
+        self._next_seq = 0
+        self._buffered = 0
+        self._cond = asyncio.Condition()
+        self._ready = asyncio.Event()
+        self._closed = False
+        self._clients = 0
+        self._task: asyncio.Task[None] | None = None
+        self._idle: asyncio.TimerHandle | None = None
+        self.reconnects = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._pump())
+            # Close again if no client ever attaches.
+            if self._clients == 0:
+                self._arm_idle()
+
+    async def wait_ready(self) -> None:
+        """Wait until the first upstream response has been inspected."""
+        await self._ready.wait()
+
+    async def stream(self) -> AsyncIterator[bytes | memoryview]:
+        """Yield audio for one client until the relay closes."""
+        self._clients += 1
+        if self._idle is not None:
+            self._idle.cancel()
+            self._idle = None
+        try:
+            seq = self._preroll_start()
+            while True:
+                async with self._cond:
+                    await self._cond.wait_for(
+                        lambda: self._next_seq > seq or self._closed
+                    )
+                    if self._next_seq <= seq:
+                        return
+                    oldest = self._chunks[0][0]
+                    # A client that fell behind the buffer skips ahead.
+                    seq = max(seq, oldest)
+                    parts = [
+                        d for _, d in itertools.islice(self._chunks, seq - oldest, None)
+                    ]
+                    seq = self._next_seq
+                for d in parts:
+                    yield d
+        finally:
+            self._clients -= 1
+            if self._clients == 0:
+                self._arm_idle()
+
+    async def close(self) -> None:
+        task = self._task
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        else:
+            await self._finish()
+
+    def _preroll_start(self) -> int:
+        seq = self._next_seq
+        size = 0
+        for s, d in reversed(self._chunks):
+            if size >= self._preroll_bytes:
+                break
+            size += len(d)
+            seq = s
+        return seq
+
+    def _arm_idle(self) -> None:
+        if self._closed:
+            return
+        if self._idle is not None:
+            self._idle.cancel()
+        loop = asyncio.get_running_loop()
+        self._idle = loop.call_later(self._idle_sec, self._close_if_idle)
+
+    def _close_if_idle(self) -> None:
+        self._idle = None
+        if self._clients == 0 and self._task is not None:
+            self._task.cancel()
+
+    async def _append(self, data: bytes | memoryview) -> None:
+        if not data:
+            return
+        async with self._cond:
+            self._chunks.append((self._next_seq, data))
+            self._next_seq += 1
+            self._buffered += len(data)
+            while self._buffered > self._buffer_bytes and len(self._chunks) > 1:
+                self._buffered -= len(self._chunks.popleft()[1])
+            self._cond.notify_all()
+
+    async def _pump(self) -> None:
+        delay = RELAY_RECONNECT_BASE_SEC
+        down_since: float | None = None
+        target = self.url
+        hops = 0
+        try:
+            while True:
+                seq = self._next_seq
+                try:
+                    nested = await self._read_upstream(target)
+                except (asyncio.TimeoutError, aiohttp.ClientError, OSError) as e:
+                    if not self._ready.is_set():
+                        self.error = type(e).__name__
+                    nested = None
+                if self.hls or (self.error and not self._ready.is_set()):
+                    return
+                if nested is not None:
+                    hops += 1
+                    if hops > 3:
+                        self.error = "playlist loop"
+                        return
+                    target = nested
+                    continue
+                now = time.monotonic()
+                if self._next_seq != seq:
+                    down_since = None
+                    delay = RELAY_RECONNECT_BASE_SEC
+                if down_since is None:
+                    down_since = now
+                elif now - down_since > self._max_outage_sec:
+                    return
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RELAY_RECONNECT_MAX_SEC)
+                self.reconnects += 1
+        finally:
+            await self._finish()
+
+    async def _read_upstream(self, url: str) -> str | None:
+        """Relay one upstream connection until it ends.
+
+        Returns:
+            The stream URL listed in a PLS/M3U playlist response, which
+            should be connected to instead, or ``None``.
+        """
+        async with self._session.get(url, headers={"Icy-MetaData": "1"}) as r:
+            if r.status >= 400:
+                if not self._ready.is_set():
+                    self.error = f"HTTP {r.status}"
+                return None
+            ctype = r.headers.get("Content-Type", "").split(";", 1)[0].lower()
+            if not self._ready.is_set():
+                if ctype in _HLS_TYPES:
+                    self.hls = True
+                    return None
+                if ctype in _PLAYLIST_TYPES:
+                    body = await r.content.read(_PLAYLIST_MAX_BYTES)
+                    nested = playlist_target(body.decode("utf-8", "replace"))
+                    if nested is None:
+                        self.error = "empty playlist"
+                    return nested
+                self.headers = relay_headers(r.headers)
+                base = {str(k): str(v) for k, v in r.headers.items()}
+                self._hub.publish(self.url, "", base)
+                self._ready.set()
+            else:
+                base = {str(k): str(v) for k, v in r.headers.items()}
+            demux: IcyDemuxer | None
+            try:
+                demux = IcyDemuxer(int(r.headers.get("icy-metaint", "")))
+            except ValueError:
+                demux = None
+            last = self._hub.last(self.url)
+            last_title = last[0] if last else ""
+            async for chunk in r.content.iter_any():
+                if demux is None:
+                    await self._append(chunk)
+                    continue
+                audio, blocks = demux.feed(chunk)
+                for part in audio:
+                    await self._append(part)
+                for text in blocks:
+                    title, meta = parse_icy_metadata(text)
+                    if title and title != last_title:
+                        last_title = title
+                        self._hub.publish(self.url, title, {**base, **meta})
+        return None
+
+    async def _finish(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._ready.set()
+        if self._idle is not None:
+            self._idle.cancel()
+            self._idle = None
+        async with self._cond:
+            self._cond.notify_all()
+        self._hub.forget(self.url)
+        if self._on_close is not None:
+            self._on_close(self)
@@ -0,0 +1,81 @@
+from bisect import bisect_left
+from collections.abc import Sequence
+from dataclasses import dataclass, field, fields
+
+from rarapla.models.channel import Channel
+
+_FIELDS = tuple(f.name for f in fields(Channel) if f.compare)
+
+
+@dataclass
+class ChannelDiff:
+    """Edits that turn one channel list into another, keyed by channel id.
+
+    Attributes:
+        removed: Ids present only in the old list.
+        inserted: Ids present only in the new list.
+        moved: Ids kept in both lists that have to change position. Every
+            other kept id stays put relative to the others, so this is the
+            smallest set of moves.
+        changed: Fields that differ, by id, for channels kept in both lists.
+    """
+
+    removed: list[str] = field(default_factory=list)
+    inserted: list[str] = field(default_factory=list)
+    moved: list[str] = field(default_factory=list)
+    changed: dict[str, frozenset[str]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.removed or self.inserted or self.moved or self.changed)
+
+
+def changed_fields(old: Channel, new: Channel) -> frozenset[str]:
+    """Return the names of the fields that differ between two channels."""
+    if old == new:
+        return frozenset()
+    return frozenset(n for n in _FIELDS if getattr(old, n) != getattr(new, n))
+
+
+def _stable_positions(seq: Sequence[int]) -> set[int]:
+    """Return indexes into ``seq`` of one longest increasing subsequence."""
+    tails: list[int] = []
+    tail_idx: list[int] = []
+    prev = [-1] * len(seq)
+    for i, v in enumerate(seq):
+        k = bisect_left(tails, v)
+        if k == len(tails):
+            tails.append(v)
+            tail_idx.append(i)
+        else:
+            tails[k] = v
+            tail_idx[k] = i
+        prev[i] = tail_idx[k - 1] if k else -1
+    out: set[int] = set()
+    i = tail_idx[-1] if tail_idx else -1
+    while i >= 0:
+        out.add(i)
+        i = prev[i]
+    return out
+
+
+def diff_channels(old: Sequence[Channel], new: Sequence[Channel]) -> ChannelDiff:
+    """Compute the edits from ``old`` to ``new``.
+
+    Channel ids must be unique within each list.
+    """
+    old_pos = {ch.id: i for i, ch in enumerate(old)}
+    new_ids = {ch.id for ch in new}
+    diff = ChannelDiff(removed=[ch.id for ch in old if ch.id not in new_ids])
+    kept: list[Channel] = []
+    for ch in new:
+        i = old_pos.get(ch.id)
+        if i is None:
+            diff.inserted.append(ch.id)
+            continue
+        kept.append(ch)
+        delta = changed_fields(old[i], ch)
+        if delta:
+            diff.changed[ch.id] = delta
+    stable = _stable_positions([old_pos[ch.id] for ch in kept])
+    diff.moved = [ch.id for i, ch in enumerate(kept) if i not in stable]
+    return diff
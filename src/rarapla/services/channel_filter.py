@@ -0,0 +1,146 @@
+import bisect
+import unicodedata
+from collections.abc import Iterable, Sequence
+
+from rarapla.models.channel import Channel
+
+# Katakana (ァ..ヶ) sit 0x60 code points above their hiragana counterparts.
+_KATAKANA_TO_HIRAGANA = {c: c - 0x60 for c in range(0x30A1, 0x30F7)}
+
+
+def normalize(text: str) -> str:
+    """Fold ``text`` for matching.
+
+    NFKC turns half-width kana and full-width Latin letters and digits into
+    their usual forms, case is folded, and katakana become hiragana, so
+    ``ＪＡＺＺ`` matches ``jazz`` and ``ｱﾆｿﾝ`` matches ``あにそん``.
+    """
+    return (
+        unicodedata.normalize("NFKC", text).casefold().translate(_KATAKANA_TO_HIRAGANA)
+    )
+
+
+def _bigrams(text: str) -> frozenset[str]:
+    return frozenset(text[i : i + 2] for i in range(len(text) - 1))
+
+
+def _entry(ch: Channel) -> tuple[str, frozenset[str]]:
+    text = normalize("\n".join((ch.name, ch.program_title, *ch.tags)))
+    return text, _bigrams(text)
+
+
+class ChannelIndex:
+    """In-memory bigram index over channel names, program titles and tags.
+
+    Each query term is looked up by its rarest bigram and the candidates are
+    confirmed with a substring check, so a search touches only the rows
+    that can match. Results keep the order the channels were given in.
+
+    Normalized text and bigrams are cached per channel value, so
+    :meth:`set_channels` after a refresh only processes channels that
+    changed, and :meth:`update` patches a single channel in place.
+    """
+
+    def __init__(self, channels: Iterable[Channel] = ()) -> None:
+        self._channels: list[Channel] = []
+        self._texts: list[str] = []
+        self._postings: dict[str, list[int]] = {}
+        self._entries: dict[Channel, tuple[str, frozenset[str]]] = {}
+        self._rows: dict[str, int] = {}
+        self._last_terms: list[str] = []
+        self._last_rows: list[int] | None = None
+        self.set_channels(channels)
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def set_channels(self, channels: Iterable[Channel]) -> None:
+        """Index ``channels``, reusing the entries of unchanged channels."""
+        self._channels = list(channels)
+        known = self._entries
+        self._entries = {}
+        self._texts = []
+        self._rows = {}
+        postings: dict[str, list[int]] = {}
+        for row, ch in enumerate(self._channels):
+            entry = known.get(ch)
+            if entry is None:
+                entry = _entry(ch)
+            self._entries[ch] = entry
+            self._texts.append(entry[0])
+            self._rows[ch.id] = row
+            for gram in entry[1]:
+                posting = postings.get(gram)
+                if posting is None:
+                    postings[gram] = [row]
+                else:
+                    posting.append(row)
+        self._postings = postings
+        self._last_terms = []
+        self._last_rows = None
+
+    def update(self, channel: Channel) -> bool:
+        """Replace the indexed channel with ``channel``'s id in place.
+
+        Returns:
+            ``False`` if no channel with that id is indexed.
+        """
+        row = self._rows.get(channel.id)
+        if row is None:
+            return False
+        old = self._channels[row]
+        if old == channel:
+            return True
+        entry = self._entries.get(channel) or _entry(channel)
+        self._entries.pop(old, None)
+        old_grams = _bigrams(self._texts[row])
+        for gram in old_grams - entry[1]:
+            posting = self._postings[gram]
+            posting.remove(row)
+            if not posting:
+                del self._postings[gram]
+        for gram in entry[1] - old_grams:
+            bisect.insort(self._postings.setdefault(gram, []), row)
+        self._channels[row] = channel
+        self._entries[channel] = entry
+        self._texts[row] = entry[0]
+        self._last_terms = []
+        self._last_rows = None
+        return True
+
+    def search(self, query: str) -> list[Channel]:
+        """Return the channels whose text contains every word of ``query``."""
+        return [self._channels[r] for r in self.search_rows(query)]
+
+    def search_rows(self, query: str) -> list[int]:
+        terms = normalize(query).split()
+        if not terms:
+            rows = list(range(len(self._channels)))
+        elif self._last_rows is not None and _narrows(self._last_terms, terms):
+            # Typing on extends the previous query: refine its results.
+            rows = self._confirm(self._last_rows, terms)
+        else:
+            rows = self._confirm(self._candidates(terms), terms)
+        self._last_terms = terms
+        self._last_rows = rows
+        return rows
+
+    def _candidates(self, terms: Sequence[str]) -> Sequence[int]:
+        best: Sequence[int] | None = None
+        for term in terms:
+            if len(term) < 2:
+                continue
+            for gram in _bigrams(term):
+                posting = self._postings.get(gram, [])
+                if best is None or len(posting) < len(best):
+                    best = posting
+        return range(len(self._channels)) if best is None else best
+
+    def _confirm(self, rows: Iterable[int], terms: Sequence[str]) -> list[int]:
+        texts = self._texts
+        return [r for r in rows if all(t in texts[r] for t in terms)]
+
+
+def _narrows(old: Sequence[str], new: Sequence[str]) -> bool:
+    """Whether every match of ``new`` is also a match of ``old``."""
+    return all(any(o in n for n in new) for o in old)
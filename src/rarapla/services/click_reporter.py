@@ -0,0 +1,213 @@
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from rarapla.config import (
+    RB_CLICK_DEDUPE_SEC,
+    RB_CLICK_MAX_AGE_SEC,
+    RB_CLICK_MAX_ATTEMPTS,
+    RB_CLICK_RETRY_BASE_SEC,
+    RB_CLICK_RETRY_MAX_SEC,
+)
+
+
+@dataclass(eq=False)
+class PendingClick:
+    uuid: str
+    queued_at: float
+    attempts: int = 0
+    due: float = 0.0
+
+
+class ClickReporter:
+    """Send Radio Browser click notifications from a background thread.
+
+    ``report`` only queues the click and returns immediately. Clicks for the
+    same station within ``dedupe_sec`` are dropped, failed sends are retried
+    with exponential backoff and the queue is persisted to ``path`` so
+    unsent clicks survive a restart. The file is only written from the
+    background thread (or ``flush_once``/``stop``), never while the queue
+    lock is held.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], None],
+        path: str | None = None,
+        dedupe_sec: float = RB_CLICK_DEDUPE_SEC,
+        max_attempts: int = RB_CLICK_MAX_ATTEMPTS,
+        retry_base_sec: float = RB_CLICK_RETRY_BASE_SEC,
+        retry_max_sec: float = RB_CLICK_RETRY_MAX_SEC,
+    ) -> None:
+        self._send = send
+        self._path = path
+        self._dedupe_sec = dedupe_sec
+        self._max_attempts = max_attempts
+        self._retry_base_sec = retry_base_sec
+        self._retry_max_sec = retry_max_sec
+        self._cond = threading.Condition()
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._queue: list[PendingClick] = []
+        self._recent: dict[str, float] = {}
+        self._running = False
+        self._thread: threading.Thread | None = None
+        self._load()
+
+    def start(self) -> None:
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="ClickReporter", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        t = self._thread
+        self._thread = None
+        if t is not None:
+            t.join(timeout)
+        self._persist()
+
+    def report(self, station_uuid: str) -> bool:
+        now = time.time()
+        with self._cond:
+            self._recent = {
+                k: t for k, t in self._recent.items() if now - t < self._dedupe_sec
+            }
+            last = self._recent.get(station_uuid)
+            if last is not None and now - last < self._dedupe_sec:
+                return False
+            self._recent[station_uuid] = now
+            self._queue.append(PendingClick(station_uuid, now, due=time.monotonic()))
+            self._dirty = True
+            self._cond.notify_all()
+        return True
+
+    def pending(self) -> list[PendingClick]:
+        with self._cond:
+            return list(self._queue)
+
+    def flush_once(self) -> int:
+        """Send every click that is currently due and return how many succeeded."""
+        sent = 0
+        while True:
+            with self._cond:
+                item = self._next_due(time.monotonic())
+            if item is None:
+                return sent
+            if self._deliver(item):
+                sent += 1
+
+    def _run(self) -> None:
+        while True:
+            self._persist()
+            with self._cond:
+                if not self._running:
+                    return
+                now = time.monotonic()
+                item = self._next_due(now)
+                if item is None:
+                    if not self._dirty:
+                        self._cond.wait(self._seconds_until_next(now))
+                    continue
+            self._deliver(item)
+
+    def _next_due(self, now: float) -> PendingClick | None:
+        for item in self._queue:
+            if item.due <= now:
+                return item
+        return None
+
+    def _seconds_until_next(self, now: float) -> float | None:
+        if not self._queue:
+            return None
+        return max(0.0, min(i.due for i in self._queue) - now)
+
+    def _deliver(self, item: PendingClick) -> bool:
+        try:
+            self._send(item.uuid)
+            ok = True
+        except Exception:
+            ok = False
+        with self._cond:
+            if item not in self._queue:
+                return ok
+            if ok:
+                self._queue.remove(item)
+            else:
+                item.attempts += 1
+                if item.attempts >= self._max_attempts:
+                    self._queue.remove(item)
+                else:
+                    delay = self._retry_base_sec * (2 ** (item.attempts - 1))
+                    delay = min(delay, self._retry_max_sec)
+                    item.due = time.monotonic() + delay
+            self._dirty = True
+        self._persist()
+        return ok
+
+    def _load(self) -> None:
+        if not self._path or not os.path.isfile(self._path):
+            return
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                data = json.load(f) or []
+        except Exception:
+            return
+        cutoff = time.time() - RB_CLICK_MAX_AGE_SEC
+        now = time.monotonic()
+        for it in data:
+            try:
+                item = PendingClick(
+                    str(it["uuid"]),
+                    float(it["queued_at"]),
+                    int(it.get("attempts", 0)),
+                    due=now,
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+            if item.queued_at < cutoff:
+                continue
+            self._queue.append(item)
+            self._recent[item.uuid] = max(
+                item.queued_at, self._recent.get(item.uuid, 0.0)
+            )
+
+    def _persist(self) -> None:
+        """Write the queue to ``path`` if it changed since the last write.
+
+        Must not be called with ``_cond`` held: only the snapshot is taken
+        under it, the file is written after releasing it. ``_save_lock``
+        keeps an older snapshot from overwriting a newer one.
+        """
+        if not self._path:
+            return
+        with self._save_lock:
+            with self._cond:
+                if not self._dirty:
+                    return
+                self._dirty = False
+                data = [
+                    {"uuid": i.uuid, "queued_at": i.queued_at, "attempts": i.attempts}
+                    for i in self._queue
+                ]
+            self._save(self._path, data)
+
+    @staticmethod
+    def _save(path: str, data: list[dict[str, object]]) -> None:
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except Exception:
+            pass
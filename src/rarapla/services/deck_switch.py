@@ -0,0 +1,73 @@
+"""Bookkeeping for switching streams between two players without a gap."""
+
+import math
+from typing import Generic, TypeVar
+
+D = TypeVar("D")
+
+
+def crossfade_gains(progress: float) -> tuple[float, float]:
+    """Return the outgoing and incoming gain ``progress`` into a crossfade.
+
+    Equal-power curves keep the loudness steady through the fade where a
+    linear one would dip in the middle.
+    """
+    p = min(max(progress, 0.0), 1.0)
+    return math.cos(p * math.pi / 2), math.sin(p * math.pi / 2)
+
+
+class DeckSwitch(Generic[D]):
+    """Track which of two decks is audible while switching between them.
+
+    The active deck is the one listeners hear. A switch loads the next
+    stream on the standby deck; :meth:`cut_over` swaps the roles and keeps
+    the previous deck as the outgoing one until it has faded out and
+    :meth:`release` hands it back. This class only keeps the roles; the
+    caller starts, stops and mutes the decks it returns.
+    """
+
+    def __init__(self, first: D, second: D) -> None:
+        self.active: D = first
+        self.standby: D = second
+        self.outgoing: D | None = None
+        self.started_at: float | None = None
+
+    @property
+    def switching(self) -> bool:
+        return self.started_at is not None
+
+    def pending(self, deck: D) -> bool:
+        """Return whether ``deck`` is the one a running switch waits for."""
+        return self.switching and deck is self.standby
+
+    def begin(self, now: float) -> D:
+        """Start switching at ``now`` and return the deck to load."""
+        self.started_at = now
+        return self.standby
+
+    def abort(self) -> D | None:
+        """Give up a running switch and return the deck to reset, if any."""
+        if self.started_at is None:
+            return None
+        self.started_at = None
+        return self.standby
+
+    def cut_over(self, now: float) -> float | None:
+        """Make the standby deck the active one.
+
+        Returns:
+            Milliseconds since :meth:`begin`, or ``None`` when no switch
+            was running.
+        """
+        started = self.started_at
+        if started is None:
+            return None
+        self.started_at = None
+        self.outgoing, self.active = self.active, self.standby
+        self.standby = self.outgoing
+        return (now - started) * 1000
+
+    def release(self) -> D | None:
+        """Forget the outgoing deck and return it so it can be stopped."""
+        outgoing, self.outgoing = self.outgoing, None
+        return outgoing
@@ -0,0 +1,111 @@
+"""Split ICY metadata blocks out of a Shoutcast/Icecast audio stream."""
+
+from urllib.parse import parse_qs, unquote_plus
+
+from rarapla.config import ICY_METADATA_BLOCK_SIZE
+
+_MAX_BLOCK = 255 * ICY_METADATA_BLOCK_SIZE
+
+
+def decode_icy_text(data: bytes | bytearray | memoryview) -> str:
+    try:
+        return str(data, "utf-8")
+    except UnicodeDecodeError:
+        # latin-1 maps every byte, so this cannot fail.
+        return str(data, "latin-1")
+
+
+def parse_icy_metadata(text: str, station: str = "") -> tuple[str, dict[str, str]]:
+    """Split an ICY metadata block into its title and a display mapping."""
+    items: dict[str, str] = {}
+    for part in text.split(";"):
+        part = part.strip()
+        if not part or "=" not in part:
+            continue
+        k, v = part.split("=", 1)
+        v = v.strip().strip("'").strip('"')
+        items[k.strip().lower()] = v
+    title = items.get("streamtitle", "").strip()
+    stream_url = items.get("streamurl", "")
+    meta_map: dict[str, str] = {}
+    if station:
+        meta_map["Station"] = station
+    if title:
+        meta_map["Title"] = title
+    if stream_url:
+        meta_map["URL"] = stream_url
+        try:
+            qs = parse_qs(stream_url.split("?", 1)[1])
+            artist = unquote_plus(qs.get("artist", [""])[0])
+            album = unquote_plus(qs.get("album", [""])[0])
+            if artist:
+                meta_map["Artist"] = artist
+            if album:
+                meta_map["Album"] = album
+        except Exception:
+            pass
+    return (title, meta_map)
+
+
+class IcyDemuxer:
+    """Separate interleaved ICY metadata from the audio bytes of a stream.
+
+    Chunks of any size can be fed in as they arrive. Audio comes back as
+    zero-copy views of the input and each metadata block is assembled in a
+    single preallocated buffer, so no per-block allocation happens apart
+    from the decoded text itself.
+    """
+
+    def __init__(self, metaint: int) -> None:
+        if metaint <= 0:
+            raise ValueError(f"invalid icy-metaint: {metaint!r}")
+        self._metaint = metaint
+        self._audio_left = metaint
+        self._meta_len = 0
+        self._meta_fill = 0
+        self._buf = bytearray(_MAX_BLOCK)
+
+    def feed(self, data: bytes) -> tuple[list[memoryview], list[str]]:
+        """Consume ``data`` and return its audio parts and complete metadata.
+
+        The returned views reference ``data`` and stay valid as long as it
+        does. Empty metadata blocks are skipped.
+        """
+        view = memoryview(data)
+        n = len(view)
+        pos = 0
+        audio: list[memoryview] = []
+        meta: list[str] = []
+        while pos < n:
+            if self._meta_len:
+                take = min(self._meta_len - self._meta_fill, n - pos)
+                end = self._meta_fill + take
+                self._buf[self._meta_fill : end] = view[pos : pos + take]
+                self._meta_fill = end
+                pos += take
+                if self._meta_fill == self._meta_len:
+                    text = self._take_block()
+                    if text:
+                        meta.append(text)
+            elif self._audio_left == 0:
+                self._meta_len = view[pos] * ICY_METADATA_BLOCK_SIZE
+                self._meta_fill = 0
+                pos += 1
+                if not self._meta_len:
+                    self._audio_left = self._metaint
+            else:
+                take = min(self._audio_left, n - pos)
+                audio.append(view[pos : pos + take])
+                self._audio_left -= take
+                pos += take
+        return audio, meta
+
+    def _take_block(self) -> str:
+        length = self._meta_len
+        self._meta_len = 0
+        self._meta_fill = 0
+        self._audio_left = self._metaint
+        end = self._buf.find(b"\x00", 0, length)
+        if end < 0:
+            end = length
+        return decode_icy_text(memoryview(self._buf)[:end]).strip()
@@ -1,218 +1,130 @@
-from PySide6.QtCore import QObject, QThread, Signal
+from PySide6.QtCore import QObject, Signal
 import asyncio
-import aiohttp
+import json
 from collections.abc import Mapping
-from urllib.parse import parse_qs, unquote_plus
+from concurrent.futures import Future
+from typing import TYPE_CHECKING
 
-from rarapla.config import (
-    ICY_CONNECT_TIMEOUT_SEC,
-    ICY_METADATA_BLOCK_SIZE,
-    ICY_READ_TIMEOUT_SEC,
-    ICY_RETRY_DELAY_SEC,
-    ICY_STOP_TIMEOUT_SEC,
-)
+from rarapla.config import ICY_RETRY_DELAY_SEC
+from rarapla.services.icy_demuxer import IcyDemuxer, parse_icy_metadata
+from rarapla.services.metadata_service import MetadataService
 
+if TYPE_CHECKING:
+    import aiohttp
 
-class IcyWatcher(QThread):
+
+class IcyWatcher(QObject):
     metaUpdated = Signal(str, dict)
     notSupported = Signal(str)
     networkError = Signal(str)
 
     def __init__(
-        self, url: str, user_agent: str | None = None, parent: QObject | None = None
+        self,
+        url: str,
+        service: MetadataService,
+        user_agent: str | None = None,
+        parent: QObject | None = None,
+        events_url: str | None = None,
     ) -> None:
         super().__init__(parent)
         self._url = url
+        self._service = service
         self._user_agent = user_agent
+        self._events_url = events_url
         self._running = False
         self._last_title = ""
         self._base_meta: dict[str, str] = {}
-        self._loop: asyncio.AbstractEventLoop | None = None
-        self._task: asyncio.Task[None] | None = None
-        self._session: aiohttp.ClientSession | None = None
-        self._resp: aiohttp.ClientResponse | None = None
+        self._future: Future[None] | None = None
 
-    def run(self) -> None:
+    def start(self) -> None:
+        if self._future is not None and not self._future.done():
+            return
         self._running = True
-        loop = asyncio.new_event_loop()
-        self._loop = loop
-        try:
-            self._task = loop.create_task(self._main())
-            loop.run_until_complete(self._task)
-        except Exception as e:
-            self.networkError.emit(f"IcyWatcher fatal: {e!r}")
-        finally:
-            try:
-                loop.run_until_complete(self._graceful_close())
-            except Exception:
-                pass
-            try:
-                loop.close()
-            except Exception:
-                pass
-            self._loop = None
-            self._task = None
+        main = self._follow_events if self._events_url else self._main
+        self._future = self._service.submit(main)
 
     def stop(self) -> None:
         self._running = False
-        loop = self._loop
-        if loop is None:
-            return
-
-        async def _cancel() -> None:
-            if self._resp is not None:
-                try:
-                    self._resp.close()
-                except Exception:
-                    pass
-                self._resp = None
-            if self._session is not None:
-                try:
-                    await self._session.close()
-                except Exception:
-                    pass
-                self._session = None
-            if self._task is not None and (not self._task.done()):
-                try:
-                    self._task.cancel()
-                except Exception:
-                    pass
+        fut = self._future
+        self._future = None
+        if fut is not None:
+            fut.cancel()
 
-        try:
-            fut = asyncio.run_coroutine_threadsafe(_cancel(), loop)
-            try:
-                fut.result(timeout=ICY_STOP_TIMEOUT_SEC)
-            except Exception:
-                pass
-        except Exception:
-            pass
+    def isRunning(self) -> bool:
+        return self._future is not None and not self._future.done()
 
-    async def _main(self) -> None:
+    async def _main(self, session: "aiohttp.ClientSession") -> None:
         headers = {"Icy-MetaData": "1"}
         if self._user_agent:
             headers["User-Agent"] = self._user_agent
-        timeout = aiohttp.ClientTimeout(
-            sock_connect=ICY_CONNECT_TIMEOUT_SEC, sock_read=None
-        )
-        self._session = aiohttp.ClientSession(timeout=timeout)
-        try:
-            while self._running:
-                try:
-                    async with self._session.get(self._url, headers=headers) as resp:
-                        self._resp = resp
-                        metaint_str = resp.headers.get(
-                            "icy-metaint"
-                        ) or resp.headers.get("Icy-MetaInt")
-                        self._base_meta = self._extract_headers(resp.headers)
-                        self.metaUpdated.emit("", dict(self._base_meta))
-                        if not metaint_str:
-                            self.notSupported.emit(
-                                "icy-metaint header is missing (no ICY metadata)."
-                            )
-                            return
-                        try:
-                            metaint = int(metaint_str)
-                            if metaint <= 0:
-                                raise ValueError
-                        except Exception:
-                            self.notSupported.emit(
-                                f"invalid icy-metaint: {metaint_str!r}"
-                            )
+        while self._running:
+            try:
+                async with session.get(self._url, headers=headers) as resp:
+                    metaint_str = resp.headers.get("icy-metaint") or resp.headers.get(
+                        "Icy-MetaInt"
+                    )
+                    self._base_meta = self._extract_headers(resp.headers)
+                    self._emit_meta("", dict(self._base_meta))
+                    if not metaint_str:
+                        self._emit_not_supported(
+                            "icy-metaint header is missing (no ICY metadata)."
+                        )
+                        return
+                    try:
+                        demux = IcyDemuxer(int(metaint_str))
+                    except ValueError:
+                        self._emit_not_supported(
+                            f"invalid icy-metaint: {metaint_str!r}"
+                        )
+                        return
+                    async for chunk in resp.content.iter_any():
+                        if not self._running:
                             return
-                        reader = resp.content
-                        while self._running:
-                            try:
-                                await asyncio.wait_for(
-                                    reader.readexactly(metaint),
-                                    timeout=ICY_READ_TIMEOUT_SEC,
-                                )
-                                length_byte = await asyncio.wait_for(
-                                    reader.readexactly(1),
-                                    timeout=ICY_READ_TIMEOUT_SEC,
-                                )
-                            except (asyncio.TimeoutError, asyncio.IncompleteReadError):
-                                continue
-                            block_len = length_byte[0] * ICY_METADATA_BLOCK_SIZE
-                            if block_len:
-                                try:
-                                    block = await asyncio.wait_for(
-                                        reader.readexactly(block_len),
-                                        timeout=ICY_READ_TIMEOUT_SEC,
-                                    )
-                                except (
-                                    asyncio.TimeoutError,
-                                    asyncio.IncompleteReadError,
-                                ):
-                                    continue
-                                text = self._decode(block)
-                                title, meta_map = self._parse_metadata_text(text, "")
-                                if title and title != self._last_title:
-                                    self._last_title = title
-                                    all_meta = {**self._base_meta, **meta_map}
-                                    self.metaUpdated.emit(title, all_meta)
-                except asyncio.CancelledError:
-                    return
-                except Exception as e:
+                        for text in demux.feed(chunk)[1]:
+                            self._on_block(text)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self._running:
                     self.networkError.emit(f"IcyWatcher: {e!r}")
-                    await asyncio.sleep(ICY_RETRY_DELAY_SEC)
-                finally:
-                    self._resp = None
-        finally:
-            pass
+            await asyncio.sleep(ICY_RETRY_DELAY_SEC)
 
-    async def _graceful_close(self) -> None:
-        if self._resp is not None:
+    async def _follow_events(self, session: "aiohttp.ClientSession") -> None:
+        # The proxy relays the audio and publishes the metadata it strips,
+        # so only this lightweight local feed is needed.
+        assert self._events_url is not None
+        while self._running:
             try:
-                self._resp.close()
-            except Exception:
-                pass
-            self._resp = None
-        if self._session is not None:
-            try:
-                await self._session.close()
-            except Exception:
-                pass
-            self._session = None
+                async with session.get(self._events_url) as resp:
+                    resp.raise_for_status()
+                    async for line in resp.content:
+                        if not line.strip():
+                            continue
+                        event = json.loads(line)
+                        self._emit_meta(
+                            str(event.get("title") or ""), dict(event.get("meta") or {})
+                        )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self._running:
+                    self.networkError.emit(f"IcyWatcher: {e!r}")
+            await asyncio.sleep(ICY_RETRY_DELAY_SEC)
 
-    def _decode(self, data: bytes) -> str:
-        for enc in ("utf-8", "latin-1", "cp1252"):
-            try:
-                return data.rstrip(b"\x00").decode(enc, errors="ignore")
-            except Exception:
-                pass
-        return ""
+    def _on_block(self, text: str) -> None:
+        title, meta_map = parse_icy_metadata(text)
+        if title and title != self._last_title:
+            self._last_title = title
+            self._emit_meta(title, {**self._base_meta, **meta_map})
 
-    def _parse_metadata_text(
-        self, text: str, station: str
-    ) -> tuple[str, dict[str, str]]:
-        items: dict[str, str] = {}
-        for part in text.split(";"):
-            part = part.strip()
-            if not part or "=" not in part:
-                continue
-            k, v = part.split("=", 1)
-            v = v.strip().strip("'").strip('"')
-            items[k.strip().lower()] = v
-        title = items.get("streamtitle", "").strip()
-        stream_url = items.get("streamurl", "")
-        meta_map: dict[str, str] = {}
-        if station:
-            meta_map["Station"] = station
-        if title:
-            meta_map["Title"] = title
-        if stream_url:
-            meta_map["URL"] = stream_url
-            try:
-                qs = parse_qs(stream_url.split("?", 1)[1])
-                artist = unquote_plus(qs.get("artist", [""])[0])
-                album = unquote_plus(qs.get("album", [""])[0])
-                if artist:
-                    meta_map["Artist"] = artist
-                if album:
-                    meta_map["Album"] = album
-            except Exception:
-                pass
-        return (title, meta_map)
+    def _emit_meta(self, title: str, meta: dict[str, str]) -> None:
+        # A stopped watch may still be winding down on the service loop.
+        if self._running:
+            self.metaUpdated.emit(title, meta)
+
+    def _emit_not_supported(self, reason: str) -> None:
+        if self._running:
+            self.notSupported.emit(reason)
 
     def _extract_headers(self, hdr: Mapping[str, str]) -> dict[str, str]:
         return {str(k): str(v) for k, v in hdr.items()}
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from collections.abc import Callable, Coroutine
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from rarapla.config import ICY_CONNECT_TIMEOUT_SEC, ICY_STOP_TIMEOUT_SEC
+
+if TYPE_CHECKING:
+    import aiohttp
+
+T = TypeVar("T")
+
+
+class MetadataService:
+    """Host stream metadata watchers as tasks on one background event loop.
+
+    The loop and its :class:`aiohttp.ClientSession` are created on first use
+    and shared by every watcher, so starting a watch only schedules a task and
+    stopping one only cancels it. Neither call blocks the caller.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._session: "aiohttp.ClientSession | None" = None
+        self._lock = threading.Lock()
+
+    def submit(
+        self, fn: "Callable[[aiohttp.ClientSession], Coroutine[Any, Any, T]]"
+    ) -> "Future[T]":
+        """Run ``fn(session)`` on the service loop.
+
+        Cancelling the returned future cancels the task.
+        """
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self._call(fn), loop)
+
+    def stop(self, timeout: float = ICY_STOP_TIMEOUT_SEC) -> None:
+        with self._lock:
+            loop, t = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop)
+        except RuntimeError:
+            return
+        if t is not None:
+            t.join(timeout)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                t = threading.Thread(
+                    target=self._run, args=(loop,), name="MetadataService", daemon=True
+                )
+                self._loop = loop
+                self._thread = t
+                t.start()
+            return self._loop
+
+    def _run(self, loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    async def _call(
+        self, fn: "Callable[[aiohttp.ClientSession], Coroutine[Any, Any, T]]"
+    ) -> T:
+        import aiohttp
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=ICY_CONNECT_TIMEOUT_SEC, sock_read=None
+                )
+            )
+        return await fn(self._session)
+
+    async def _shutdown(self) -> None:
+        current = asyncio.current_task()
+        tasks = [t for t in asyncio.all_tasks() if t is not current]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        asyncio.get_running_loop().stop()
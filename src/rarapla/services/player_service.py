@@ -1,36 +1,201 @@
-from PySide6.QtCore import QUrl
+import time
+from functools import partial
+from PySide6.QtCore import QObject, QTimer, QUrl, QVariantAnimation, Signal
 from PySide6.QtMultimedia import QAudioDevice, QAudioOutput, QMediaPlayer
-from rarapla.config import AUDIO_MAX_VOLUME, AUDIO_MIN_VOLUME
+from rarapla.config import (
+    AUDIO_MAX_VOLUME,
+    AUDIO_MIN_VOLUME,
+    PLAYER_CROSSFADE_MS,
+    PLAYER_SWITCH_TIMEOUT_MS,
+)
+from rarapla.services.deck_switch import DeckSwitch, crossfade_gains
 
 
-class PlayerService:
+class PlayerService(QObject):
+    """Play one stream at a time and switch streams without a gap.
 
-    def __init__(self) -> None:
-        self.audio: QAudioOutput = QAudioOutput()
-        self.player: QMediaPlayer = QMediaPlayer()
-        self.player.setAudioOutput(self.audio)
+    Two media players take turns. While one plays, :meth:`switch_to` starts
+    the next stream muted on the other one; once that one produces audio
+    the two crossfade and the old one is released. If the new stream has
+    no audio within ``switch_timeout_ms`` the old one is cut anyway.
+
+    Signals of the audible player are forwarded, so listeners do not need
+    to follow which one that is. :attr:`switched` reports how long each
+    gapless switch took from the request to audible output.
+    """
+
+    playbackStateChanged = Signal(object)
+    metaDataChanged = Signal()
+    errorOccurred = Signal(object, str)
+    positionChanged = Signal(int)
+    switched = Signal(float)
+
+    def __init__(
+        self,
+        crossfade_ms: int = PLAYER_CROSSFADE_MS,
+        switch_timeout_ms: int = PLAYER_SWITCH_TIMEOUT_MS,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._players = (self._new_deck(), self._new_deck())
+        self._decks = DeckSwitch(*self._players)
+        self._volume = 1.0
         self._last_url: str | None = None
+        self._fade = QVariantAnimation(self)
+        self._fade.setStartValue(0.0)
+        self._fade.setEndValue(1.0)
+        self._fade.setDuration(max(1, crossfade_ms))
+        self._fade.valueChanged.connect(self._on_fade_step)
+        self._fade.finished.connect(self._release_outgoing)
+        self._switch_timeout = QTimer(self)
+        self._switch_timeout.setSingleShot(True)
+        self._switch_timeout.setInterval(switch_timeout_ms)
+        self._switch_timeout.timeout.connect(self._cut_over)
+
+    @property
+    def player(self) -> QMediaPlayer:
+        """The player that is audible, or will be once playback starts."""
+        return self._decks.active
+
+    @property
+    def audio(self) -> QAudioOutput:
+        return self._audio_of(self._decks.active)
+
+    @property
+    def switching(self) -> bool:
+        return self._decks.switching
 
     def set_volume(self, vol: int) -> None:
         v = min(max(vol, AUDIO_MIN_VOLUME), AUDIO_MAX_VOLUME)
-        self.audio.setVolume(v / AUDIO_MAX_VOLUME)
+        self._volume = v / AUDIO_MAX_VOLUME
+        if self._fade.state() == QVariantAnimation.State.Running:
+            self._on_fade_step(self._fade.currentValue())
+        else:
+            self.audio.setVolume(self._volume)
 
     def set_media(self, url: str) -> None:
+        self._abort_switch()
+        self._release_outgoing()
         self._last_url = url
-        self.player.setSource(QUrl(url))
+        self._decks.active.setSource(QUrl(url))
+
+    def switch_to(self, url: str) -> None:
+        """Play ``url``, keeping the current stream audible until it starts.
+
+        Without anything playing this is :meth:`set_media` and :meth:`play`.
+        """
+        active = self._decks.active
+        if active.playbackState() != QMediaPlayer.PlaybackState.PlayingState:
+            self.set_media(url)
+            self.play()
+            return
+        self._abort_switch()
+        self._release_outgoing()
+        self._last_url = url
+        standby = self._decks.begin(time.perf_counter())
+        self._audio_of(standby).setVolume(0.0)
+        standby.setSource(QUrl(url))
+        standby.play()
+        self._switch_timeout.start()
 
     def play(self) -> None:
-        if self.player.playbackState() == QMediaPlayer.PlaybackState.StoppedState:
+        active = self._decks.active
+        if active.playbackState() == QMediaPlayer.PlaybackState.StoppedState:
             if self._last_url:
-                self.player.setSource(QUrl(self._last_url))
-        self.player.play()
+                active.setSource(QUrl(self._last_url))
+        active.play()
+
+    def play_loaded(self) -> None:
+        """Start the loaded source as is, keeping what it has buffered."""
+        self._decks.active.play()
 
     def stop(self) -> None:
-        self.player.stop()
+        self._abort_switch()
+        self._release_outgoing()
+        self._decks.active.stop()
 
     def set_output_device(self, device: QAudioDevice) -> None:
-        self.audio.setDevice(device)
+        for deck in self._players:
+            self._audio_of(deck).setDevice(device)
 
     def clear_source(self) -> None:
-        self.player.stop()
-        self.player.setSource(QUrl())
+        self.stop()
+        self._decks.active.setSource(QUrl())
+
+    def _new_deck(self) -> QMediaPlayer:
+        player = QMediaPlayer(self)
+        player.setAudioOutput(QAudioOutput(player))
+        player.playbackStateChanged.connect(partial(self._on_state, player))
+        player.metaDataChanged.connect(partial(self._on_meta, player))
+        player.errorOccurred.connect(partial(self._on_error, player))
+        player.positionChanged.connect(partial(self._on_position, player))
+        return player
+
+    def _audio_of(self, player: QMediaPlayer) -> QAudioOutput:
+        out = player.audioOutput()
+        assert out is not None
+        return out
+
+    def _on_state(self, player: QMediaPlayer, state: object) -> None:
+        if player is self._decks.active:
+            self.playbackStateChanged.emit(state)
+
+    def _on_meta(self, player: QMediaPlayer) -> None:
+        if player is self._decks.active:
+            self.metaDataChanged.emit()
+
+    def _on_error(self, player: QMediaPlayer, error: object, text: str) -> None:
+        if self._decks.pending(player):
+            # The new stream failed; switch anyway so the error shows up for
+            # the station the user picked.
+            self._cut_over()
+        if player is self._decks.active:
+            self.errorOccurred.emit(error, text)
+
+    def _on_position(self, player: QMediaPlayer, position: int) -> None:
+        if self._decks.pending(player):
+            if position > 0:
+                self._cut_over(fade=True)
+            return
+        if player is self._decks.active:
+            self.positionChanged.emit(position)
+
+    def _cut_over(self, fade: bool = False) -> None:
+        """Make the standby player the audible one."""
+        ms = self._decks.cut_over(time.perf_counter())
+        if ms is None:
+            return
+        self._switch_timeout.stop()
+        if fade:
+            self.switched.emit(ms)
+            self._fade.start()
+        else:
+            self._release_outgoing()
+            self.audio.setVolume(self._volume)
+        self.playbackStateChanged.emit(self._decks.active.playbackState())
+        self.metaDataChanged.emit()
+
+    def _abort_switch(self) -> None:
+        standby = self._decks.abort()
+        if standby is None:
+            return
+        self._switch_timeout.stop()
+        standby.stop()
+        standby.setSource(QUrl())
+
+    def _on_fade_step(self, value: object) -> None:
+        fade_out, fade_in = crossfade_gains(value if isinstance(value, float) else 0.0)
+        if self._decks.outgoing is not None:
+            self._audio_of(self._decks.outgoing).setVolume(self._volume * fade_out)
+        self.audio.setVolume(self._volume * fade_in)
+
+    def _release_outgoing(self) -> None:
+        if self._fade.state() == QVariantAnimation.State.Running:
+            self._fade.stop()
+        outgoing = self._decks.release()
+        if outgoing is None:
+            return
+        outgoing.stop()
+        outgoing.setSource(QUrl())
+        self._audio_of(outgoing).setVolume(self._volume)
+        self.audio.setVolume(self._volume)
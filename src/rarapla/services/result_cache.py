@@ -0,0 +1,46 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class ResultCache(Generic[K, V]):
+    """Keep the latest results per key for ``ttl_sec`` seconds.
+
+    At most ``max_entries`` keys are kept; the least recently used goes
+    first.
+    """
+
+    def __init__(
+        self,
+        ttl_sec: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_sec = ttl_sec
+        self._max = max_entries
+        self._clock = clock
+        self._items: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        stored_at, value = item
+        if self._clock() - stored_at >= self._ttl_sec:
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        self._items[key] = (self._clock(), value)
+        self._items.move_to_end(key)
+        while len(self._items) > self._max:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self._items.clear()
@@ -0,0 +1,258 @@
+import asyncio
+import threading
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING
+
+from rarapla.config import (
+    RB_STREAM_PROBE_BYTES,
+    RB_STREAM_PROBE_CONCURRENCY,
+    RB_STREAM_PROBE_TIMEOUT_SEC,
+    RB_STREAM_PROBE_TTL_SEC,
+    USER_AGENT,
+)
+from rarapla.models.channel import Channel
+from rarapla.services.task_executor import CancelToken, TaskCancelled
+
+if TYPE_CHECKING:
+    import aiohttp
+
+_CODECS = {
+    "audio/mpeg": "MP3",
+    "audio/mp3": "MP3",
+    "audio/aac": "AAC",
+    "audio/aacp": "AAC+",
+    "audio/x-aac": "AAC",
+    "audio/mp4": "AAC",
+    "audio/ogg": "OGG",
+    "application/ogg": "OGG",
+    "audio/opus": "OPUS",
+    "audio/flac": "FLAC",
+    "audio/x-flac": "FLAC",
+    "application/vnd.apple.mpegurl": "HLS",
+    "application/x-mpegurl": "HLS",
+    "audio/mpegurl": "HLS",
+    "audio/x-mpegurl": "M3U",
+    "audio/x-scpls": "PLS",
+}
+
+
+@dataclass
+class StreamHealth:
+    url: str
+    ok: bool
+    connect_sec: float | None = None
+    codec: str | None = None
+    bitrate: int | None = None
+    error: str | None = None
+    checked_at: float = 0.0
+
+    def summary(self) -> str:
+        if not self.ok:
+            return f"unreachable ({self.error})" if self.error else "unreachable"
+        parts: list[str] = []
+        if self.bitrate:
+            parts.append(f"{self.bitrate} kbps")
+        if self.codec:
+            parts.append(self.codec)
+        if self.connect_sec is not None:
+            parts.append(f"{int(self.connect_sec * 1000)} ms")
+        return " / ".join(parts)
+
+
+def codec_from_headers(headers: Mapping[str, str], head: bytes = b"") -> str | None:
+    ctype = (headers.get("Content-Type") or "").split(";", 1)[0].strip().lower()
+    if ctype in _CODECS:
+        return _CODECS[ctype]
+    if head.startswith(b"#EXTM3U"):
+        return "HLS" if b"#EXT-X-" in head else "M3U"
+    if head.lower().startswith(b"[playlist]"):
+        return "PLS"
+    if head.startswith(b"OggS"):
+        return "OGG"
+    if head.startswith(b"fLaC"):
+        return "FLAC"
+    if head.startswith(b"ID3"):
+        return "MP3"
+    if len(head) >= 2 and head[0] == 0xFF and head[1] & 0xF6 == 0xF0:
+        return "AAC"
+    if len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0:
+        return "MP3"
+    return None
+
+
+def bitrate_from_headers(headers: Mapping[str, str]) -> int | None:
+    raw = headers.get("icy-br") or headers.get("ice-audio-info") or ""
+    if "bitrate=" in raw:
+        for part in raw.split(";"):
+            k, _, v = part.partition("=")
+            if k.strip().lower() in ("bitrate", "ice-bitrate"):
+                raw = v
+                break
+    try:
+        # Some servers repeat the value ("128,128").
+        br = int(raw.split(",", 1)[0].strip())
+    except ValueError:
+        return None
+    return br if br > 0 else None
+
+
+def rank_channels(
+    channels: list[Channel], health: Mapping[str, StreamHealth]
+) -> list[Channel]:
+    """Order channels so the fastest healthy streams come first.
+
+    Channels that were not probed keep their relative order after the
+    healthy ones and unreachable streams are moved to the end.
+    """
+
+    def key(item: tuple[int, Channel]) -> tuple[int, float, int]:
+        idx, ch = item
+        h = health.get(ch.stream_url or "")
+        if h is None:
+            return (1, 0.0, idx)
+        if not h.ok:
+            return (2, 0.0, idx)
+        return (0, h.connect_sec or 0.0, idx)
+
+    return [ch for _, ch in sorted(enumerate(channels), key=key)]
+
+
+def _cancel_from_thread(tasks: Sequence["asyncio.Future[StreamHealth]"]) -> None:
+    """Cancel ``tasks`` from any thread; does nothing once their loop ended."""
+    loop = tasks[0].get_loop()
+
+    def _cancel() -> None:
+        for t in tasks:
+            t.cancel()
+
+    try:
+        loop.call_soon_threadsafe(_cancel)
+    except RuntimeError:
+        pass
+
+
+class StreamProber:
+    """Check whether stream URLs respond, concurrently and with a TTL cache.
+
+    Each stream is opened with a GET and only its first bytes are read, which
+    is enough to measure the time to first byte and to read the codec and
+    bitrate headers. HEAD is not used because many Icecast/SHOUTcast servers
+    reject it.
+    """
+
+    def __init__(
+        self,
+        session: "aiohttp.ClientSession | None" = None,
+        concurrency: int = RB_STREAM_PROBE_CONCURRENCY,
+        timeout_sec: float = RB_STREAM_PROBE_TIMEOUT_SEC,
+        ttl_sec: float = RB_STREAM_PROBE_TTL_SEC,
+        read_bytes: int = RB_STREAM_PROBE_BYTES,
+    ) -> None:
+        self._session = session
+        self._concurrency = max(1, concurrency)
+        self._timeout_sec = timeout_sec
+        self._ttl_sec = ttl_sec
+        self._read_bytes = read_bytes
+        self._cache: dict[str, StreamHealth] = {}
+        self._lock = threading.Lock()
+
+    def cached(self, url: str) -> StreamHealth | None:
+        with self._lock:
+            h = self._cache.get(url)
+        if h is None or time.monotonic() - h.checked_at >= self._ttl_sec:
+            return None
+        return h
+
+    def probe_many(
+        self, urls: Iterable[str], token: CancelToken | None = None
+    ) -> dict[str, StreamHealth]:
+        """Blocking wrapper around :meth:`probe_all` for worker threads."""
+        return asyncio.run(self.probe_all(urls, token))
+
+    async def probe_all(
+        self, urls: Iterable[str], token: CancelToken | None = None
+    ) -> dict[str, StreamHealth]:
+        """Probe ``urls`` that are not cached yet, a few at a time.
+
+        Each result is cached as soon as it arrives, so a run cancelled
+        through ``token`` still saves the next one the probes it finished.
+
+        Raises:
+            TaskCancelled: If ``token`` was cancelled before all finished.
+        """
+        out: dict[str, StreamHealth] = {}
+        todo: list[str] = []
+        for url in dict.fromkeys(u for u in urls if u):
+            h = self.cached(url)
+            if h is not None:
+                out[url] = h
+            else:
+                todo.append(url)
+        if not todo:
+            return out
+        import aiohttp
+
+        sem = asyncio.Semaphore(self._concurrency)
+        session = self._session
+        owned = session is None
+        if session is None:
+            session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self._timeout_sec),
+                headers={"User-Agent": USER_AGENT},
+                connector=aiohttp.TCPConnector(limit=self._concurrency),
+            )
+        try:
+
+            async def _bounded(url: str) -> StreamHealth:
+                async with sem:
+                    h = await self.probe(session, url)
+                with self._lock:
+                    self._cache[url] = h
+                return h
+
+            tasks = [asyncio.ensure_future(_bounded(u)) for u in todo]
+            if token is not None:
+                token.add_callback(partial(_cancel_from_thread, tasks))
+            try:
+                results = await asyncio.gather(*tasks)
+            except asyncio.CancelledError:
+                if token is not None and token.cancelled:
+                    raise TaskCancelled() from None
+                raise
+        finally:
+            if owned:
+                await session.close()
+        out.update((h.url, h) for h in results)
+        return out
+
+    async def probe(self, session: "aiohttp.ClientSession", url: str) -> StreamHealth:
+        import aiohttp
+
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self._timeout_sec):
+                async with session.get(url, headers={"Icy-MetaData": "0"}) as r:
+                    if r.status >= 400:
+                        return self._failed(url, f"HTTP {r.status}")
+                    head = await r.content.read(self._read_bytes)
+                    elapsed = time.perf_counter() - start
+                    if not head:
+                        return self._failed(url, "empty response")
+                    return StreamHealth(
+                        url,
+                        ok=True,
+                        connect_sec=elapsed,
+                        codec=codec_from_headers(r.headers, head),
+                        bitrate=bitrate_from_headers(r.headers),
+                        checked_at=time.monotonic(),
+                    )
+        except TimeoutError:
+            return self._failed(url, "timeout")
+        except (aiohttp.ClientError, OSError, ValueError) as e:
+            return self._failed(url, type(e).__name__)
+
+    def _failed(self, url: str, error: str) -> StreamHealth:
+        return StreamHealth(url, ok=False, error=error, checked_at=time.monotonic())
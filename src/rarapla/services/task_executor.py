@@ -0,0 +1,297 @@
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Generic, TypeVar
+
+from rarapla.config import TASK_WORKERS
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """Lower values run first."""
+
+    USER = 0
+    NORMAL = 10
+    BACKGROUND = 20
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task that noticed its token was cancelled."""
+
+
+class CancelToken:
+    """Cooperative cancellation flag handed to every task."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            fn()
+
+    def add_callback(self, fn: Callable[[], None]) -> None:
+        """Run ``fn`` on cancellation, e.g. to abort blocking I/O.
+
+        ``fn`` runs on the cancelling thread, or right away if the token is
+        already cancelled.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(fn)
+                return
+        fn()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise TaskCancelled()
+
+
+@dataclass(eq=False)
+class TaskHandle(Generic[T]):
+    """A submitted task: its future, cancel token and bookkeeping."""
+
+    key: str | None
+    priority: int
+    token: CancelToken = field(default_factory=CancelToken)
+    future: "Future[T]" = field(default_factory=Future)
+    submitted_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    def cancel(self) -> None:
+        """Cancel the task; a running task stops at its next token check."""
+        self.token.cancel()
+        self.future.cancel()
+
+
+@dataclass
+class ExecutorMetrics:
+    queued: int
+    running: int
+    completed: int
+    failed: int
+    cancelled: int
+    deduplicated: int
+    avg_wait_ms: float
+    avg_run_ms: float
+
+
+class TaskExecutor:
+    """Run blocking jobs on a fixed pool of threads, by priority.
+
+    Tasks receive a :class:`CancelToken` and should check it between
+    blocking steps. Submitting a task with the ``key`` of one that is still
+    queued or running returns the existing handle instead of doing the work
+    twice; if the new request is more urgent the queued task is promoted.
+
+    Running tasks are never preempted. A pool that serves the user directly
+    can therefore keep its last worker for :attr:`Priority.USER` tasks, so
+    long background jobs never delay a user request.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = TASK_WORKERS,
+        name: str = "task",
+        reserve_user_worker: bool = False,
+    ) -> None:
+        """Create an idle pool; threads start with the first tasks.
+
+        Args:
+            max_workers: Maximum number of worker threads.
+            name: Prefix for the worker thread names.
+            reserve_user_worker: Let other tasks use at most
+                ``max_workers - 1`` threads, keeping one for USER tasks.
+        """
+        self._max_workers = max(1, max_workers)
+        self._name = name
+        self._cond = threading.Condition()
+        self._heap: list[tuple[int, int, TaskHandle[Any], Callable[..., Any]]] = []
+        self._seq = itertools.count()
+        self._inflight: dict[str, TaskHandle[Any]] = {}
+        self._threads: list[threading.Thread] = []
+        self._running = 0
+        self._running_low = 0
+        self._low_limit = self._max_workers
+        if reserve_user_worker:
+            self._low_limit = max(1, self._max_workers - 1)
+        self._active: set[TaskHandle[Any]] = set()
+        self._shutdown = False
+        self._completed = 0
+        self._failed = 0
+        self._cancelled = 0
+        self._deduplicated = 0
+        self._timed = 0
+        self._wait_total = 0.0
+        self._run_total = 0.0
+
+    def submit(
+        self,
+        fn: Callable[[CancelToken], T],
+        priority: int = Priority.NORMAL,
+        key: str | None = None,
+    ) -> TaskHandle[T]:
+        """Queue ``fn(token)`` and return its handle.
+
+        Raises:
+            RuntimeError: If the executor has been shut down.
+        """
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("executor is shut down")
+            if key is not None:
+                existing = self._inflight.get(key)
+                if existing is not None and not existing.token.cancelled:
+                    self._deduplicated += 1
+                    if priority < existing.priority:
+                        self._promote(existing, priority)
+                    return existing
+            handle: TaskHandle[T] = TaskHandle(key=key, priority=int(priority))
+            if key is not None:
+                self._inflight[key] = handle
+            heapq.heappush(self._heap, (int(priority), next(self._seq), handle, fn))
+            self._ensure_threads()
+            self._cond.notify()
+        return handle
+
+    def cancel_key(self, key: str) -> None:
+        with self._cond:
+            handle = self._inflight.get(key)
+        if handle is not None:
+            handle.cancel()
+
+    def metrics(self) -> ExecutorMetrics:
+        with self._cond:
+            n = self._timed
+            return ExecutorMetrics(
+                queued=len(self._heap),
+                running=self._running,
+                completed=self._completed,
+                failed=self._failed,
+                cancelled=self._cancelled,
+                deduplicated=self._deduplicated,
+                avg_wait_ms=1000 * self._wait_total / n if n else 0.0,
+                avg_run_ms=1000 * self._run_total / n if n else 0.0,
+            )
+
+    def shutdown(self, wait: bool = False, timeout: float = 3.0) -> None:
+        """Cancel everything queued or running and stop the threads."""
+        with self._cond:
+            self._shutdown = True
+            pending = [entry[2] for entry in self._heap]
+            self._heap.clear()
+            running = list(self._active)
+            self._cond.notify_all()
+            threads = list(self._threads)
+        for h in pending + running:
+            h.cancel()
+        if wait:
+            deadline = time.monotonic() + timeout
+            for t in threads:
+                t.join(max(0.0, deadline - time.monotonic()))
+
+    def _promote(self, handle: TaskHandle[Any], priority: int) -> None:
+        for i, (_, seq, h, fn) in enumerate(self._heap):
+            if h is handle:
+                self._heap[i] = (int(priority), seq, h, fn)
+                heapq.heapify(self._heap)
+                break
+        handle.priority = int(priority)
+
+    def _ensure_threads(self) -> None:
+        idle = len(self._threads) - self._running
+        if idle >= len(self._heap) or len(self._threads) >= self._max_workers:
+            return
+        t = threading.Thread(
+            target=self._worker,
+            name=f"{self._name}-{len(self._threads)}",
+            daemon=True,
+        )
+        self._threads.append(t)
+        t.start()
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._shutdown and not self._can_start():
+                    self._cond.wait()
+                if self._shutdown:
+                    return
+                priority, _, handle, fn = heapq.heappop(self._heap)
+                low = priority > Priority.USER
+                self._running += 1
+                self._running_low += low
+                self._active.add(handle)
+            self._run(handle, fn)
+            with self._cond:
+                self._running -= 1
+                self._running_low -= low
+                if low:
+                    self._cond.notify()
+                self._active.discard(handle)
+                if handle.key is not None and self._inflight.get(handle.key) is handle:
+                    del self._inflight[handle.key]
+
+    def _can_start(self) -> bool:
+        """Return whether the most urgent queued task may start now."""
+        if not self._heap:
+            return False
+        return self._heap[0][0] <= Priority.USER or self._running_low < self._low_limit
+
+    def _run(self, handle: TaskHandle[Any], fn: Callable[..., Any]) -> None:
+        started = time.monotonic()
+        if handle.token.cancelled or not handle.future.set_running_or_notify_cancel():
+            with self._cond:
+                self._cancelled += 1
+            return
+        try:
+            handle.token.raise_if_cancelled()
+            result = fn(handle.token)
+        except TaskCancelled as e:
+            handle.future.set_exception(e)
+            outcome = "cancelled"
+        except BaseException as e:
+            if handle.token.cancelled:
+                # Most likely I/O aborted by one of the token's callbacks.
+                handle.future.set_exception(TaskCancelled())
+                outcome = "cancelled"
+            else:
+                handle.future.set_exception(e)
+                outcome = "failed"
+        else:
+            if handle.token.cancelled:
+                handle.future.set_exception(TaskCancelled())
+                outcome = "cancelled"
+            else:
+                handle.future.set_result(result)
+                outcome = "completed"
+        finished = time.monotonic()
+        with self._cond:
+            self._timed += 1
+            self._wait_total += started - handle.submitted_at
+            self._run_total += finished - started
+            if outcome == "completed":
+                self._completed += 1
+            elif outcome == "failed":
+                self._failed += 1
+            else:
+                self._cancelled += 1
@@ -0,0 +1,158 @@
+"""Startup timing for the application.
+
+The application records named phase marks while it starts. Running it with
+``--profile-startup`` launches a second copy under ``python -X importtime``
+that quits once its window is up, then prints the phase timings together
+with the slowest imports.
+"""
+
+import json
+import os
+import sys
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+PROFILE_FLAG = "--profile-startup"
+TIMING_FLAG = "--startup-timing"
+_MARKS_PREFIX = "RARAPLA_STARTUP_MARKS "
+
+_marks: list[tuple[str, float]] = [("start", time.perf_counter())]
+
+
+def mark(name: str) -> None:
+    """Record that startup phase ``name`` has just finished."""
+    _marks.append((name, time.perf_counter()))
+
+
+def elapsed_ms() -> float:
+    """Return the time since the application started, in milliseconds."""
+    return (time.perf_counter() - _marks[0][1]) * 1000
+
+
+def marks() -> list[tuple[str, float]]:
+    """Return the recorded phases as ``(name, ms since start)`` pairs."""
+    t0 = _marks[0][1]
+    return [(name, (t - t0) * 1000) for name, t in _marks[1:]]
+
+
+def emit_marks() -> None:
+    """Print the phase marks for a parent ``--profile-startup`` process."""
+    print(_MARKS_PREFIX + json.dumps(marks()), flush=True)
+
+
+@dataclass
+class ImportTiming:
+    """One line of ``python -X importtime`` output.
+
+    Attributes:
+        module: Dotted module name.
+        self_us: Time spent in the module itself, in microseconds.
+        cumulative_us: Time including the imports it triggered.
+        depth: Nesting level; 0 for imports made directly by the program.
+    """
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(lines: Iterable[str]) -> list[ImportTiming]:
+    """Parse the ``import time:`` lines written by ``-X importtime``.
+
+    Args:
+        lines: Lines of the interpreter's stderr; other lines are skipped.
+
+    Returns:
+        Timings in the order the imports finished.
+    """
+    out: list[ImportTiming] = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        out.append(ImportTiming(stripped, self_us, cumulative_us, max(0, depth)))
+    return out
+
+
+def _top_package(module: str) -> str:
+    return module.split(".", 1)[0]
+
+
+def format_report(
+    timings: Sequence[ImportTiming],
+    phase_marks: Sequence[tuple[str, float]],
+    wall_ms: float,
+    top: int = 15,
+) -> str:
+    """Render the startup breakdown as text.
+
+    Args:
+        timings: Parsed import timings.
+        phase_marks: ``(name, ms)`` phase marks from the profiled run.
+        wall_ms: Wall-clock time of the whole profiled process.
+        top: How many entries to list per section.
+    """
+    lines = [f"Startup profile (process wall time {wall_ms:.0f} ms)", ""]
+    lines.append("Phases (ms since rarapla was first imported):")
+    prev = 0.0
+    for name, ms in phase_marks:
+        lines.append(f"  {ms:8.1f}  +{ms - prev:7.1f}  {name}")
+        prev = ms
+    by_package: dict[str, int] = {}
+    for t in timings:
+        if t.depth == 0:
+            pkg = _top_package(t.module)
+            by_package[pkg] = by_package.get(pkg, 0) + t.cumulative_us
+    total_us = sum(by_package.values())
+    lines += ["", f"Imports by top-level package (total {total_us / 1000:.0f} ms):"]
+    for pkg, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        lines.append(f"  {us / 1000:8.1f} ms  {pkg}")
+    lines += ["", "Slowest modules by self time:"]
+    for t in sorted(timings, key=lambda t: -t.self_us)[:top]:
+        lines.append(f"  {t.self_us / 1000:8.1f} ms  {t.module}")
+    return "\n".join(lines)
+
+
+def profile_startup(args: Sequence[str] = ()) -> int:
+    """Profile a cold start in a child interpreter and print the report.
+
+    Args:
+        args: Extra command line arguments for the profiled application.
+
+    Returns:
+        The child's exit code.
+    """
+    import subprocess
+
+    cmd = [sys.executable, "-X", "importtime", "-m", "rarapla", TIMING_FLAG]
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [*cmd, *args],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    phase_marks: list[tuple[str, float]] = []
+    for line in proc.stdout.splitlines():
+        if line.startswith(_MARKS_PREFIX):
+            phase_marks = [
+                (str(n), float(ms)) for n, ms in json.loads(line[len(_MARKS_PREFIX) :])
+            ]
+    timings = parse_importtime(proc.stderr.splitlines())
+    print(format_report(timings, phase_marks, wall_ms))
+    if proc.returncode != 0:
+        errors = [ln for ln in proc.stderr.splitlines() if not ln.startswith("import")]
+        print("\nProfiled run failed:\n" + "\n".join(errors[-20:]), file=sys.stderr)
+    return proc.returncode
@@ -1,8 +1,46 @@
-from PySide6.QtCore import QObject, QThread, QTimer, Signal
-from rarapla.data.radiko_client import RadikoClient
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from PySide6.QtCore import QObject, QTimer, Signal
+from rarapla.data.radiko_client import RadikoClient, jst_now
 from rarapla.models.channel import Channel
-from rarapla.ui.workers.channel_fetch_worker import ChannelFetchWorker
-from rarapla.config import NOW_REFRESH_INTERVAL_MS
+from rarapla.services.task_executor import CancelToken, Priority, TaskHandle
+from rarapla.ui.utils.task_runner import TaskRunner
+from rarapla.config import (
+    NOW_BOUNDARY_GRACE_MS,
+    NOW_ERROR_BACKOFF_MAX_MS,
+    NOW_MIN_REFRESH_MS,
+    NOW_SAFETY_POLL_MS,
+    NOW_STALE_RETRY_SEC,
+)
+
+NOW_TASK_KEY = "radiko:now"
+
+
+def next_refresh_delay_ms(
+    channels: Iterable[Channel],
+    now: datetime,
+    min_ms: int = NOW_MIN_REFRESH_MS,
+    safety_ms: int = NOW_SAFETY_POLL_MS,
+    grace_ms: int = NOW_BOUNDARY_GRACE_MS,
+    stale_sec: float = NOW_STALE_RETRY_SEC,
+) -> int:
+    """Return how long to wait before the next now-programs refresh.
+
+    The refresh lands just after the earliest program end still ahead of
+    ``now``. A program that ended less than ``stale_sec`` ago means the
+    listing has not caught up yet, so it is retried soon. Without any known
+    end only the safety poll applies.
+    """
+    delay = safety_ms
+    for ch in channels:
+        if ch.program_end is None:
+            continue
+        ahead_ms = (ch.program_end - now).total_seconds() * 1000
+        if ahead_ms > 0:
+            delay = min(delay, int(ahead_ms) + grace_ms)
+        elif -ahead_ms < stale_sec * 1000:
+            delay = min(delay, min_ms)
+    return max(min_ms, delay)
 
 
 class NowRefresher(QObject):
@@ -10,71 +48,92 @@ class NowRefresher(QObject):
     error = Signal(str)
 
     def __init__(
-        self, client: RadikoClient, interval_ms: int = NOW_REFRESH_INTERVAL_MS
+        self,
+        client: RadikoClient,
+        tasks: TaskRunner,
+        min_interval_ms: int = NOW_MIN_REFRESH_MS,
+        safety_interval_ms: int = NOW_SAFETY_POLL_MS,
     ) -> None:
         super().__init__()
         self._client = client
+        self._tasks = tasks
+        self._min_ms = min_interval_ms
+        self._safety_ms = safety_interval_ms
         self._timer = QTimer(self)
-        self._timer.setInterval(interval_ms)
+        self._timer.setSingleShot(True)
         self._timer.timeout.connect(self._tick)
-        self._thread: QThread | None = None
-        self._worker: ChannelFetchWorker | None = None
-        self._busy = False
+        self._task: TaskHandle[list[Channel]] | None = None
+        self._active = False
+        self._failures = 0
+        self._next_ms = min_interval_ms
+
+    @property
+    def next_interval_ms(self) -> int:
+        return self._next_ms
 
     def start(self) -> None:
-        self._timer.start()
+        self._active = True
+        self._timer.start(self._next_ms)
 
     def stop(self) -> None:
+        self._active = False
         self._timer.stop()
 
+    def refresh(self) -> None:
+        """Refresh as soon as possible, e.g. after the network changed."""
+        if self._active:
+            self._timer.start(0)
+
     def shutdown(self) -> None:
         self.stop()
-        t = self._thread
-        if t is not None:
-            t.quit()
-            t.wait(3000)
-            t.deleteLater()
-            self._thread = None
-        if self._worker is not None:
-            self._worker.deleteLater()
-            self._worker = None
-        self._busy = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def request(
+        self,
+        on_done: Callable[[list[Channel]], None],
+        on_error: Callable[[str], None],
+        priority: int = Priority.USER,
+    ) -> TaskHandle[list[Channel]]:
+        """Fetch the current programs once, sharing any fetch in flight.
+
+        Every fetch also reschedules the timer: to the earliest upcoming
+        program boundary on success, with exponential backoff on failure.
+        """
+
+        def _done(channels: list[Channel]) -> None:
+            self._failures = 0
+            self._schedule(
+                next_refresh_delay_ms(
+                    channels, jst_now(), self._min_ms, self._safety_ms
+                )
+            )
+            on_done(channels)
+
+        def _error(msg: str) -> None:
+            self._failures += 1
+            backoff = self._min_ms * 2**self._failures
+            self._schedule(min(backoff, NOW_ERROR_BACKOFF_MAX_MS))
+            on_error(msg)
+
+        return self._tasks.submit(
+            self._fetch, _done, _error, priority=priority, key=NOW_TASK_KEY
+        )
+
+    def _fetch(self, token: CancelToken) -> list[Channel]:
+        area = self._client.get_area_id()
+        token.raise_if_cancelled()
+        return self._client.fetch_now_programs(area)
+
+    def _schedule(self, delay_ms: int) -> None:
+        self._next_ms = delay_ms
+        if self._active:
+            self._timer.start(delay_ms)
 
     def _tick(self) -> None:
-        if self._busy or self._thread is not None:
+        if self._task is not None and not self._task.future.done():
             return
-        self._busy = True
-        self._worker = ChannelFetchWorker(self._client)
-        self._thread = QThread()
-        self._worker.moveToThread(self._thread)
-        self._thread.started.connect(self._worker.run)
-
-        def _done(chs: list[Channel]) -> None:
-            self.updated.emit(chs)
-            t = self._thread
-            if t is not None:
-                t.quit()
-
-        def _err(msg: str) -> None:
-            self.error.emit(msg)
-            t = self._thread
-            if t is not None:
-                t.quit()
-
-        self._worker.finished.connect(_done)
-        self._worker.error.connect(_err)
-
-        def _cleanup() -> None:
-            try:
-                if self._worker is not None:
-                    self._worker.deleteLater()
-            finally:
-                self._worker = None
-                t = self._thread
-                self._thread = None
-                self._busy = False
-                if t is not None:
-                    t.deleteLater()
-
-        self._thread.finished.connect(_cleanup)
-        self._thread.start()
+        self._task = self.request(
+            self.updated.emit, self.error.emit, priority=Priority.BACKGROUND
+        )
@@ -1,8 +1,16 @@
+import time
 from PySide6.QtCore import QObject, QTimer, Signal
 from PySide6.QtMultimedia import QMediaMetaData, QMediaPlayer
-from rarapla.config import USER_AGENT
+from urllib.parse import urlencode
+from rarapla.config import (
+    ICY_RELAY_ENABLED,
+    PLAYER_PRELOAD_MAX_AGE_SEC,
+    RADIKO_RESOLVE_TTL_SEC,
+    USER_AGENT,
+)
 from rarapla.ui.widgets.player_widget import PlayerWidget
 from rarapla.services.icy_watcher import IcyWatcher
+from rarapla.services.metadata_service import MetadataService
 
 
 class PlaybackController(QObject):
@@ -13,14 +21,20 @@ class PlaybackController(QObject):
         super().__init__(player)
         self.player = player
         self.proxy_base: str = proxy_base
+        # Cleared when the proxy failed to start; direct streams then skip
+        # the relay and play, and are watched for metadata, on their own.
+        self.proxy_ok: bool = True
         self._current_station: str | None = None
         self._current_direct_url: str | None = None
         self._icy: IcyWatcher | None = None
+        self._resolved: dict[str, float] = {}
+        self._loaded_at: float | None = None
+        self._meta = MetadataService()
         self._refresh_timer = QTimer(self)
         self._refresh_timer.setInterval(4 * 60 * 1000)
         self._refresh_timer.timeout.connect(self._refresh_stream)
-        self.player.svc.player.metaDataChanged.connect(self._on_meta_changed)
-        self.player.svc.player.errorOccurred.connect(self._on_player_error)
+        self.player.svc.metaDataChanged.connect(self._on_meta_changed)
+        self.player.svc.errorOccurred.connect(self._on_player_error)
 
     def set_current_station(self, station_id: str | None) -> None:
         self._current_station = station_id
@@ -28,11 +42,21 @@ class PlaybackController(QObject):
             self._current_direct_url = None
             self._stop_icy_watch()
 
+    def mark_resolved(self, station_id: str) -> None:
+        """Note that the proxy has just resolved ``station_id``.
+
+        Until the proxy's resolve cache would expire anyway, playing the
+        station keeps that resolution instead of clearing it first.
+        """
+        self._resolved[station_id] = time.monotonic()
+
     def prepare_media(self, station_id: str) -> None:
+        # The proxy's resolve cache expires on its own and a rejected
+        # segment re-resolves, so switching does not clear it first; only
+        # pressing play again does.
         self.set_current_station(station_id)
-        self._clear_proxy_cache(station_id)
         url = self._build_local_m3u8(station_id, force=True)
-        self.player.set_media(url)
+        self._set_media(url)
         self._refresh_timer.start()
 
     def prepare_direct(self, url: str) -> None:
@@ -40,10 +64,17 @@ class PlaybackController(QObject):
         self._current_direct_url = url
         self._refresh_timer.stop()
         self._start_icy_watch(url)
-        self.player.set_media(url)
+        self._set_media(self._direct_media_url(url))
 
     def handle_user_toggled(self, playing: bool) -> None:
         if not playing:
+            self._loaded_at = None
+            return
+        if self._preloaded():
+            # The player opened the station when it was selected and has
+            # been buffering since; starting it is instant.
+            self._loaded_at = None
+            self.player.svc.play_loaded()
             return
         if self._current_station:
             sid = self._current_station
@@ -55,26 +86,49 @@ class PlaybackController(QObject):
             return
         if self._current_direct_url:
             self.player.svc.clear_source()
-            self.player.set_media(self._current_direct_url)
+            self.player.set_media(self._direct_media_url(self._current_direct_url))
             self.player.svc.play()
 
     def shutdown(self) -> None:
         self._refresh_timer.stop()
         self._stop_icy_watch()
+        self._meta.stop()
         try:
             self.player.svc.stop()
             self.player.svc.clear_source()
         except Exception:
             pass
 
+    def _set_media(self, url: str) -> None:
+        self.player.set_media(url)
+        playing = self.player.toggle_btn.isChecked()
+        self._loaded_at = None if playing else time.monotonic()
+
+    def _preloaded(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        if time.monotonic() - self._loaded_at >= PLAYER_PRELOAD_MAX_AGE_SEC:
+            return False
+        return self.player.svc.player.mediaStatus() in (
+            QMediaPlayer.MediaStatus.LoadedMedia,
+            QMediaPlayer.MediaStatus.BufferingMedia,
+            QMediaPlayer.MediaStatus.BufferedMedia,
+        )
+
     def _build_local_m3u8(self, station_id: str, force: bool = False) -> str:
         base = f"{self.proxy_base}/live/{station_id}.m3u8"
         if force:
-            import time
-
             return f"{base}?t={int(time.time() * 1000)}"
         return base
 
+    def _relay_enabled(self) -> bool:
+        return ICY_RELAY_ENABLED and self.proxy_ok
+
+    def _direct_media_url(self, url: str) -> str:
+        if not self._relay_enabled():
+            return url
+        return f"{self.proxy_base}/relay?{urlencode({'u': url})}"
+
     def _refresh_stream(self) -> None:
         if not self._current_station:
             return
@@ -142,7 +196,12 @@ class PlaybackController(QObject):
 
     def _start_icy_watch(self, url: str) -> None:
         self._stop_icy_watch()
-        self._icy = IcyWatcher(url=url, user_agent=USER_AGENT)
+        events_url = None
+        if self._relay_enabled():
+            events_url = f"{self.proxy_base}/icy/events?{urlencode({'u': url})}"
+        self._icy = IcyWatcher(
+            url, self._meta, user_agent=USER_AGENT, events_url=events_url
+        )
         self._icy.metaUpdated.connect(self._on_icy_meta)
         self._icy.notSupported.connect(self._on_icy_not_supported)
         self._icy.networkError.connect(self._on_icy_error)
@@ -158,7 +217,6 @@ class PlaybackController(QObject):
         except Exception:
             pass
         self._icy.stop()
-        self._icy.wait(3000)
         self._icy = None
 
     def _on_icy_meta(self, title: str, meta: dict[str, str]) -> None:
@@ -173,6 +231,8 @@ class PlaybackController(QObject):
     def _on_player_error(self, err: QMediaPlayer.Error, text: str) -> None:
         if err == QMediaPlayer.Error.NoError:
             return
+        self._resolved.clear()
+        self._loaded_at = None
         msg = text or "再生できませんでした"
         self.playbackError.emit(msg)
 
@@ -183,6 +243,12 @@ class PlaybackController(QObject):
         return ""
 
     def _clear_proxy_cache(self, station_id: str) -> None:
+        resolved_at = self._resolved.get(station_id)
+        if (
+            resolved_at is not None
+            and time.monotonic() - resolved_at < RADIKO_RESOLVE_TTL_SEC
+        ):
+            return
         import requests
 
         try:
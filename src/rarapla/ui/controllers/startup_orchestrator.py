@@ -0,0 +1,107 @@
+from collections.abc import Callable
+from typing import TypeVar
+from PySide6.QtCore import QObject, Signal
+from rarapla import startup_profile
+from rarapla.services.task_executor import CancelToken, Priority, TaskHandle
+from rarapla.ui.utils.task_runner import TaskRunner
+
+T = TypeVar("T")
+_Waiter = tuple[Callable[[], None], Callable[[str], None] | None]
+
+
+class StartupOrchestrator(QObject):
+    """Run the independent parts of startup side by side.
+
+    Each part is a named phase. A phase that depends on another waits for
+    it with :meth:`after` rather than the whole startup running in sequence,
+    so the window fills in piece by piece as phases finish. Finished phases
+    are recorded as startup profile marks.
+    """
+
+    phaseFinished = Signal(str, float)
+    phaseFailed = Signal(str, str)
+
+    def __init__(self, tasks: TaskRunner, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._tasks = tasks
+        self._done: dict[str, float] = {}
+        self._failed: dict[str, str] = {}
+        self._waiting: dict[str, list[_Waiter]] = {}
+
+    def run(
+        self,
+        name: str,
+        fn: Callable[[CancelToken], T],
+        on_done: Callable[[T], None] | None = None,
+        priority: int = Priority.USER,
+    ) -> TaskHandle[T]:
+        """Run phase ``name`` on the task runner.
+
+        ``on_done`` gets the result on the GUI thread before callbacks
+        waiting for the phase run.
+        """
+
+        def _done(result: T) -> None:
+            if on_done is not None:
+                on_done(result)
+            self.finish(name)
+
+        return self._tasks.submit(
+            fn, _done, lambda msg: self.fail(name, msg), priority=priority
+        )
+
+    def finish(self, name: str) -> None:
+        """Mark phase ``name`` done; later calls for it are ignored."""
+        if name in self._done:
+            return
+        ms = startup_profile.elapsed_ms()
+        self._done[name] = ms
+        startup_profile.mark(name)
+        self._failed.pop(name, None)
+        self.phaseFinished.emit(name, ms)
+        for fn, _on_failed in self._waiting.pop(name, []):
+            fn()
+
+    def fail(self, name: str, msg: str) -> None:
+        """Give up on phase ``name``.
+
+        Waiters registered with an ``on_failed`` callback get ``msg``; the
+        rest are dropped.
+        """
+        if name in self._done:
+            return
+        self._failed[name] = msg
+        self.phaseFailed.emit(name, msg)
+        for _fn, on_failed in self._waiting.pop(name, []):
+            if on_failed is not None:
+                on_failed(msg)
+
+    def after(
+        self,
+        name: str,
+        fn: Callable[[], None],
+        on_failed: Callable[[str], None] | None = None,
+    ) -> None:
+        """Call ``fn`` once phase ``name`` is done, at once if it already is.
+
+        If the phase fails instead, ``on_failed`` gets the error message,
+        likewise at once if it already failed.
+        """
+        if name in self._done:
+            fn()
+        elif name in self._failed:
+            if on_failed is not None:
+                on_failed(self._failed[name])
+        else:
+            self._waiting.setdefault(name, []).append((fn, on_failed))
+
+    def is_done(self, name: str) -> bool:
+        return name in self._done
+
+    def error(self, name: str) -> str | None:
+        """Return why phase ``name`` failed, or ``None``."""
+        return self._failed.get(name)
+
+    def finished_at(self) -> dict[str, float]:
+        """Return when each finished phase ended, in ms since launch."""
+        return dict(self._done)
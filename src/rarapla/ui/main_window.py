@@ -1,33 +1,76 @@
 import json
 import os
-from typing import Any, TypedDict, cast
-from PySide6.QtCore import QThread, QTimer, Qt
-from PySide6.QtGui import QCloseEvent, QShowEvent
-from shiboken6 import isValid
+import time
+from typing import TYPE_CHECKING, Any, TypedDict, cast
+from collections.abc import Callable, Iterator
+from dataclasses import replace
+from functools import partial
+from PySide6.QtCore import QModelIndex, QTimer, Qt
+from PySide6.QtGui import QCloseEvent, QKeySequence, QShortcut, QShowEvent
+from PySide6.QtNetwork import QNetworkInformation
 from PySide6.QtWidgets import (
     QComboBox,
     QGroupBox,
     QHBoxLayout,
-    QListWidgetItem,
+    QLineEdit,
     QMainWindow,
     QMessageBox,
     QVBoxLayout,
     QWidget,
 )
+from rarapla.data.history_store import HistoryStore
 from rarapla.data.radiko_client import RadikoClient
-from rarapla.data.radio_browser_client import RadioBrowserClient
+from rarapla.data.radio_browser_catalog import RadioBrowserCatalog
+from rarapla.data.radio_browser_client import (
+    RadioBrowserClient,
+    ResponseHook,
+    abort_response,
+)
+from rarapla.data.session_store import SessionStore
 from rarapla.models.channel import Channel
 from rarapla.models.program import Program
+from rarapla.models.session import SessionState
+from rarapla.proxy.background import BackgroundProxy
+from rarapla.services.channel_diff import ChannelDiff
+from rarapla.services.channel_filter import ChannelIndex
+from rarapla.services.click_reporter import ClickReporter
+from rarapla.services.result_cache import ResultCache
+from rarapla.services.stream_prober import StreamHealth, StreamProber, rank_channels
+from rarapla.services.task_executor import (
+    CancelToken,
+    Priority,
+    TaskExecutor,
+    TaskHandle,
+)
 from rarapla.ui.controllers.now_refresher import NowRefresher
-from rarapla.config import NOW_REFRESH_INTERVAL_MS
+from rarapla.ui.controllers.startup_orchestrator import StartupOrchestrator
+from rarapla.config import (
+    FIRST_AUDIO_BUDGET_MS,
+    HISTORY_FILE,
+    HTTP_TIMEOUT,
+    RB_CATALOG_ENABLED,
+    RB_CATALOG_FILE,
+    RB_CLICK_QUEUE_FILE,
+    RB_RESULTS_CACHE_SIZE,
+    RB_RESULTS_TTL_SEC,
+    RB_SEARCH_LIMIT,
+    SESSION_FILE,
+    SESSION_SNAPSHOT_MAX_AGE_SEC,
+    SOURCE_SWITCH_DEBOUNCE_MS,
+    SWITCH_BUDGET_MS,
+)
 from rarapla.ui.controllers.playback_controller import PlaybackController
-from rarapla.ui.widgets.channel_card import ChannelCard
 from rarapla.ui.widgets.detail_panel import DetailPanel
 from rarapla.ui.widgets.player_widget import PlayerWidget
-from rarapla.ui.widgets.smooth_list import SmoothListWidget
-from rarapla.ui.workers.channel_fetch_worker import ChannelFetchWorker
-from rarapla.ui.workers.program_fetch_worker import ProgramFetchWorker
-from rarapla.ui.workers.rb_search_worker import RBSearchWorker
+from rarapla.ui.models.channel_list_model import ChannelListModel
+from rarapla.ui.utils.audio_latency import AudioLatencyMeter
+from rarapla.ui.utils.image_cache import image_cache
+from rarapla.ui.utils.task_runner import TaskRunner
+from rarapla.ui.widgets.channel_delegate import ChannelDelegate
+from rarapla.ui.widgets.smooth_list import SmoothListView
+
+if TYPE_CHECKING:
+    import requests
 
 
 class RBPreset(TypedDict, total=False):
@@ -67,7 +110,7 @@ class MainWindow(QMainWindow):
             if (
                 isinstance(it, dict)
                 and isinstance(it.get("label"), str)
-                and (it.get("mode") in ("jp", "tag"))
+                and (it.get("mode") in ("jp", "tag", "search"))
             ):
                 out.append(
                     RBPreset(
@@ -78,37 +121,71 @@ class MainWindow(QMainWindow):
                 )
         return out or _DEFAULT_RB_PRESETS[:1]
 
-    def __init__(self, proxy_host: str, proxy_port: int) -> None:
+    def __init__(
+        self, proxy_host: str, proxy_port: int, proxy: BackgroundProxy | None = None
+    ) -> None:
         super().__init__()
         self.setWindowTitle("RaRaPla")
         self.proxy_base = f"http://{proxy_host}:{proxy_port}"
+        self.proxy = proxy
         self.client = RadikoClient()
-        self.rb = RadioBrowserClient()
+        self.rb = RadioBrowserClient(catalog=self._open_rb_catalog())
         self._rb_presets: list[RBPreset] = self._load_rb_presets()
-        self._prog_thread: QThread | None = None
-        self._prog_worker: ProgramFetchWorker | None = None
-        self._populate_thread: QThread | None = None
-        self._populate_worker: ChannelFetchWorker | None = None
-        self._rb_thread: QThread | None = None
-        self._rb_worker: RBSearchWorker | None = None
-        self._item_by_id: dict[str, QListWidgetItem] = {}
+        self.clicks = ClickReporter(
+            self.rb.send_click, path=os.path.join(os.getcwd(), RB_CLICK_QUEUE_FILE)
+        )
+        self.clicks.start()
+        self.prober = StreamProber()
+        self.history = self._open_history()
+        self.session = SessionStore(os.path.join(os.getcwd(), SESSION_FILE))
+        self._resume_station: str | None = None
+        self.tasks = TaskRunner(TaskExecutor(reserve_user_worker=True), self)
+        self.startup = StartupOrchestrator(self.tasks, self)
+        self._prog_task: TaskHandle[Program | None] | None = None
+        self._populate_task: TaskHandle[list[Channel]] | None = None
+        self._rb_task: TaskHandle[int] | None = None
+        self._rb_results: list[Channel] = []
+        self._rb_ids: set[str] = set()
+        self._rb_key: tuple[str, str | None] | None = None
+        self._rb_progressive = True
+        self._rb_cache: ResultCache[tuple[str, str | None], list[Channel]] = (
+            ResultCache(RB_RESULTS_TTL_SEC, RB_RESULTS_CACHE_SIZE)
+        )
+        self._source_idx = 0
+        self._all_channels: list[Channel] = []
+        self._index = ChannelIndex()
+        self._applying = False
+        self._catalog_task: TaskHandle[int] | None = None
+        self._probe_task: TaskHandle[dict[str, StreamHealth]] | None = None
         self._pending_channel: Channel | None = None
         self._current_channel: Channel | None = None
         self._build_ui()
         self._connect_signals()
         self.playback = PlaybackController(self.player, self.proxy_base)
-        self.now = NowRefresher(self.client, interval_ms=NOW_REFRESH_INTERVAL_MS)
+        self.latency = AudioLatencyMeter(self.player.svc, self)
+        self.latency.measured.connect(self._on_audio_latency)
+        self.player.svc.switched.connect(self._on_switched)
+        self._selected_at: float | None = None
+        self.now = NowRefresher(self.client, self.tasks)
         self.now.updated.connect(self._apply_now_diff)
         self.now.error.connect(self._on_channel_refresh_error)
         self.now.start()
         self.playback.streamTitleChanged.connect(self._on_rb_stream_title)
+        self.playback.streamTitleChanged.connect(self._record_stream_title)
         self.playback.playbackError.connect(self._on_playback_error)
         self._switch_timer = QTimer(self)
         self._switch_timer.setSingleShot(True)
         self._switch_timer.timeout.connect(self._delayed_channel_switch)
         self._switch_delay_ms = 300
-        self._populate()
+        self._source_timer = QTimer(self)
+        self._source_timer.setSingleShot(True)
+        self._source_timer.setInterval(SOURCE_SWITCH_DEBOUNCE_MS)
+        self._source_timer.timeout.connect(self._search_current_preset)
+        self._watch_network_changes()
+        self._restore_session()
+        self._warm_up()
         QTimer.singleShot(0, self._fix_initial_size)
+        QTimer.singleShot(0, self._sync_rb_catalog)
 
     def _build_ui(self) -> None:
         root = QWidget()
@@ -130,14 +207,24 @@ class MainWindow(QMainWindow):
         left_container = QWidget()
         left_container.setLayout(left_col)
         left_container.setFixedWidth(480)
-        self.list = SmoothListWidget()
+        self.channels = ChannelListModel(self)
+        self.list = SmoothListView()
         self.list.setSpacing(8)
+        self.list.setModel(self.channels)
+        self.list.setItemDelegate(ChannelDelegate(self.list))
+        self.list.setMouseTracking(True)
+        self.list.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
         self.source_combo = QComboBox()
         self.source_combo.addItem("radiko (area)")
         for p in self._rb_presets:
             self.source_combo.addItem(f"RB: {p['label']}")
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter")
+        self.filter_edit.setClearButtonEnabled(True)
+        QShortcut(QKeySequence.StandardKey.Find, self, self.filter_edit.setFocus)
         head = QHBoxLayout()
-        head.addWidget(self.source_combo)
+        head.addWidget(self.source_combo, 1)
+        head.addWidget(self.filter_edit, 1)
         list_box = QGroupBox("Channel")
         lb = QVBoxLayout(list_box)
         lb.setContentsMargins(8, 12, 8, 8)
@@ -148,9 +235,220 @@ class MainWindow(QMainWindow):
         layout.addWidget(list_box, 1)
 
     def _connect_signals(self) -> None:
-        self.list.currentItemChanged.connect(self._on_select)
+        self.list.selectionModel().currentChanged.connect(self._on_select)
         self.player.toggled.connect(self._on_player_toggled)
         self.source_combo.currentIndexChanged.connect(self._on_source_changed)
+        self.filter_edit.textChanged.connect(self._show_filtered)
+
+    def _open_rb_catalog(self) -> RadioBrowserCatalog | None:
+        if not RB_CATALOG_ENABLED:
+            return None
+        try:
+            return RadioBrowserCatalog(os.path.join(os.getcwd(), RB_CATALOG_FILE))
+        except Exception:
+            return None
+
+    def _open_history(self) -> HistoryStore | None:
+        try:
+            store = HistoryStore(os.path.join(os.getcwd(), HISTORY_FILE))
+        except Exception:
+            return None
+        store.start()
+        return store
+
+    def _record_stream_title(self, title: str, meta: object) -> None:
+        ch = self._current_channel
+        if self.history is None or ch is None:
+            return
+        info = meta if isinstance(meta, dict) else {}
+        self.history.record(
+            ch.id,
+            ch.name,
+            title,
+            artist=info.get("Artist"),
+            album=info.get("Album"),
+            source="icy" if ch.stream_url else "player",
+        )
+
+    def _record_program(self, ch: Channel) -> None:
+        if self.history is not None and ch.program_title:
+            self.history.record(ch.id, ch.name, ch.program_title, source="radiko")
+
+    def _sync_rb_catalog(self) -> None:
+        catalog = self.rb.catalog
+        if catalog is None or not catalog.needs_refresh():
+            return
+        self._catalog_task = self.tasks.submit(
+            lambda _token: catalog.sync(self.rb),
+            self._on_catalog_synced,
+            priority=Priority.BACKGROUND,
+            key="rb:catalog",
+        )
+
+    def _on_catalog_synced(self, count: int) -> None:
+        self.statusBar().showMessage(f"RB catalog updated: {count} stations", 5000)
+
+    def _restore_session(self) -> None:
+        """Bring back the source, station and audio settings of the last run.
+
+        The saved channel list is shown at once and then replaced by fresh
+        results as they arrive, so the window is usable before any request
+        has completed.
+        """
+        state = self.session.load()
+        if state is None:
+            self._populate()
+            return
+        if state.volume is not None:
+            self.player.vol.setValue(state.volume)
+        if state.output_device:
+            try:
+                self.player.select_output_device(bytes.fromhex(state.output_device))
+            except ValueError:
+                pass
+        self._resume_station = state.station_id
+        fresh = time.time() - state.saved_at < SESSION_SNAPSHOT_MAX_AGE_SEC
+        snapshot = state.channels if fresh else []
+        idx = self.source_combo.findText(state.source) if state.source else -1
+        if idx > 0:
+            self.source_combo.blockSignals(True)
+            self.source_combo.setCurrentIndex(idx)
+            self.source_combo.blockSignals(False)
+            self._source_idx = idx
+            self.now.stop()
+            preset = self._rb_presets[idx - 1]
+            self._apply_channels(snapshot)
+            # Revalidate behind the snapshot instead of rebuilding the list
+            # page by page.
+            self._start_rb_search(
+                preset["mode"], preset.get("query"), progressive=not snapshot
+            )
+        else:
+            self._apply_channels(snapshot)
+            self._populate()
+        if snapshot and state.station_id:
+            self._resume_selection(state.station_id)
+
+    def _save_session(self) -> None:
+        current = self._current_channel or self._selected_channel()
+        state = SessionState(
+            source=self.source_combo.currentText(),
+            station_id=current.id if current else None,
+            volume=self.player.vol.value(),
+            output_device=self.player.output_device_id().hex() or None,
+            channels=list(self._all_channels),
+            saved_at=time.time(),
+        )
+        try:
+            self.session.save(state)
+        except OSError:
+            pass
+
+    def _warm_up(self) -> None:
+        """Start everything the first playback needs alongside the channel list.
+
+        The area lookup feeds the station logo fetch while the now-playing
+        list loads and the proxy starts in the background. The station of
+        the last session is resolved through the proxy as soon as it is up
+        and selected once the list is in, so pressing play on it starts at
+        once.
+        """
+        self.startup.run(
+            "area", lambda _token: self.client.get_area_id(), self._fetch_logos
+        )
+        if self.proxy is None:
+            self.startup.finish("proxy")
+        else:
+            self.proxy.on_ready(
+                partial(self.tasks.post, self._on_proxy_ready),
+                lambda msg: self.tasks.post(partial(self._on_proxy_failed, msg)),
+            )
+        station_id = self._resume_station
+        if station_id is None:
+            return
+        self.startup.after("channels", partial(self._resume_selection, station_id))
+        # Radio Browser stations play directly and have nothing to resolve.
+        if not station_id.startswith("rb:"):
+            self.startup.after("proxy", partial(self._prefetch_station, station_id))
+
+    def _fetch_logos(self, area: str) -> None:
+        self.startup.run(
+            "station logos",
+            lambda _token: self.client.station_logos(area),
+            priority=Priority.BACKGROUND,
+        )
+
+    def _on_proxy_ready(self) -> None:
+        self.startup.finish("proxy")
+
+    def _on_proxy_failed(self, msg: str) -> None:
+        self.statusBar().showMessage(f"Proxy failed to start: {msg}", 7000)
+        self.playback.proxy_ok = False
+        self.startup.fail("proxy", msg)
+
+    def _after_proxy(self, fn: Callable[[], None]) -> None:
+        """Call ``fn`` once the proxy is up.
+
+        If it failed to start ``fn`` runs anyway: direct streams then play
+        without the proxy, and Radiko playback reports its own error as it
+        did before the proxy started lazily.
+        """
+        self.startup.after("proxy", fn, lambda _msg: fn())
+
+    def _prefetch_station(self, station_id: str) -> None:
+        proxy = self.proxy
+        if proxy is None:
+            return
+        self.startup.run(
+            "resolve",
+            lambda _token: proxy.prefetch(station_id).result(HTTP_TIMEOUT),
+            partial(self._on_station_prefetched, station_id),
+            priority=Priority.BACKGROUND,
+        )
+
+    def _on_station_prefetched(self, station_id: str, resolved: object) -> None:
+        if resolved is not None:
+            self.playback.mark_resolved(station_id)
+
+    def _resume_selection(self, station_id: str) -> None:
+        """Select the last session's station unless the user got there first."""
+        if self.list.currentIndex().isValid():
+            return
+        row = self.channels.row_of(station_id)
+        if row < 0:
+            return
+        index = self.channels.index(row)
+        self.list.setCurrentIndex(index)
+        self.list.scrollTo(index)
+
+    def _on_audio_latency(self, label: str, ms: float) -> None:
+        self.startup.finish("first audio")
+        note = " (over budget)" if ms > FIRST_AUDIO_BUDGET_MS else ""
+        self.statusBar().showMessage(f"Audio after {ms:.0f} ms{note}", 5000)
+
+    def _on_switched(self, stream_ms: float) -> None:
+        """Report how long a switch took from the click to the new audio."""
+        if self._selected_at is None:
+            return
+        ms = (time.perf_counter() - self._selected_at) * 1000
+        self._selected_at = None
+        note = " (over budget)" if ms > SWITCH_BUDGET_MS else ""
+        self.statusBar().showMessage(
+            f"Switched in {ms:.0f} ms (stream {stream_ms:.0f} ms){note}", 5000
+        )
+
+    def _watch_network_changes(self) -> None:
+        if not QNetworkInformation.loadDefaultBackend():
+            return
+        info = QNetworkInformation.instance()
+        if info is None:
+            return
+        info.reachabilityChanged.connect(self._on_network_changed)
+        info.transportMediumChanged.connect(self._on_network_changed)
+
+    def _on_network_changed(self, *_args: object) -> None:
+        self.client.invalidate_area_id()
+        self.now.refresh()
 
     def _fix_initial_size(self) -> None:
         from rarapla.config import WINDOW_DEFAULT_HEIGHT, WINDOW_MIN_HEIGHT
@@ -161,6 +459,11 @@ class MainWindow(QMainWindow):
             self.setMinimumHeight(WINDOW_MIN_HEIGHT)
 
     def _on_source_changed(self, idx: int) -> None:
+        prev_idx, self._source_idx = self._source_idx, idx
+        self._source_timer.stop()
+        if self._rb_task is not None:
+            self._rb_task.cancel()
+            self._rb_task = None
         if idx == 0:
             self._clear_list()
             self._populate()
@@ -168,116 +471,206 @@ class MainWindow(QMainWindow):
             return
         preset = self._rb_presets[idx - 1]
         self.now.stop()
-        self._clear_list()
+        if prev_idx == 0:
+            self._clear_list()
+        cached = self._rb_cache.get(self._preset_key(preset))
+        if cached is not None:
+            self._rb_key = self._preset_key(preset)
+            self._rb_results = list(cached)
+            self._rb_ids = {ch.id for ch in cached}
+            self._apply_channels(self._rb_results)
+            self.statusBar().showMessage(f"RB: {len(cached)} stations", 5000)
+            self._probe_rb_streams()
+            return
+        # Results of another preset stay until the new ones arrive, so
+        # stations found by both keep their rows. The search itself waits
+        # until the user stops flipping through presets.
+        self.statusBar().showMessage("Loading stations (Radio Browser)...")
+        self._source_timer.start()
+
+    @staticmethod
+    def _preset_key(preset: RBPreset) -> tuple[str, str | None]:
+        return (preset["mode"], preset.get("query"))
+
+    def _search_current_preset(self) -> None:
+        idx = self.source_combo.currentIndex()
+        if idx <= 0:
+            return
+        preset = self._rb_presets[idx - 1]
         self._start_rb_search(mode=preset["mode"], query=preset.get("query"))
 
     def _populate(self) -> None:
-        if self._populate_thread is not None:
+        if self._populate_task is not None and not self._populate_task.future.done():
             return
         self.statusBar().showMessage("Loading channels...")
-        self._populate_worker = ChannelFetchWorker(self.client)
-        self._populate_thread = QThread(self)
-        w = self._populate_worker
-        t = self._populate_thread
-        w.moveToThread(t)
-        t.started.connect(w.run)
-        w.finished.connect(self._on_channels_loaded)
-        w.error.connect(self._on_channel_error)
-        w.finished.connect(t.quit)
-        w.error.connect(t.quit)
-        w.finished.connect(w.deleteLater)
-        w.error.connect(w.deleteLater)
-        t.finished.connect(self._on_populate_thread_finished)
-        t.start()
-
-    def _on_populate_thread_finished(self) -> None:
-        t = self._populate_thread
-        self._populate_thread = None
-        self._populate_worker = None
-        if t is not None:
-            t.deleteLater()
+        self._populate_task = self.now.request(
+            self._on_channels_loaded, self._on_channel_error
+        )
 
     def _on_channels_loaded(self, channels: list[Channel]) -> None:
-        for ch in channels:
-            item = QListWidgetItem(self.list)
-            card = ChannelCard(ch)
-            item.setSizeHint(card.sizeHint())
-            item.setData(Qt.ItemDataRole.UserRole, ch)
-            self.list.addItem(item)
-            self.list.setItemWidget(item, card)
-            card.setProperty("selected", False)
-            self._item_by_id[ch.id] = item
+        if self.source_combo.currentIndex() != 0:
+            return
+        self._apply_channels(channels)
         self.statusBar().showMessage("Channels loaded", 5000)
+        self.startup.finish("channels")
 
     def _on_channel_error(self, msg: str) -> None:
         QMessageBox.warning(self, "Error", msg)
         self.statusBar().showMessage("Failed to load channels", 5000)
 
     def _clear_list(self) -> None:
-        self.list.clear()
-        self._item_by_id.clear()
+        self._all_channels = []
+        self._index.set_channels(())
+        self.channels.clear()
+
+    def _apply_channels(self, channels: list[Channel]) -> ChannelDiff:
+        """Show ``channels`` as the current source's list, filtered if asked."""
+        self._all_channels = list(channels)
+        self._index.set_channels(self._all_channels)
+        return self._show_filtered()
+
+    def _filtered(self) -> list[Channel]:
+        query = self.filter_edit.text()
+        if not query.strip():
+            return self._all_channels
+        return self._index.search(query)
+
+    def _show_filtered(self) -> ChannelDiff:
+        cur = self._selected_channel()
+        self._applying = True
+        try:
+            diff = self.channels.apply(self._filtered())
+            kept = cur is not None and cur.id not in diff.removed
+            if kept and cur is not None and not self.list.currentIndex().isValid():
+                # A model reset dropped the selection; select the channel again.
+                row = self.channels.row_of(cur.id)
+                self.list.setCurrentIndex(self.channels.index(row))
+        finally:
+            self._applying = False
+        if cur is not None and not kept:
+            self.list.selectionModel().clear()
+        return diff
+
+    def _selected_channel(self) -> Channel | None:
+        return self.channels.channel(self.list.currentIndex().row())
+
+    def _rb_pages(
+        self, mode: str, query: str | None, on_response: ResponseHook
+    ) -> Iterator[list[Channel]]:
+        if mode == "tag":
+            tag = (query or "").strip()
+            return self.rb.iter_by_tag(
+                tag or "vocaloid", RB_SEARCH_LIMIT, on_response=on_response
+            )
+        if mode == "search":
+            return self.rb.iter_text(
+                query or "", RB_SEARCH_LIMIT, on_response=on_response
+            )
+        return self.rb.iter_japan(RB_SEARCH_LIMIT, on_response=on_response)
 
-    def _start_rb_search(self, mode: str, query: str | None) -> None:
-        if self._rb_thread is not None:
-            return
+    def _start_rb_search(
+        self, mode: str, query: str | None, progressive: bool = True
+    ) -> None:
+        """Search Radio Browser for a preset.
+
+        Args:
+            mode: Preset mode.
+            query: Preset tag or search text.
+            progressive: Show results page by page as they arrive rather
+                than all at once when the search completes.
+        """
         self.statusBar().showMessage("Loading stations (Radio Browser)...")
-        w = RBSearchWorker(self.rb, mode=mode, query=query, limit=100)
-        t = QThread(self)
-        w.moveToThread(t)
-        t.started.connect(w.run)
-        w.finished.connect(self._on_rb_loaded)
-        w.error.connect(self._on_rb_error)
-        w.finished.connect(t.quit)
-        w.error.connect(t.quit)
-        w.finished.connect(w.deleteLater)
-        w.error.connect(w.deleteLater)
-
-        def _cleanup() -> None:
-            self._rb_thread = None
-            self._rb_worker = None
-            t.deleteLater()
-
-        t.finished.connect(_cleanup)
-        self._rb_thread = t
-        self._rb_worker = w
-        t.start()
-
-    def _on_rb_loaded(self, channels: list[Channel]) -> None:
+        self._rb_key = (mode, query)
+        self._rb_progressive = progressive
+        self._rb_results = []
+        self._rb_ids = set()
+
+        def _search(token: CancelToken) -> int:
+            def _abortable(r: "requests.Response") -> None:
+                # Cancelling closes the download so a superseded search
+                # stops at once instead of finishing its page.
+                token.add_callback(partial(abort_response, r))
+
+            total = 0
+            for chs in self._rb_pages(mode, query, _abortable):
+                token.raise_if_cancelled()
+                total += len(chs)
+                self.tasks.post(partial(self._on_rb_batch, token, chs))
+            return total
+
+        self._rb_task = self.tasks.submit(
+            _search, self._on_rb_loaded, self._on_rb_error, priority=Priority.USER
+        )
+
+    def _on_rb_batch(self, token: CancelToken, channels: list[Channel]) -> None:
+        if token.cancelled or self._rb_task is None or self._rb_task.token is not token:
+            return
         for ch in channels:
-            item = QListWidgetItem(self.list)
-            card = ChannelCard(ch)
-            item.setSizeHint(card.sizeHint())
-            item.setData(Qt.ItemDataRole.UserRole, ch)
-            self.list.addItem(item)
-            self.list.setItemWidget(item, card)
-            card.setProperty("selected", False)
-            self._item_by_id[ch.id] = item
-        self.statusBar().showMessage(f"RB: {len(channels)} stations", 5000)
+            if ch.id not in self._rb_ids:
+                self._rb_ids.add(ch.id)
+                self._rb_results.append(ch)
+        if self._rb_progressive:
+            self._apply_channels(self._rb_results)
+        self.statusBar().showMessage(
+            f"Loading stations (Radio Browser)... {len(self._rb_results)}"
+        )
+
+    def _on_rb_loaded(self, count: int) -> None:
+        if self._rb_key is not None:
+            self._rb_cache.put(self._rb_key, list(self._rb_results))
+        self._apply_channels(self._rb_results)
+        self.statusBar().showMessage(f"RB: {count} stations", 5000)
+        self.startup.finish("channels")
+        self._probe_rb_streams()
 
     def _on_rb_error(self, msg: str) -> None:
         QMessageBox.warning(self, "RB Error", msg)
         self.statusBar().showMessage("Radio Browser request failed", 5000)
 
-    def _on_select(
-        self, cur: QListWidgetItem | None, prev: QListWidgetItem | None
+    def _rb_channels(self) -> list[Channel]:
+        if self.source_combo.currentIndex() == 0:
+            return []
+        return self._all_channels
+
+    def _probe_rb_streams(self) -> None:
+        # A probe of an older list is stopped; whatever it already checked
+        # stays in the prober's cache, so the new probe skips those URLs.
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+        urls = frozenset(ch.stream_url for ch in self._rb_channels() if ch.stream_url)
+        if not urls:
+            return
+        self._probe_task = self.tasks.submit(
+            lambda token: self.prober.probe_many(urls, token),
+            partial(self._on_streams_probed, urls),
+            priority=Priority.BACKGROUND,
+        )
+
+    def _on_streams_probed(
+        self, urls: frozenset[str], health: dict[str, StreamHealth]
     ) -> None:
-        if prev:
-            card = self.list.itemWidget(prev)
-            if card:
-                card.setProperty("selected", False)
-                card.style().unpolish(card)
-                card.style().polish(card)
-                card.update()
-        if not cur:
+        self._probe_task = None
+        channels = self._rb_channels()
+        if {ch.stream_url for ch in channels if ch.stream_url} != urls:
+            return
+        for ch in channels:
+            h = health.get(ch.stream_url or "")
+            if h is not None:
+                self.channels.set_status(ch.id, h.summary())
+        self._all_channels = rank_channels(channels, health)
+        self._index.set_channels(self._all_channels)
+        self.channels.reorder(self._all_channels)
+        cur = self.list.currentIndex()
+        if cur.isValid():
+            self.list.scrollTo(cur)
+
+    def _on_select(self, cur: QModelIndex, _prev: QModelIndex) -> None:
+        ch = self.channels.channel(cur.row())
+        if ch is None or self._applying:
             return
-        card = self.list.itemWidget(cur)
-        if card:
-            card.setProperty("selected", True)
-            card.style().unpolish(card)
-            card.style().polish(card)
-            card.update()
-        ch = cast(Channel, cur.data(Qt.ItemDataRole.UserRole))
         self._pending_channel = ch
+        self._selected_at = time.perf_counter()
         self._switch_timer.stop()
         self._switch_timer.start(self._switch_delay_ms)
         if getattr(ch, "stream_url", None):
@@ -293,49 +686,32 @@ class MainWindow(QMainWindow):
         if getattr(ch, "stream_url", None):
             url = ch.stream_url or ""
             if url:
-                self.playback.prepare_direct(url)
-                try:
-                    if ch.id.startswith("rb:"):
-                        self.rb.notify_click(ch.id[3:])
-                except Exception:
-                    pass
+                self._after_proxy(partial(self._prepare_media, ch))
+                if ch.id.startswith("rb:"):
+                    self.clicks.report(ch.id[3:])
                 self.detail.set_program(ch.name, "", None)
                 self.statusBar().showMessage("Station loaded", 3000)
             return
         self.playback.set_current_station(ch.id)
-        if self._prog_worker:
-            self._prog_worker.cancel()
-        worker = ProgramFetchWorker(self.client, ch)
-        thread = QThread(self)
-        worker.moveToThread(thread)
-        thread.started.connect(worker.run)
-        worker.finished.connect(self._on_program_loaded)
-        worker.error.connect(self._on_program_error)
-        worker.cancelled.connect(self._on_program_cancelled)
-        worker.finished.connect(thread.quit)
-        worker.error.connect(thread.quit)
-        worker.cancelled.connect(thread.quit)
-        worker.finished.connect(worker.deleteLater)
-        worker.error.connect(worker.deleteLater)
-        worker.cancelled.connect(worker.deleteLater)
-
-        def _cleanup() -> None:
-            self._prog_thread = None
-            self._prog_worker = None
-            thread.deleteLater()
-
-        thread.finished.connect(_cleanup)
-        thread.start()
-        self._prog_thread = thread
-        self._prog_worker = worker
-        QTimer.singleShot(100, lambda: self.playback.prepare_media(ch.id))
+        self._record_program(ch)
+        self._request_program_detail(ch)
+        self._after_proxy(partial(self._prepare_media, ch))
 
-    def _on_program_loaded(self, ch: Channel, program: Program | None) -> None:
-        cur_item = self.list.currentItem()
-        if not cur_item:
+    def _prepare_media(self, ch: Channel) -> None:
+        """Load ``ch`` into the player so it buffers ahead of play.
+
+        Media goes through the proxy, so this waits until the proxy is up.
+        """
+        if self._current_channel is not ch:
             return
-        current = cast(Channel, cur_item.data(Qt.ItemDataRole.UserRole))
-        if current.id != ch.id:
+        if ch.stream_url:
+            self.playback.prepare_direct(ch.stream_url)
+        else:
+            self.playback.prepare_media(ch.id)
+
+    def _on_program_loaded(self, ch: Channel, program: Program | None) -> None:
+        current = self._selected_channel()
+        if current is None or current.id != ch.id:
             return
         title = program.title if program and program.title else ch.program_title
         pieces: list[str] = []
@@ -356,95 +732,48 @@ class MainWindow(QMainWindow):
         self.detail.set_program("", None, None)
         self.statusBar().showMessage(f"Failed to load program: {msg}", 5000)
 
-    def _on_program_cancelled(self) -> None:
-        self.statusBar().showMessage("Program loading cancelled", 2000)
-
     def _on_channel_refresh_error(self, msg: str) -> None:
         self.statusBar().showMessage(f"Channel refresh failed: {msg}", 3000)
 
     def _apply_now_diff(self, channels: list[Channel]) -> None:
-        new_map: dict[str, Channel] = {ch.id: ch for ch in channels}
-        cur_item = self.list.currentItem()
-        cur_id = (
-            cast(Channel, cur_item.data(Qt.ItemDataRole.UserRole)).id
-            if cur_item
-            else None
-        )
-        cur_title_before = (
-            cast(Channel, cur_item.data(Qt.ItemDataRole.UserRole)).program_title or ""
-            if cur_item
-            else None
-        )
-        for sid, item in self._item_by_id.items():
-            new_ch = new_map.get(sid)
-            if not new_ch:
-                continue
-            old_ch = cast(Channel, item.data(Qt.ItemDataRole.UserRole))
-            if (
-                old_ch.name != new_ch.name
-                or old_ch.program_title != new_ch.program_title
-                or old_ch.logo_url != new_ch.logo_url
-            ):
-                item.setData(Qt.ItemDataRole.UserRole, new_ch)
-                card = self.list.itemWidget(item)
-                if isinstance(card, ChannelCard):
-                    card.update_content(new_ch)
-        if cur_item and cur_id:
-            updated = self._item_by_id.get(cur_id)
-            if updated:
-                ch_after = cast(Channel, updated.data(Qt.ItemDataRole.UserRole))
-                cur_title_after = ch_after.program_title or ""
-                if cur_title_before != cur_title_after:
-                    self.detail.set_loading(cur_title_after)
-                    self._request_program_detail(ch_after)
+        if self.source_combo.currentIndex() != 0:
+            return
+        cur = self._selected_channel()
+        diff = self._apply_channels(channels)
+        if cur is None or "program_title" not in diff.changed.get(cur.id, ()):
+            return
+        ch_after = self.channels.channel(self.channels.row_of(cur.id))
+        if ch_after is None:
+            return
+        if self._current_channel and self._current_channel.id == cur.id:
+            self._record_program(ch_after)
+        self.detail.set_loading(ch_after.program_title or "")
+        self._request_program_detail(ch_after)
 
     def _request_program_detail(self, ch: Channel) -> None:
-        if self._prog_worker:
-            self._prog_worker.cancel()
-        worker = ProgramFetchWorker(self.client, ch)
-        thread = QThread(self)
-        worker.moveToThread(thread)
-        thread.started.connect(worker.run)
-        worker.finished.connect(self._on_program_loaded)
-        worker.error.connect(self._on_program_error)
-        worker.cancelled.connect(self._on_program_cancelled)
-        worker.finished.connect(thread.quit)
-        worker.error.connect(thread.quit)
-        worker.cancelled.connect(thread.quit)
-        worker.finished.connect(worker.deleteLater)
-        worker.error.connect(worker.deleteLater)
-        worker.cancelled.connect(worker.deleteLater)
-
-        def _cleanup() -> None:
-            self._prog_thread = None
-            self._prog_worker = None
-            thread.deleteLater()
-
-        thread.finished.connect(_cleanup)
-        thread.start()
-        self._prog_thread = thread
-        self._prog_worker = worker
+        key = f"program:{ch.id}"
+        prev = self._prog_task
+        if prev is not None and prev.key != key:
+            prev.cancel()
+        self._prog_task = self.tasks.submit(
+            lambda _token: self.client.fetch_program_detail(ch.id),
+            lambda program: self._on_program_loaded(ch, program),
+            self._on_program_error,
+            priority=Priority.USER,
+            key=key,
+        )
 
     def _on_rb_stream_title(self, title: str, meta: object) -> None:
-        cur_item = self.list.currentItem()
-        if not cur_item:
-            return
-        ch = cast(Channel, cur_item.data(Qt.ItemDataRole.UserRole))
-        if not getattr(ch, "stream_url", None):
+        ch = self._selected_channel()
+        if ch is None or not getattr(ch, "stream_url", None):
             return
         prog_title = (title or "").strip()
-        updated = Channel(
-            id=ch.id,
-            name=ch.name,
-            logo_url=ch.logo_url,
-            program_title=prog_title,
-            program_image=ch.program_image,
-            stream_url=ch.stream_url,
-        )
-        cur_item.setData(Qt.ItemDataRole.UserRole, updated)
-        card = self.list.itemWidget(cur_item)
-        if isinstance(card, ChannelCard):
-            card.update_content(updated)
+        updated = replace(ch, program_title=prog_title)
+        if self.channels.update_channel(updated):
+            self._all_channels = [
+                updated if c.id == ch.id else c for c in self._all_channels
+            ]
+            self._index.update(updated)
         desc_html = self._format_rb_meta(meta)
         panel_title = prog_title or ch.name
         self.detail.set_program(panel_title, desc_html, None)
@@ -470,9 +799,30 @@ class MainWindow(QMainWindow):
         return "<table cellspacing='0' cellpadding='0'>" + "".join(rows) + "</table>"
 
     def _on_player_toggled(self, playing: bool) -> None:
-        self.playback.handle_user_toggled(playing)
+        if not playing:
+            self.latency.cancel()
+            self.playback.handle_user_toggled(playing)
+            return
+        self.latency.start("play")
+        error = self.startup.error("proxy")
+        if error is not None:
+            self.statusBar().showMessage(f"Proxy failed to start: {error}", 7000)
+        elif not self.startup.is_done("proxy"):
+            self.statusBar().showMessage("Starting proxy...")
+        # Playback goes through the proxy, so a press during startup waits
+        # for it instead of failing to connect.
+        self._after_proxy(self._play_when_ready)
+
+    def _play_when_ready(self) -> None:
+        if self.player.toggle_btn.isChecked():
+            self.playback.handle_user_toggled(True)
 
     def _on_playback_error(self, msg: str) -> None:
+        ch = self._current_channel
+        if ch is not None and not ch.stream_url:
+            # Radiko refuses stations outside the listener's area; re-detect
+            # it on the next refresh in case the location changed.
+            self.client.invalidate_area_id()
         html = (
             "<span style='color:#e57373; font-weight:bold;'>"
             "⚠ 再生できませんでした: " + msg + "</span>"
@@ -486,31 +836,14 @@ class MainWindow(QMainWindow):
             self.setMinimumHeight(512)
 
     def closeEvent(self, e: QCloseEvent) -> None:
+        self._save_session()
         self._switch_timer.stop()
+        self._source_timer.stop()
         self.playback.shutdown()
         self.now.shutdown()
-        if self._prog_worker:
-            try:
-                self._prog_worker.cancel()
-            except Exception:
-                pass
-        for attr in ("_prog_thread", "_populate_thread", "_rb_thread"):
-            t = getattr(self, attr)
-            setattr(self, attr, None)
-            if t is None or not isValid(t):
-                continue
-            try:
-                t.quit()
-                t.wait(3000)
-            finally:
-                t.deleteLater()
-        for attr in ("_prog_worker", "_populate_worker", "_rb_worker"):
-            w = getattr(self, attr)
-            setattr(self, attr, None)
-            if w is None or not isValid(w):
-                continue
-            try:
-                w.deleteLater()
-            except Exception:
-                pass
+        self.clicks.stop()
+        if self.history is not None:
+            self.history.close()
+        self.tasks.shutdown()
+        image_cache().shutdown()
         super().closeEvent(e)
@@ -0,0 +1 @@
+"""UI item models."""
@@ -0,0 +1,248 @@
+from collections.abc import Iterable, Sequence
+from typing import Any
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QObject,
+    QPersistentModelIndex,
+    Qt,
+)
+from shiboken6 import isValid
+from rarapla.models.channel import Channel
+from rarapla.services.channel_diff import ChannelDiff, diff_channels
+from rarapla.ui.utils.image_cache import image_cache
+
+_Index = QModelIndex | QPersistentModelIndex
+
+CHANNEL_ROLE = Qt.ItemDataRole.UserRole
+STATUS_ROLE = Qt.ItemDataRole.UserRole + 1
+LOGO_SIZE = 64
+# Above this many inserted runs plus moved rows, individual row operations
+# cost more than a reset.
+RESET_EDITS = 64
+
+
+class ChannelListModel(QAbstractListModel):
+    """List model over :class:`Channel` records.
+
+    Logos are requested from the shared image cache only when a row is
+    painted, so large result sets cost nothing until they scroll into view.
+    """
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._channels: list[Channel] = []
+        self._row_by_id: dict[str, int] = {}
+        self._status: dict[str, str] = {}
+        self._logo_waiting: dict[str, set[str]] = {}
+        self._logo_failed: set[str] = set()
+
+    def rowCount(self, parent: _Index = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._channels)
+
+    def data(self, index: _Index, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._channels):
+            return None
+        ch = self._channels[index.row()]
+        if role == CHANNEL_ROLE:
+            return ch
+        if role == Qt.ItemDataRole.DisplayRole:
+            return ch.name
+        if role in (STATUS_ROLE, Qt.ItemDataRole.ToolTipRole):
+            return self._status.get(ch.id)
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._logo(ch)
+        return None
+
+    def channel(self, row: int) -> Channel | None:
+        if 0 <= row < len(self._channels):
+            return self._channels[row]
+        return None
+
+    def channels(self) -> list[Channel]:
+        return list(self._channels)
+
+    def row_of(self, channel_id: str) -> int:
+        return self._row_by_id.get(channel_id, -1)
+
+    def set_channels(self, channels: Iterable[Channel]) -> None:
+        self.beginResetModel()
+        self._channels = list(channels)
+        self._status.clear()
+        self._reindex()
+        self.endResetModel()
+
+    def append(self, channels: list[Channel]) -> None:
+        if not channels:
+            return
+        first = len(self._channels)
+        self.beginInsertRows(QModelIndex(), first, first + len(channels) - 1)
+        self._channels.extend(channels)
+        for i, ch in enumerate(channels, first):
+            self._row_by_id[ch.id] = i
+        self.endInsertRows()
+
+    def clear(self) -> None:
+        self.set_channels([])
+
+    def apply(self, channels: Sequence[Channel]) -> ChannelDiff:
+        """Turn the rows into ``channels`` with as few row operations as possible.
+
+        Rows are matched by channel id. Runs of removed and inserted rows and the
+        minimal set of moved rows are reported to views individually and
+        changed rows are refreshed in place, so unchanged rows keep their
+        selection and painted state. Edits too scattered for that (such as
+        clearing a filter on a long list) reset the model instead.
+        """
+        new = list(channels)
+        diff = diff_channels(self._channels, new)
+        if not diff:
+            return diff
+        inserted = set(diff.inserted)
+        edits = len(diff.moved) + sum(
+            1
+            for i, ch in enumerate(new)
+            if ch.id in inserted and (i == 0 or new[i - 1].id not in inserted)
+        )
+        if edits > RESET_EDITS:
+            self.beginResetModel()
+            self._channels = new
+            self._reindex()
+            self.endResetModel()
+            return diff
+        root = QModelIndex()
+        for first, last in _runs(sorted(self._row_by_id[c] for c in diff.removed)):
+            self.beginRemoveRows(root, first, last)
+            del self._channels[first : last + 1]
+            self.endRemoveRows()
+        self._reindex()
+        moved = set(diff.moved)
+        prev = -1
+        i = 0
+        while i < len(new):
+            ch = new[i]
+            if ch.id in inserted:
+                run = [ch]
+                while i + len(run) < len(new) and new[i + len(run)].id in inserted:
+                    run.append(new[i + len(run)])
+                row = prev + 1
+                self.beginInsertRows(root, row, row + len(run) - 1)
+                self._channels[row:row] = run
+                self._reindex()
+                self.endInsertRows()
+                prev = row + len(run) - 1
+                i += len(run)
+                continue
+            row = self._row_by_id[ch.id]
+            if ch.id in moved and row != prev + 1:
+                dest = prev + 1
+                self.beginMoveRows(root, row, row, root, dest)
+                item = self._channels.pop(row)
+                row = dest if dest < row else dest - 1
+                self._channels.insert(row, item)
+                self._reindex()
+                self.endMoveRows()
+            prev = row
+            i += 1
+        by_id = {ch.id: ch for ch in new}
+        for cid in diff.changed:
+            row = self._row_by_id[cid]
+            self._channels[row] = by_id[cid]
+            idx = self.index(row)
+            self.dataChanged.emit(idx, idx)
+        return diff
+
+    def update_channel(self, ch: Channel) -> bool:
+        """Replace the channel with the same id; return whether it changed."""
+        row = self.row_of(ch.id)
+        if row < 0 or self._channels[row] == ch:
+            return False
+        self._channels[row] = ch
+        idx = self.index(row)
+        self.dataChanged.emit(idx, idx)
+        return True
+
+    def set_status(self, channel_id: str, text: str) -> None:
+        """Set the status line of a channel.
+
+        The status is kept for channels without a row too, so it shows again
+        when a filter lets them back in. :meth:`set_channels` forgets it.
+        """
+        if self._status.get(channel_id) == text:
+            return
+        self._status[channel_id] = text
+        row = self.row_of(channel_id)
+        if row < 0:
+            return
+        idx = self.index(row)
+        self.dataChanged.emit(idx, idx, [STATUS_ROLE, Qt.ItemDataRole.ToolTipRole])
+
+    def reorder(self, channels: Iterable[Channel]) -> None:
+        """Put rows in the order of ``channels`` (matched by id).
+
+        Rows not mentioned keep their relative order after the listed ones.
+        Selection and other persistent indexes follow their rows.
+        """
+        order = [self._row_by_id[c.id] for c in channels if c.id in self._row_by_id]
+        listed = set(order)
+        order += [r for r in range(len(self._channels)) if r not in listed]
+        if order == list(range(len(self._channels))):
+            return
+        self.layoutAboutToBeChanged.emit()
+        new_row = {old: new for new, old in enumerate(order)}
+        self._channels = [self._channels[r] for r in order]
+        self._reindex()
+        old_idx = self.persistentIndexList()
+        new_idx = [self.index(new_row[i.row()]) for i in old_idx]
+        self.changePersistentIndexList(old_idx, new_idx)
+        self.layoutChanged.emit()
+
+    def _reindex(self) -> None:
+        self._row_by_id = {ch.id: i for i, ch in enumerate(self._channels)}
+
+    def _logo(self, ch: Channel) -> Any:
+        url = ch.logo_url
+        if not url or url in self._logo_failed:
+            return None
+        cache = image_cache()
+        pix = cache.cached(url, LOGO_SIZE, LOGO_SIZE)
+        if pix is not None:
+            return pix
+        waiting = self._logo_waiting.get(url)
+        if waiting is not None:
+            waiting.add(ch.id)
+            return None
+        self._logo_waiting[url] = {ch.id}
+        cache.request(
+            url,
+            lambda _pix: self._on_logo(url),
+            lambda: self._on_logo(url, failed=True),
+            width=LOGO_SIZE,
+            height=LOGO_SIZE,
+        )
+        return None
+
+    def _on_logo(self, url: str, failed: bool = False) -> None:
+        if not isValid(self):
+            return
+        ids = self._logo_waiting.pop(url, set())
+        if failed:
+            self._logo_failed.add(url)
+            return
+        for cid in ids:
+            row = self.row_of(cid)
+            if row >= 0 and self._channels[row].logo_url == url:
+                idx = self.index(row)
+                self.dataChanged.emit(idx, idx, [Qt.ItemDataRole.DecorationRole])
+
+
+def _runs(rows: list[int]) -> list[tuple[int, int]]:
+    """Group ascending rows into ``(first, last)`` runs, last run first."""
+    runs: list[tuple[int, int]] = []
+    for row in rows:
+        if runs and runs[-1][1] == row - 1:
+            runs[-1] = (runs[-1][0], row)
+        else:
+            runs.append((row, row))
+    runs.reverse()
+    return runs
@@ -0,0 +1,44 @@
+import time
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtMultimedia import QMediaPlayer
+from rarapla.services.player_service import PlayerService
+
+
+class AudioLatencyMeter(QObject):
+    """Measure how long a player takes from a request to audible output.
+
+    :meth:`start` stamps the request; the first position update while the
+    player is playing ends the measurement, since that means decoded audio
+    has reached the output.
+    """
+
+    measured = Signal(str, float)
+
+    def __init__(self, player: PlayerService, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._player = player
+        self._label = ""
+        self._started: float | None = None
+        player.positionChanged.connect(self._on_position)
+
+    @property
+    def pending(self) -> bool:
+        return self._started is not None
+
+    def start(self, label: str) -> None:
+        """Start timing; an unfinished measurement is replaced."""
+        self._label = label
+        self._started = time.perf_counter()
+
+    def cancel(self) -> None:
+        self._started = None
+
+    def _on_position(self, position: int) -> None:
+        if self._started is None or position <= 0:
+            return
+        state = self._player.player.playbackState()
+        if state != QMediaPlayer.PlaybackState.PlayingState:
+            return
+        ms = (time.perf_counter() - self._started) * 1000
+        self._started = None
+        self.measured.emit(self._label, ms)
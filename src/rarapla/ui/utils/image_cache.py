@@ -0,0 +1,292 @@
+import os
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from PySide6.QtCore import (
+    QByteArray,
+    QCoreApplication,
+    QObject,
+    QSize,
+    QTimer,
+    QUrl,
+    Qt,
+    Signal,
+)
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtNetwork import (
+    QNetworkAccessManager,
+    QNetworkDiskCache,
+    QNetworkReply,
+    QNetworkRequest,
+)
+from rarapla.config import (
+    IMAGE_BATCH_MS,
+    IMAGE_CACHE_DIR,
+    IMAGE_DECODE_WORKERS,
+    IMAGE_DISK_CACHE_BYTES,
+    IMAGE_MEMORY_CACHE_BYTES,
+    USER_AGENT,
+)
+from rarapla.services.task_executor import Priority, TaskExecutor
+
+_Key = tuple[str, int, int]
+_Size = tuple[int, int]
+
+
+@dataclass(eq=False)
+class _Waiter:
+    width: int
+    height: int
+    on_done: Callable[[QPixmap], None]
+    on_error: Callable[[], None] | None
+
+
+@dataclass(eq=False)
+class _Fetch:
+    reply: QNetworkReply
+    waiters: list[_Waiter] = field(default_factory=list)
+    data: bytes | None = None
+    decoding: set[_Size] = field(default_factory=set)
+
+
+def scale_image(img: QImage, width: int, height: int) -> QImage:
+    """Fit ``img`` into ``width`` x ``height``; a zero height keeps the ratio."""
+    if width > 0 and height > 0:
+        if img.width() <= width and img.height() <= height:
+            return img
+        return img.scaled(
+            QSize(width, height),
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+    if width > 0 and img.width() != width:
+        return img.scaledToWidth(width, Qt.TransformationMode.SmoothTransformation)
+    return img
+
+
+def decode_image(data: bytes, sizes: Iterable[_Size]) -> dict[_Size, QImage]:
+    """Decode ``data`` once and scale it to every requested size.
+
+    Only uses :class:`QImage`, so it is safe to call off the GUI thread.
+
+    Returns:
+        Scaled images by ``(width, height)``, or an empty dict if ``data``
+        is not a readable image.
+    """
+    img = QImage.fromData(data)
+    if img.isNull():
+        return {}
+    return {size: scale_image(img, *size) for size in set(sizes)}
+
+
+class ImageCache(QObject):
+    """Download, decode and scale images once for the whole application.
+
+    Decoded pixmaps are kept per URL and target size in a memory LRU capped
+    in bytes. Downloads go through one network manager backed by a size
+    capped disk cache, and concurrent requests for the same URL share a
+    single download. Decoding and scaling run on a small worker pool; the
+    results are turned into pixmaps and handed out in batches, at most once
+    per ``batch_ms``, so many images land in a single repaint.
+    """
+
+    _decoded = Signal(object)
+
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        memory_bytes: int = IMAGE_MEMORY_CACHE_BYTES,
+        disk_bytes: int = IMAGE_DISK_CACHE_BYTES,
+        workers: int = IMAGE_DECODE_WORKERS,
+        batch_ms: int = IMAGE_BATCH_MS,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._decoder = TaskExecutor(max_workers=workers, name="image")
+        self._ready: list[tuple[str, _Fetch, dict[_Size, QImage]]] = []
+        self._batch = QTimer(self)
+        self._batch.setSingleShot(True)
+        self._batch.setInterval(batch_ms)
+        self._batch.timeout.connect(self._deliver)
+        self._decoded.connect(self._on_decoded, Qt.ConnectionType.QueuedConnection)
+        self._nam = QNetworkAccessManager(self)
+        if cache_dir:
+            disk = QNetworkDiskCache(self)
+            disk.setCacheDirectory(cache_dir)
+            disk.setMaximumCacheSize(disk_bytes)
+            self._nam.setCache(disk)
+        self._memory_bytes = memory_bytes
+        self._used = 0
+        self._pixmaps: OrderedDict[_Key, QPixmap] = OrderedDict()
+        self._fetches: dict[str, _Fetch] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def cached(self, url: str, width: int = 0, height: int = 0) -> QPixmap | None:
+        """Return the decoded image if it is in memory, without fetching."""
+        key = (url, width, height)
+        pix = self._pixmaps.get(key)
+        if pix is not None:
+            self._pixmaps.move_to_end(key)
+        return pix
+
+    def request(
+        self,
+        url: str,
+        on_done: Callable[[QPixmap], None],
+        on_error: Callable[[], None] | None = None,
+        width: int = 0,
+        height: int = 0,
+    ) -> Callable[[], None]:
+        """Deliver the image for ``url`` scaled to ``width`` x ``height``.
+
+        ``on_done`` runs immediately on a memory hit and otherwise once the
+        image has been downloaded and decoded.
+
+        Returns:
+            A function that withdraws this request. The download is aborted
+            when no other request is waiting for it.
+        """
+        pix = self.cached(url, width, height)
+        if pix is not None:
+            self.hits += 1
+            on_done(pix)
+            return lambda: None
+        self.misses += 1
+        waiter = _Waiter(width, height, on_done, on_error)
+        fetch = self._fetches.get(url)
+        if fetch is None:
+            fetch = self._start(url)
+        fetch.waiters.append(waiter)
+        if fetch.data is not None:
+            self._decode(url, fetch)
+
+        def _cancel() -> None:
+            if waiter in fetch.waiters:
+                fetch.waiters.remove(waiter)
+            # Once downloaded, the fetch stays until its decode is delivered
+            # so the work is still cached.
+            if (
+                not fetch.waiters
+                and fetch.data is None
+                and self._fetches.get(url) is fetch
+            ):
+                del self._fetches[url]
+                fetch.reply.abort()
+
+        return _cancel
+
+    def clear(self) -> None:
+        self._pixmaps.clear()
+        self._used = 0
+
+    def shutdown(self) -> None:
+        self._decoder.shutdown()
+
+    def _start(self, url: str) -> _Fetch:
+        req = QNetworkRequest()
+        req.setUrl(QUrl(url))
+        req.setRawHeader(b"User-Agent", USER_AGENT.encode("utf-8"))
+        req.setAttribute(
+            QNetworkRequest.Attribute.CacheLoadControlAttribute,
+            QNetworkRequest.CacheLoadControl.PreferCache,
+        )
+        fetch = _Fetch(self._nam.get(req))
+        self._fetches[url] = fetch
+        fetch.reply.finished.connect(lambda: self._on_finished(url, fetch))
+        return fetch
+
+    def _on_finished(self, url: str, fetch: _Fetch) -> None:
+        reply = fetch.reply
+        reply.deleteLater()
+        if self._fetches.get(url) is not fetch:
+            return
+        data = b""
+        if reply.error() == QNetworkReply.NetworkError.NoError:
+            raw = reply.readAll()
+            data = bytes(raw.data() if isinstance(raw, QByteArray) else raw)
+        fetch.data = data
+        self._decode(url, fetch)
+
+    def _decode(self, url: str, fetch: _Fetch) -> None:
+        """Queue decoding for the sizes waiters want and no job covers yet."""
+        sizes = {(w.width, w.height) for w in fetch.waiters} - fetch.decoding
+        if not sizes or fetch.data is None:
+            return
+        fetch.decoding |= sizes
+        data = fetch.data
+        handle = self._decoder.submit(
+            lambda _token: decode_image(data, sizes), priority=Priority.BACKGROUND
+        )
+
+        def _done(fut: "Future[dict[_Size, QImage]]") -> None:
+            images = {} if fut.cancelled() or fut.exception() else fut.result()
+            self._decoded.emit((url, fetch, images))
+
+        handle.future.add_done_callback(_done)
+
+    def _on_decoded(self, item: tuple[str, _Fetch, dict[_Size, QImage]]) -> None:
+        self._ready.append(item)
+        if not self._batch.isActive():
+            self._batch.start()
+
+    def _deliver(self) -> None:
+        ready, self._ready = self._ready, []
+        for url, fetch, images in ready:
+            if self._fetches.get(url) is not fetch:
+                continue
+            failed = not images
+            pixmaps: dict[_Size, QPixmap] = {}
+            for size, img in images.items():
+                key = (url, *size)
+                pix = self.cached(*key)
+                if pix is None:
+                    pix = QPixmap.fromImage(img)
+                    self._store(key, pix)
+                pixmaps[size] = pix
+            waiting: list[_Waiter] = []
+            current, fetch.waiters = fetch.waiters, []
+            for w in current:
+                pix = pixmaps.get((w.width, w.height))
+                if pix is not None:
+                    w.on_done(pix)
+                elif failed:
+                    if w.on_error is not None:
+                        w.on_error()
+                else:
+                    waiting.append(w)
+            fetch.waiters = waiting + fetch.waiters
+            if not fetch.waiters and self._fetches.get(url) is fetch:
+                del self._fetches[url]
+
+    def _store(self, key: _Key, pix: QPixmap) -> None:
+        cost = _cost(pix)
+        if cost > self._memory_bytes:
+            return
+        old = self._pixmaps.pop(key, None)
+        if old is not None:
+            self._used -= _cost(old)
+        self._pixmaps[key] = pix
+        self._used += cost
+        while self._used > self._memory_bytes:
+            _, evicted = self._pixmaps.popitem(last=False)
+            self._used -= _cost(evicted)
+
+
+def _cost(pix: QPixmap) -> int:
+    return pix.width() * pix.height() * max(1, pix.depth()) // 8
+
+
+_shared: ImageCache | None = None
+
+
+def image_cache() -> ImageCache:
+    """Return the application-wide image cache, creating it on first use."""
+    global _shared
+    if _shared is None:
+        _shared = ImageCache(
+            os.path.join(os.getcwd(), IMAGE_CACHE_DIR),
+            parent=QCoreApplication.instance(),
+        )
+    return _shared
@@ -0,0 +1,82 @@
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any, TypeVar
+from PySide6.QtCore import QObject, Qt, Signal
+from rarapla.services.task_executor import (
+    CancelToken,
+    ExecutorMetrics,
+    Priority,
+    TaskCancelled,
+    TaskExecutor,
+    TaskHandle,
+)
+
+T = TypeVar("T")
+
+
+class TaskRunner(QObject):
+    """Run jobs on a shared :class:`TaskExecutor` and call back on the GUI thread.
+
+    Callbacks of a task that was cancelled before its result is delivered
+    are dropped, so a superseded request never touches the UI.
+    """
+
+    _deliver = Signal(object)
+
+    def __init__(
+        self, executor: TaskExecutor | None = None, parent: QObject | None = None
+    ) -> None:
+        super().__init__(parent)
+        self.executor = executor or TaskExecutor()
+        self._closed = False
+        self._deliver.connect(self._call, Qt.ConnectionType.QueuedConnection)
+
+    def submit(
+        self,
+        fn: Callable[[CancelToken], T],
+        on_done: Callable[[T], None] | None = None,
+        on_error: Callable[[str], None] | None = None,
+        priority: int = Priority.NORMAL,
+        key: str | None = None,
+    ) -> TaskHandle[T]:
+        handle = self.executor.submit(fn, priority=priority, key=key)
+
+        def _finished(fut: "Future[T]") -> None:
+            if self._closed or fut.cancelled():
+                return
+            exc = fut.exception()
+            if isinstance(exc, TaskCancelled):
+                return
+            if exc is None:
+                if on_done is not None:
+                    result = fut.result()
+                    self._post_for(handle, lambda: on_done(result))
+            elif on_error is not None:
+                msg = str(exc) or type(exc).__name__
+                self._post_for(handle, lambda: on_error(msg))
+
+        handle.future.add_done_callback(_finished)
+        return handle
+
+    def post(self, fn: Callable[[], None]) -> None:
+        """Call ``fn`` on the GUI thread; safe to use from any thread."""
+        if not self._closed:
+            self._deliver.emit(fn)
+
+    def metrics(self) -> ExecutorMetrics:
+        return self.executor.metrics()
+
+    def shutdown(self) -> None:
+        self._closed = True
+        self.executor.shutdown()
+
+    def _post_for(self, handle: TaskHandle[Any], fn: Callable[[], None]) -> None:
+        def _guarded() -> None:
+            if not handle.cancelled:
+                fn()
+
+        self.post(_guarded)
+
+    def _call(self, fn: Callable[[], None]) -> None:
+        if not self._closed:
+            fn()
@@ -0,0 +1,128 @@
+import re
+from collections import OrderedDict
+from typing import TypeVar
+from PySide6.QtCore import QObject, Qt
+from PySide6.QtGui import QFont, QFontMetrics, QGuiApplication, QScreen
+from rarapla.config import SOFT_WRAP_CHUNK, TEXT_LAYOUT_CACHE_SIZE
+
+_ZWSP = "\u200b"
+_WRAP_CHARS = "[A-Za-z0-9#%&=+@,;:!?\\.\\-_/]"
+
+_ElideKey = tuple[str, str, int, Qt.TextElideMode]
+_K = TypeVar("_K")
+
+
+def soft_wrap(text: str, chunk: int = SOFT_WRAP_CHUNK) -> str:
+    """Allow line breaks inside long Latin runs such as URLs or hashtags.
+
+    Runs of at least ``chunk`` characters get a zero-width space every
+    ``chunk`` characters, so word-wrapping labels can break them.
+    """
+    if not text:
+        return ""
+    pattern = re.compile(f"{_WRAP_CHARS}{{{chunk},}}")
+
+    def repl(m: re.Match[str]) -> str:
+        s = m.group(0)
+        return _ZWSP.join(s[i : i + chunk] for i in range(0, len(s), chunk))
+
+    return pattern.sub(repl, text)
+
+
+class TextLayoutCache(QObject):
+    """Memoize elided and soft-wrapped strings for every view.
+
+    Elided text is keyed by text, font and width, soft-wrapped text by text
+    and chunk size, both in LRUs of ``max_entries``. Font metrics are kept
+    per font. Everything depends on the fonts and screen resolution in
+    effect, so :meth:`invalidate` drops it all; the shared instance calls it
+    whenever the application font or a screen's DPI changes.
+    """
+
+    def __init__(
+        self, max_entries: int = TEXT_LAYOUT_CACHE_SIZE, parent: QObject | None = None
+    ) -> None:
+        super().__init__(parent)
+        self._max = max_entries
+        self._elided: OrderedDict[_ElideKey, str] = OrderedDict()
+        self._wrapped: OrderedDict[tuple[str, int], str] = OrderedDict()
+        self._metrics: dict[str, QFontMetrics] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def metrics(self, font: QFont) -> QFontMetrics:
+        key = font.key()
+        fm = self._metrics.get(key)
+        if fm is None:
+            fm = self._metrics[key] = QFontMetrics(font)
+        return fm
+
+    def elide(
+        self,
+        text: str,
+        font: QFont,
+        width: int,
+        mode: Qt.TextElideMode = Qt.TextElideMode.ElideRight,
+    ) -> str:
+        """Return ``text`` elided to fit ``width`` pixels in ``font``."""
+        key = (text, font.key(), width, mode)
+        out = self._elided.get(key)
+        if out is not None:
+            self.hits += 1
+            self._elided.move_to_end(key)
+            return out
+        self.misses += 1
+        out = self.metrics(font).elidedText(text, mode, width)
+        _put(self._elided, key, out, self._max)
+        return out
+
+    def soft_wrap(self, text: str, chunk: int = SOFT_WRAP_CHUNK) -> str:
+        """Cached :func:`soft_wrap`."""
+        key = (text, chunk)
+        out = self._wrapped.get(key)
+        if out is not None:
+            self.hits += 1
+            self._wrapped.move_to_end(key)
+            return out
+        self.misses += 1
+        out = soft_wrap(text, chunk)
+        _put(self._wrapped, key, out, self._max)
+        return out
+
+    def invalidate(self) -> None:
+        self._elided.clear()
+        self._wrapped.clear()
+        self._metrics.clear()
+
+    def watch(self, app: QGuiApplication) -> None:
+        """Invalidate whenever the font or any screen's DPI of ``app`` changes."""
+        app.fontChanged.connect(self.invalidate)
+        app.screenAdded.connect(self._watch_screen)
+        app.screenRemoved.connect(self.invalidate)
+        for screen in app.screens():
+            self._watch_screen(screen)
+
+    def _watch_screen(self, screen: QScreen) -> None:
+        screen.logicalDotsPerInchChanged.connect(self.invalidate)
+        screen.physicalDotsPerInchChanged.connect(self.invalidate)
+        self.invalidate()
+
+
+def _put(lru: OrderedDict[_K, str], key: _K, value: str, limit: int) -> None:
+    lru[key] = value
+    if len(lru) > limit:
+        lru.popitem(last=False)
+
+
+_shared: TextLayoutCache | None = None
+
+
+def text_layout() -> TextLayoutCache:
+    """Return the application-wide text layout cache, creating it on first use."""
+    global _shared
+    if _shared is None:
+        app = QGuiApplication.instance()
+        _shared = TextLayoutCache(parent=app)
+        if isinstance(app, QGuiApplication):
+            _shared.watch(app)
+    return _shared
@@ -0,0 +1,101 @@
+from PySide6.QtCore import QModelIndex, QPersistentModelIndex, QRect, QSize, Qt
+from PySide6.QtGui import QColor, QFont, QPainter, QPixmap
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+from rarapla.config import CARD_HEIGHT
+from rarapla.models.channel import Channel
+from rarapla.ui.models.channel_list_model import CHANNEL_ROLE, LOGO_SIZE, STATUS_ROLE
+from rarapla.ui.utils.text_layout import text_layout
+
+_Index = QModelIndex | QPersistentModelIndex
+
+_BORDER = QColor(255, 255, 255, 46)
+_BORDER_HOVER = QColor(255, 255, 255, 77)
+_BACKGROUND_HOVER = QColor(255, 255, 255, 10)
+_BORDER_SELECTED = QColor("#3daee9")
+_BACKGROUND_SELECTED = QColor(61, 174, 233, 51)
+_PAD = 8
+
+
+class ChannelDelegate(QStyledItemDelegate):
+    """Paint a channel row as a card: logo, station name and program title."""
+
+    _name_fonts: dict[str, QFont] = {}
+
+    @classmethod
+    def _name_font(cls, base: QFont) -> QFont:
+        key = base.key()
+        font = cls._name_fonts.get(key)
+        if font is None:
+            font = QFont(base)
+            font.setBold(True)
+            font.setPointSizeF(max(base.pointSizeF(), 14.0))
+            cls._name_fonts[key] = font
+        return font
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: _Index) -> QSize:
+        return QSize(option.rect.width(), CARD_HEIGHT)
+
+    def paint(
+        self, painter: QPainter, option: QStyleOptionViewItem, index: _Index
+    ) -> None:
+        ch = index.data(CHANNEL_ROLE)
+        if not isinstance(ch, Channel):
+            return
+        state = option.state
+        rect: QRect = option.rect.adjusted(0, 0, -1, -1)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        if state & QStyle.StateFlag.State_Selected:
+            painter.setPen(_BORDER_SELECTED)
+            painter.setBrush(_BACKGROUND_SELECTED)
+        elif state & QStyle.StateFlag.State_MouseOver:
+            painter.setPen(_BORDER_HOVER)
+            painter.setBrush(_BACKGROUND_HOVER)
+        else:
+            painter.setPen(_BORDER)
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRoundedRect(rect, 4, 4)
+        icon = QRect(
+            rect.left() + _PAD,
+            rect.top() + (rect.height() - LOGO_SIZE) // 2,
+            LOGO_SIZE,
+            LOGO_SIZE,
+        )
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("white"))
+        painter.drawRoundedRect(icon, 4, 4)
+        logo = index.data(Qt.ItemDataRole.DecorationRole)
+        if isinstance(logo, QPixmap) and not logo.isNull():
+            x = icon.left() + (LOGO_SIZE - logo.width()) // 2
+            y = icon.top() + (LOGO_SIZE - logo.height()) // 2
+            painter.drawPixmap(x, y, logo)
+        text_left = icon.right() + _PAD + 4
+        width = max(0, rect.right() - _PAD - text_left)
+        base: QFont = option.font
+        name_font = self._name_font(base)
+        layout = text_layout()
+        name_fm = layout.metrics(name_font)
+        title_fm = layout.metrics(base)
+        line_gap = 4
+        block = name_fm.height() + line_gap + title_fm.height()
+        top = rect.top() + (rect.height() - block) // 2
+        title = (ch.program_title or "").strip() or (index.data(STATUS_ROLE) or "")
+        painter.setPen(option.palette.color(option.palette.ColorRole.Text))
+        painter.setFont(name_font)
+        painter.drawText(
+            QRect(text_left, top, width, name_fm.height()),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            layout.elide(ch.name or "", name_font, width),
+        )
+        painter.setFont(base)
+        painter.drawText(
+            QRect(
+                text_left + 4,
+                top + name_fm.height() + line_gap,
+                width - 4,
+                title_fm.height(),
+            ),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            layout.elide(title, base, width - 4),
+        )
+        painter.restore()
@@ -1,7 +1,9 @@
+from collections.abc import Callable
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QPixmap
 from PySide6.QtWidgets import QGroupBox, QLabel, QVBoxLayout, QWidget
-from rarapla.ui.utils.image_loader import ImageLoader
+from rarapla.ui.utils.image_cache import image_cache
+from rarapla.ui.utils.text_layout import text_layout
 from rarapla.ui.widgets.smooth_area import SmoothScrollArea
 
 
@@ -9,7 +11,7 @@ class DetailPanel(QGroupBox):
 
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__("Detail", parent)
-        self._img_loader = ImageLoader(self)
+        self._cancel_image: Callable[[], None] | None = None
         self.title_label = QLabel("")
         self.title_label.setObjectName("DetailTitle")
         self.title_label.setWordWrap(True)
@@ -41,14 +43,14 @@ class DetailPanel(QGroupBox):
         box.addWidget(self.scroll_area, 1)
 
     def set_loading(self, title_text: str) -> None:
-        self.title_label.setText(title_text or "")
+        self.title_label.setText(text_layout().soft_wrap(title_text or ""))
         self.desc.setText("読み込み中...")
         self._clear_image()
 
     def set_program(
         self, title_text: str, desc_html: str | None, image_url: str | None
     ) -> None:
-        self.title_label.setText(title_text or "")
+        self.title_label.setText(text_layout().soft_wrap(title_text or ""))
         self.desc.setText(desc_html or "")
         if image_url:
             self._load_image(image_url)
@@ -56,25 +58,25 @@ class DetailPanel(QGroupBox):
             self._clear_image()
 
     def _clear_image(self) -> None:
+        if self._cancel_image is not None:
+            self._cancel_image()
+            self._cancel_image = None
         self.image.clear()
         self.image.setVisible(False)
 
     def _load_image(self, url: str) -> None:
 
+        fixed = 340
+
         def _done(pix: QPixmap) -> None:
-            fixed = 340
-            scaled = (
-                pix
-                if pix.width() == fixed
-                else pix.scaledToWidth(
-                    fixed, Qt.TransformationMode.SmoothTransformation
-                )
-            )
-            self.image.setPixmap(scaled)
-            self.image.setFixedSize(fixed, scaled.height())
+            self._cancel_image = None
+            self.image.setPixmap(pix)
+            self.image.setFixedSize(fixed, pix.height())
             self.image.setVisible(True)
 
         def _err() -> None:
+            self._cancel_image = None
             self._clear_image()
 
-        self._img_loader.load(url, on_done=_done, on_error=_err, scale_to_width=340)
+        self._clear_image()
+        self._cancel_image = image_cache().request(url, _done, _err, width=fixed)
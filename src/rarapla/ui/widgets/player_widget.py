@@ -20,7 +20,7 @@ class PlayerWidget(QWidget):
 
     def __init__(self) -> None:
         super().__init__()
-        self.svc: PlayerService = PlayerService()
+        self.svc: PlayerService = PlayerService(parent=self)
         layout = QVBoxLayout(self)
         self._media_devices = QMediaDevices(self)
         self.dev_label = QLabel("Output:")
@@ -47,20 +47,32 @@ class PlayerWidget(QWidget):
         layout.addLayout(ctl)
         self.toggle_btn.toggled.connect(self._on_toggled)
         self.vol.valueChanged.connect(self._on_volume)
-        self.svc.player.playbackStateChanged.connect(self._on_state)
+        self.svc.playbackStateChanged.connect(self._on_state)
         self.dev_combo.currentIndexChanged.connect(self._on_device_changed)
         self._media_devices.audioOutputsChanged.connect(self._on_audio_outputs_changed)
         self._refresh_devices(select_current=False)
 
     def set_media(self, url: str) -> None:
-        want_play = self.toggle_btn.isChecked()
-        self.svc.set_media(url)
-        if want_play:
-            self.svc.play()
+        """Load ``url``, switching over without a gap if playing."""
+        if self.toggle_btn.isChecked():
+            self.svc.switch_to(url)
             self._sync_toggle_to_state(True)
         else:
+            self.svc.set_media(url)
             self._sync_toggle_to_state(False)
 
+    def output_device_id(self) -> bytes:
+        return self._device_id(self.svc.audio.device())
+
+    def select_output_device(self, device_id: bytes) -> bool:
+        """Switch to the output device with ``device_id`` if it is present."""
+        for i in range(self.dev_combo.count()):
+            dev = self.dev_combo.itemData(i)
+            if isinstance(dev, QAudioDevice) and self._device_id(dev) == device_id:
+                self.dev_combo.setCurrentIndex(i)
+                return True
+        return False
+
     def _device_id(self, dev: QAudioDevice) -> bytes:
         return cast(bytes, dev.id().data())
 
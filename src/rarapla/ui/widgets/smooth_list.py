@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 from PySide6.QtGui import QWheelEvent
-from PySide6.QtWidgets import QAbstractItemView, QListWidget, QWidget
+from PySide6.QtWidgets import QAbstractItemView, QListView, QWidget
 
 if TYPE_CHECKING:
 
@@ -11,11 +11,12 @@ else:
     from .smooth_scroll_mixin import SmoothScrollMixin
 
 
-class SmoothListWidget(SmoothScrollMixin, QListWidget):
+class SmoothListView(SmoothScrollMixin, QListView):
 
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
         self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setUniformItemSizes(True)
 
     def wheelEvent(self, e: QWheelEvent) -> None:
         self._smooth_wheel_event(e)
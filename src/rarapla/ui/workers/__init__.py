@@ -1 +0,0 @@
-"""UI workers."""
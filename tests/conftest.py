@@ -1,11 +1,15 @@
 import asyncio
-from collections.abc import Coroutine, Mapping
+import os
+from collections.abc import Callable, Coroutine, Iterator, Mapping
 from datetime import datetime, timedelta, timezone, tzinfo
 from textwrap import dedent
-from typing import Any, TypeVar
+from typing import TYPE_CHECKING, Any, TypeVar
 
 import pytest
 
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QApplication
+
 
 class FakeResponse:
     def __init__(self, status_code: int = 200, text: str = "") -> None:
@@ -57,6 +61,16 @@ class FakeAiohttpSession:
         return _FakeAiohttpResp(200, self._text)
 
 
+@pytest.fixture
+def rb_servers_json() -> list[dict[str, str]]:
+    return [
+        {"ip": "2a01:4f8:c2c:abcd::1", "name": "de1.api.radio-browser.info"},
+        {"ip": "91.132.145.114", "name": "de2.api.radio-browser.info"},
+        {"ip": "95.217.0.1", "name": "fi1.api.radio-browser.info"},
+        {"ip": "91.132.145.114", "name": "de2.api.radio-browser.info"},
+    ]
+
+
 @pytest.fixture
 def sample_area_html() -> str:
     return '<html><div class="JP12">Chiba</div></html>'
@@ -64,8 +78,7 @@ def sample_area_html() -> str:
 
 @pytest.fixture
 def station_list_xml() -> str:
-    return dedent(
-        """\
+    return dedent("""\
         <?xml version="1.0" encoding="UTF-8"?>
         <stations>
           <station>
@@ -80,14 +93,12 @@ def station_list_xml() -> str:
             <logo_large>http://cdn/logo_tbs_large.png</logo_large>
           </station>
         </stations>
-        """
-    )
+        """)
 
 
 @pytest.fixture
 def now_xml_current_hit() -> str:
-    return dedent(
-        """\
+    return dedent("""\
         <?xml version="1.0" encoding="UTF-8"?>
         <radiko>
           <station id="FMT">
@@ -111,14 +122,12 @@ def now_xml_current_hit() -> str:
             </progs>
           </station>
         </radiko>
-        """
-    )
+        """)
 
 
 @pytest.fixture
 def date_xml_has_now() -> str:
-    return dedent(
-        """\
+    return dedent("""\
         <?xml version="1.0" encoding="UTF-8"?>
         <root>
           <prog ft="20250102110000" to="20250102125959">
@@ -128,14 +137,12 @@ def date_xml_has_now() -> str:
             <img>http://img/date.png</img>
           </prog>
         </root>
-        """
-    )
+        """)
 
 
 @pytest.fixture
 def weekly_xml_fallback() -> str:
-    return dedent(
-        """\
+    return dedent("""\
         <?xml version="1.0" encoding="UTF-8"?>
         <root>
           <date yyyymmdd="20250102">
@@ -147,8 +154,7 @@ def weekly_xml_fallback() -> str:
             </prog>
           </date>
         </root>
-        """
-    )
+        """)
 
 
 class FakeDateTime(datetime):
@@ -171,3 +177,26 @@ T = TypeVar("T")
 
 def run(coro: Coroutine[Any, Any, T]) -> T:
     return asyncio.run(coro)
+
+
+@pytest.fixture(scope="session")
+def qapp() -> Iterator["QApplication"]:
+    """One application object for every Qt test; widgets need the full one."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    yield app  # type: ignore[misc]
+
+
+def wait_until(cond: Callable[[], bool], timeout_ms: int = 3000) -> None:
+    """Run the Qt event loop until ``cond()`` holds or the timeout passes."""
+    from PySide6.QtCore import QEventLoop, QTimer
+
+    loop = QEventLoop()
+    timer = QTimer()
+    timer.timeout.connect(lambda: loop.quit() if cond() else None)
+    timer.start(5)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec()
+    timer.stop()
@@ -0,0 +1,108 @@
+import asyncio
+from typing import Any
+
+import aiohttp
+import conftest as ct
+from rarapla.data.async_radiko_client import AsyncRadikoClient
+
+
+class _Resp:
+    def __init__(self, status: int, text: str) -> None:
+        self.status = status
+        self._text = text
+
+    async def __aenter__(self) -> "_Resp":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> bool:
+        return False
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                request_info=None, history=(), status=self.status
+            )
+
+    async def text(self) -> str:
+        return self._text
+
+
+class _Session:
+    def __init__(self, table: dict[str, tuple[int, str]]) -> None:
+        self._table = table
+        self.calls: list[str] = []
+
+    def get(self, url: str) -> _Resp:
+        self.calls.append(url)
+        status, text = self._table.get(url, (404, ""))
+        return _Resp(status, text)
+
+
+def test_get_area_id_cached(sample_area_html: str) -> None:
+    sess = _Session({"https://api.radiko.jp/apparea/area": (200, sample_area_html)})
+    cli = AsyncRadikoClient(session=sess)
+
+    async def _go() -> list[str]:
+        return [await cli.get_area_id(), await cli.get_area_id()]
+
+    assert ct.run(_go()) == ["JP12", "JP12"]
+    assert len(sess.calls) == 1
+
+
+def test_fetch_now_programs(
+    station_list_xml: str, now_xml_current_hit: str, patch_radiko_client_datetime: bool
+) -> None:
+    sess = _Session(
+        {
+            "https://radiko.jp/v2/station/list/JP12.xml": (200, station_list_xml),
+            "http://radiko.jp/v3/program/now/JP12.xml": (200, now_xml_current_hit),
+        }
+    )
+    cli = AsyncRadikoClient(session=sess)
+    channels = ct.run(cli.fetch_now_programs("JP12"))
+    fmt = [c for c in channels if c.id == "FMT"][0]
+    assert fmt.program_title == "NOW-HIT"
+    assert fmt.logo_url == "http://cdn/logo_fmt_med.png"
+
+
+def test_fetch_program_detail_weekly_fallback(
+    weekly_xml_fallback: str, patch_radiko_client_datetime: bool
+) -> None:
+    sess = _Session(
+        {
+            "https://radiko.jp/v3/program/station/weekly/FMT.xml": (
+                200,
+                weekly_xml_fallback,
+            )
+        }
+    )
+    cli = AsyncRadikoClient(session=sess)
+    prog = ct.run(cli.fetch_program_detail("FMT"))
+    assert prog is not None
+    assert prog.title == "WeeklyAPI Program"
+
+
+def test_station_logos_are_cached_per_area(
+    station_list_xml: str, now_xml_current_hit: str, patch_radiko_client_datetime: bool
+) -> None:
+    logos_url = "https://radiko.jp/v2/station/list/JP12.xml"
+    sess = _Session(
+        {
+            logos_url: (200, station_list_xml),
+            "http://radiko.jp/v3/program/now/JP12.xml": (200, now_xml_current_hit),
+        }
+    )
+    cli = AsyncRadikoClient(session=sess)
+
+    async def _go() -> dict[str, str]:
+        logos = await cli.fetch_station_logos("JP12")
+        await asyncio.gather(
+            cli.fetch_now_programs("JP12"), cli.fetch_now_programs("JP12")
+        )
+        return logos
+
+    assert ct.run(_go())["FMT"] == "http://cdn/logo_fmt_med.png"
+    assert sess.calls.count(logos_url) == 2
+    cli.invalidate_area_id()
+    ct.run(cli.station_logos("JP12"))
+    assert sess.calls.count(logos_url) == 3
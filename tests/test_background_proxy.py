@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+import rarapla.proxy.radiko_proxy as radiko_proxy
+from rarapla.proxy.background import BackgroundProxy
+
+
+def _start_and_collect(proxy: BackgroundProxy) -> tuple[list[str], list[str]]:
+    ready: list[str] = []
+    errors: list[str] = []
+    ended = threading.Event()
+
+    def _ready() -> None:
+        ready.append("ready")
+        ended.set()
+
+    def _error(msg: str) -> None:
+        errors.append(msg)
+        ended.set()
+
+    proxy.on_ready(_ready, _error)
+    proxy.start()
+    assert ended.wait(5)
+    proxy.stop()
+    return ready, errors
+
+
+def test_failed_start_reports_the_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def _bind_fails(self: radiko_proxy.RadikoProxyServer) -> None:
+        raise OSError("address already in use")
+
+    monkeypatch.setattr(radiko_proxy.RadikoProxyServer, "_start", _bind_fails)
+    proxy = BackgroundProxy("127.0.0.1", 0)
+    ready, errors = _start_and_collect(proxy)
+    assert ready == [] and errors == ["address already in use"]
+    assert proxy.error == "address already in use"
+    assert not proxy.ready.is_set()
+    late: list[str] = []
+    proxy.on_ready(lambda: late.append("ready"), late.append)
+    assert late == ["address already in use"]
+    with pytest.raises(RuntimeError):
+        proxy.prefetch("FMT")
+
+
+def test_failed_import_reports_the_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _broken(**_kwargs: object) -> None:
+        raise ImportError("no streamlink")
+
+    monkeypatch.setattr(radiko_proxy, "RadikoProxyServer", _broken)
+    proxy = BackgroundProxy("127.0.0.1", 0)
+    assert _start_and_collect(proxy) == ([], ["no streamlink"])
+
+
+def test_binds_the_port_the_ui_was_given(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen: list[dict[str, object]] = []
+
+    def _record(**kwargs: object) -> None:
+        seen.append(kwargs)
+        raise ImportError("stop here")
+
+    monkeypatch.setattr(radiko_proxy, "RadikoProxyServer", _record)
+    _start_and_collect(BackgroundProxy("127.0.0.1", 4321))
+    assert seen == [{"host": "127.0.0.1", "port": 4321, "probe_port": False}]
@@ -0,0 +1,29 @@
+from rarapla.models.channel import Channel
+from rarapla.services.channel_diff import changed_fields, diff_channels
+
+
+def _ch(sid: str, title: str = "") -> Channel:
+    return Channel(sid, sid.upper(), None, title, None)
+
+
+def test_inserts_removals_and_field_changes() -> None:
+    old = [_ch("a"), _ch("b"), _ch("c")]
+    new = [_ch("a", "NEWS"), _ch("c"), _ch("d")]
+    diff = diff_channels(old, new)
+    assert diff.removed == ["b"]
+    assert diff.inserted == ["d"]
+    assert diff.moved == []
+    assert diff.changed == {"a": frozenset({"program_title"})}
+
+
+def test_moves_are_minimal() -> None:
+    old = [_ch(x) for x in "abcde"]
+    assert diff_channels(old, [_ch(x) for x in "bcdea"]).moved == ["a"]
+    assert diff_channels(old, [_ch(x) for x in "eabcd"]).moved == ["e"]
+    assert len(diff_channels(old, [_ch(x) for x in "edcba"]).moved) == 4
+
+
+def test_identical_lists_are_empty_diff() -> None:
+    old = [_ch("a", "x"), _ch("b")]
+    assert not diff_channels(old, [_ch("a", "x"), _ch("b")])
+    assert changed_fields(_ch("a"), _ch("a")) == frozenset()
@@ -0,0 +1,73 @@
+import pytest
+from rarapla.models.channel import Channel
+from rarapla.services import channel_filter
+from rarapla.services.channel_filter import ChannelIndex, normalize
+
+
+def _ch(n: int, name: str, title: str = "", tags: tuple[str, ...] = ()) -> Channel:
+    return Channel(f"rb:{n}", name, None, title, None, tags=tags)
+
+
+CHANNELS = [
+    _ch(0, "Tokyo Jazz Cafe", tags=("jazz", "lounge")),
+    _ch(1, "ｱﾆｿﾝ ラジオ", tags=("anime",)),
+    _ch(2, "ＦＭ ＴＯＫＹＯ", "Morning News"),
+    _ch(3, "Berlin Classic", tags=("classical",)),
+]
+
+
+def _ids(channels: list[Channel]) -> list[str]:
+    return [c.id for c in channels]
+
+
+def test_normalize_folds_width_case_and_kana() -> None:
+    assert normalize("ＦＭ ＴＯＫＹＯ") == "fm tokyo"
+    assert normalize("ｱﾆｿﾝ") == normalize("アニソン") == "あにそん"
+
+
+def test_search_matches_every_word_across_fields() -> None:
+    idx = ChannelIndex(CHANNELS)
+    assert _ids(idx.search("tokyo")) == ["rb:0", "rb:2"]
+    assert _ids(idx.search("あにそん")) == ["rb:1"]
+    assert _ids(idx.search("anime")) == ["rb:1"]
+    assert _ids(idx.search("tokyo news")) == ["rb:2"]
+    assert _ids(idx.search("c")) == ["rb:0", "rb:3"]
+    assert _ids(idx.search("  ")) == _ids(CHANNELS)
+    assert idx.search("nothing") == []
+
+
+def test_typing_on_refines_and_backspace_widens() -> None:
+    idx = ChannelIndex(CHANNELS)
+    assert _ids(idx.search("cl")) == ["rb:3"]
+    assert _ids(idx.search("class")) == ["rb:3"]
+    assert _ids(idx.search("c")) == ["rb:0", "rb:3"]
+    idx.set_channels(CHANNELS[::-1])
+    assert _ids(idx.search("tokyo")) == ["rb:2", "rb:0"]
+
+
+def test_update_reindexes_one_channel() -> None:
+    idx = ChannelIndex(CHANNELS)
+    assert _ids(idx.search("news")) == ["rb:2"]
+    assert idx.update(_ch(0, "Tokyo Jazz Cafe", "Evening News", ("jazz",)))
+    assert _ids(idx.search("news")) == ["rb:0", "rb:2"]
+    assert idx.search("lounge") == []
+    assert idx.search("news")[0].program_title == "Evening News"
+    assert not idx.update(_ch(9, "Unknown"))
+    assert len(idx) == len(CHANNELS)
+
+
+def test_set_channels_reuses_unchanged_entries(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    idx = ChannelIndex(CHANNELS)
+    seen: list[str] = []
+    real = channel_filter.normalize
+
+    def _counting(text: str) -> str:
+        seen.append(text)
+        return real(text)
+
+    monkeypatch.setattr(channel_filter, "normalize", _counting)
+    idx.set_channels([*CHANNELS[1:], _ch(4, "Paris Jazz")])
+    assert seen == ["Paris Jazz\n"]
+    assert _ids(idx.search("jazz")) == ["rb:4"]
@@ -0,0 +1,77 @@
+import os
+import random
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QPersistentModelIndex, Qt  # noqa: E402
+from PySide6.QtTest import QAbstractItemModelTester  # noqa: E402
+from rarapla.models.channel import Channel  # noqa: E402
+from rarapla.ui.models.channel_list_model import (  # noqa: E402
+    CHANNEL_ROLE,
+    RESET_EDITS,
+    STATUS_ROLE,
+    ChannelListModel,
+)
+
+
+def _ch(n: int, title: str = "") -> Channel:
+    return Channel(f"rb:{n}", f"S{n}", None, title, None, f"http://s/{n}")
+
+
+def test_append_update_and_status() -> None:
+    m = ChannelListModel()
+    m.set_channels([_ch(0), _ch(1)])
+    m.append([_ch(2), _ch(3)])
+    assert m.rowCount() == 4
+    assert m.row_of("rb:3") == 3
+    changed: list[int] = []
+    m.dataChanged.connect(lambda a, b, roles=(): changed.append(a.row()))
+    assert m.update_channel(_ch(2, "NOW"))
+    assert not m.update_channel(_ch(2, "NOW"))
+    assert m.data(m.index(2), CHANNEL_ROLE).program_title == "NOW"
+    m.set_status("rb:1", "128 kbps")
+    assert m.data(m.index(1), Qt.ItemDataRole.ToolTipRole) == "128 kbps"
+    assert changed == [2, 1]
+
+
+def test_reorder_keeps_persistent_indexes() -> None:
+    m = ChannelListModel()
+    m.set_channels([_ch(i) for i in range(5)])
+    selected = QPersistentModelIndex(m.index(1))
+    m.reorder([_ch(4), _ch(1)])
+    assert [c.id for c in m.channels()] == ["rb:4", "rb:1", "rb:0", "rb:2", "rb:3"]
+    assert selected.row() == 1
+    assert m.row_of("rb:0") == 2
+
+
+def test_apply_reaches_target_with_consistent_signals() -> None:
+    rng = random.Random(7)
+    m = ChannelListModel()
+    tester = QAbstractItemModelTester(
+        m, QAbstractItemModelTester.FailureReportingMode.Fatal
+    )
+    m.set_channels([_ch(i) for i in range(20)])
+    for _ in range(30):
+        ids = rng.sample(range(40), rng.randint(0, 25))
+        new = [_ch(i, rng.choice(["", "A", "B"])) for i in ids]
+        selected = QPersistentModelIndex(m.index(0))
+        kept = m.channel(0)
+        diff = m.apply(new)
+        assert m.channels() == new
+        assert all(m.row_of(c.id) == r for r, c in enumerate(new))
+        if kept is not None and kept.id not in diff.removed:
+            assert selected.row() == m.row_of(kept.id)
+    del tester
+
+
+def test_scattered_apply_resets_and_keeps_status() -> None:
+    m = ChannelListModel()
+    everything = [_ch(i) for i in range(4 * RESET_EDITS)]
+    m.set_channels(everything[::2])
+    m.set_status("rb:1", "unreachable")
+    resets: list[bool] = []
+    m.modelReset.connect(lambda: resets.append(True))
+    m.apply(everything)
+    assert resets == [True]
+    assert m.channels() == everything
+    assert m.data(m.index(1), STATUS_ROLE) == "unreachable"
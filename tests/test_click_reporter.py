@@ -0,0 +1,91 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+from rarapla.services.click_reporter import ClickReporter
+
+
+def test_report_dedupes_within_window() -> None:
+    sent: list[str] = []
+    rep = ClickReporter(sent.append, dedupe_sec=60)
+    assert rep.report("a") is True
+    assert rep.report("a") is False
+    assert rep.report("b") is True
+    assert rep.flush_once() == 2
+    assert sent == ["a", "b"]
+    assert rep.pending() == []
+
+
+def test_failed_click_is_retried_with_backoff() -> None:
+    attempts: list[str] = []
+
+    def flaky(uuid: str) -> None:
+        attempts.append(uuid)
+        if len(attempts) < 2:
+            raise OSError("mirror down")
+
+    rep = ClickReporter(flaky, retry_base_sec=0.0)
+    rep.report("a")
+    assert rep.flush_once() == 1
+    assert attempts == ["a", "a"]
+
+
+def test_gives_up_after_max_attempts() -> None:
+    def fail(uuid: str) -> None:
+        raise OSError("down")
+
+    rep = ClickReporter(fail, retry_base_sec=0.0, max_attempts=3)
+    rep.report("a")
+    rep.flush_once()
+    assert rep.pending() == []
+
+
+def test_queue_persists_across_restarts(tmp_path: Path) -> None:
+    path = tmp_path / "clicks.json"
+
+    def fail(uuid: str) -> None:
+        raise OSError("offline")
+
+    rep = ClickReporter(fail, path=str(path), retry_base_sec=60)
+    rep.report("a")
+    rep.flush_once()
+    rep.stop()
+    saved = json.loads(path.read_text())
+    assert [(c["uuid"], c["attempts"]) for c in saved] == [("a", 1)]
+
+    sent: list[str] = []
+    again = ClickReporter(sent.append, path=str(path))
+    assert again.report("a") is False
+    assert again.flush_once() == 1
+    assert sent == ["a"]
+    assert json.loads(path.read_text()) == []
+
+
+def test_background_thread_sends() -> None:
+    done = threading.Event()
+    rep = ClickReporter(lambda uuid: done.set())
+    rep.start()
+    try:
+        rep.report("a")
+        assert done.wait(2.0)
+    finally:
+        rep.stop()
+
+
+def test_report_leaves_the_disk_to_the_worker(tmp_path: Path) -> None:
+    path = tmp_path / "clicks.json"
+    release = threading.Event()
+    rep = ClickReporter(lambda uuid: release.wait(2.0), path=str(path))
+    assert rep.report("a") is True
+    assert not path.exists()
+    rep.start()
+    try:
+        deadline = time.monotonic() + 2.0
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [c["uuid"] for c in json.loads(path.read_text())] == ["a"]
+    finally:
+        release.set()
+        rep.stop()
+    assert json.loads(path.read_text()) == []
@@ -0,0 +1,61 @@
+import math
+
+import pytest
+from rarapla.services.deck_switch import DeckSwitch, crossfade_gains
+
+
+def test_crossfade_gains_keep_power_and_clamp() -> None:
+    assert crossfade_gains(0.0) == pytest.approx((1.0, 0.0))
+    half = math.sqrt(0.5)
+    assert crossfade_gains(0.5) == pytest.approx((half, half))
+    assert crossfade_gains(1.0) == pytest.approx((0.0, 1.0))
+    for p in (0.1, 0.3, 0.7):
+        out, into = crossfade_gains(p)
+        assert out**2 + into**2 == pytest.approx(1.0)
+    assert crossfade_gains(-0.5) == crossfade_gains(0.0)
+    assert crossfade_gains(1.5) == crossfade_gains(1.0)
+
+
+def test_switch_swaps_decks_and_reports_time() -> None:
+    decks = DeckSwitch("a", "b")
+    assert decks.cut_over(1.0) is None
+    assert decks.begin(10.0) == "b"
+    assert decks.switching and decks.pending("b") and not decks.pending("a")
+    assert decks.cut_over(10.25) == pytest.approx(250.0)
+    assert (decks.active, decks.standby, decks.outgoing) == ("b", "a", "a")
+    assert not decks.switching and not decks.pending("a")
+    assert decks.release() == "a"
+    assert decks.outgoing is None and decks.release() is None
+
+
+def test_second_switch_mid_fade_reuses_the_fading_deck() -> None:
+    decks = DeckSwitch("a", "b")
+    decks.begin(0.0)
+    decks.cut_over(0.1)
+    # A new switch during the fade first releases the deck fading out...
+    assert decks.abort() is None
+    assert decks.release() == "a"
+    # ...which is then loaded with the next stream.
+    assert decks.begin(0.2) == "a"
+    assert decks.active == "b"
+    assert decks.cut_over(0.5) == pytest.approx(300.0)
+    assert (decks.active, decks.outgoing) == ("a", "b")
+
+
+def test_switch_before_cut_over_resets_the_standby_deck() -> None:
+    decks = DeckSwitch("a", "b")
+    decks.begin(0.0)
+    assert decks.abort() == "b"
+    assert not decks.switching and decks.active == "a"
+    assert decks.begin(1.0) == "b"
+
+
+def test_failed_new_deck_still_cuts_over() -> None:
+    decks = DeckSwitch("a", "b")
+    decks.begin(0.0)
+    # PlayerService cuts over without a fade when the pending deck errors,
+    # so the error belongs to the station the user picked.
+    assert decks.pending("b")
+    assert decks.cut_over(0.05) is not None
+    assert decks.active == "b" and decks.release() == "a"
+    assert not decks.pending("b")
@@ -0,0 +1,40 @@
+import time
+from pathlib import Path
+
+from rarapla.data.history_store import HistoryStore, split_artist_title
+
+
+def test_split_artist_title() -> None:
+    assert split_artist_title("Perfume - Polyrhythm") == ("Perfume", "Polyrhythm")
+    assert split_artist_title("Jingle") == (None, "Jingle")
+
+
+def test_record_dedupes_and_queries() -> None:
+    store = HistoryStore(":memory:")
+    t0 = 1_700_000_000.0
+    assert store.record("rb:a", "A FM", "Perfume - Polyrhythm", ts=t0)
+    assert not store.record("rb:a", "A FM", "Perfume - Polyrhythm", ts=t0 + 5)
+    store.record("rb:a", "A FM", "YOASOBI - Idol", ts=t0 + 200)
+    store.record("rb:b", "B FM", "perfume - Chocolate Disco", ts=t0 + 300)
+    store.record("FMT", "TOKYO FM", "Morning Show", source="radiko", ts=t0 + 9000)
+    assert store.flush() == 4
+    around = store.around("rb:a", t0 + 100, window_sec=150)
+    assert [p.title for p in around] == ["Perfume - Polyrhythm", "YOASOBI - Idol"]
+    heard = store.by_artist("PERFUME")
+    assert [p.station_id for p in heard] == ["rb:b", "rb:a"]
+    assert store.recent(1)[0].source == "radiko"
+
+
+def test_background_writer_batches(tmp_path: Path) -> None:
+    store = HistoryStore(str(tmp_path / "h.sqlite3"), batch_size=2, flush_sec=60)
+    store.start()
+    store.record("s", "S", "A - 1")
+    store.record("s", "S", "A - 2")
+    deadline = time.monotonic() + 2
+    while not store.recent() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(store.recent()) == 2
+    store.record("s", "S", "A - 3")
+    store.close()
+    reopened = HistoryStore(str(tmp_path / "h.sqlite3"))
+    assert [p.title for p in reopened.by_artist("A")][0] == "A - 3"
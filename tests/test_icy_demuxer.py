@@ -0,0 +1,47 @@
+from rarapla.services.icy_demuxer import IcyDemuxer, parse_icy_metadata
+
+
+def _meta_block(text: str) -> bytes:
+    raw = text.encode("utf-8")
+    n = -(-len(raw) // 16)
+    return bytes([n]) + raw.ljust(n * 16, b"\x00")
+
+
+def _stream(metaint: int) -> tuple[bytes, bytes]:
+    audio = bytes(range(250)) * 2
+    out = bytearray()
+    titles = ["StreamTitle='A - one';", "", "StreamTitle='B - ふたつ';"]
+    for i in range(0, len(audio), metaint):
+        out += audio[i : i + metaint]
+        t = titles[(i // metaint) % len(titles)]
+        out += _meta_block(t) if t else b"\x00"
+    return bytes(out), audio
+
+
+def _demux(data: bytes, metaint: int, step: int) -> tuple[bytes, list[str]]:
+    d = IcyDemuxer(metaint)
+    audio = bytearray()
+    meta: list[str] = []
+    for i in range(0, len(data), step):
+        parts, blocks = d.feed(data[i : i + step])
+        for p in parts:
+            audio += p
+        meta += blocks
+    return bytes(audio), meta
+
+
+def test_demuxer_is_independent_of_chunking() -> None:
+    data, audio = _stream(100)
+    for step in (1, 7, 100, 101, 4096):
+        got, meta = _demux(data, 100, step)
+        assert got == audio
+        assert meta[:2] == ["StreamTitle='A - one';", "StreamTitle='B - ふたつ';"]
+
+
+def test_parse_icy_metadata() -> None:
+    title, meta = parse_icy_metadata(
+        "StreamTitle='Song';StreamUrl='http://x/?artist=A+B&album=C';"
+    )
+    assert title == "Song"
+    assert meta["Artist"] == "A B"
+    assert meta["Album"] == "C"
@@ -0,0 +1,103 @@
+import os
+import threading
+from pathlib import Path
+
+import conftest as ct
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QUrl  # noqa: E402
+from PySide6.QtGui import QColor, QImage, QPixmap  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+from rarapla.services.task_executor import CancelToken, Priority  # noqa: E402
+from rarapla.ui.utils.image_cache import ImageCache, decode_image  # noqa: E402
+
+
+def _png(tmp_path: Path, name: str, w: int, h: int) -> str:
+    img = QImage(w, h, QImage.Format.Format_ARGB32)
+    img.fill(QColor("red"))
+    path = tmp_path / name
+    assert img.save(str(path), "PNG")
+    return QUrl.fromLocalFile(str(path)).toString()
+
+
+def test_decode_image_scales_to_each_size(qapp: QApplication, tmp_path: Path) -> None:
+    path = QUrl(_png(tmp_path, "big.png", 400, 200)).toLocalFile()
+    data = Path(path).read_bytes()
+    out = decode_image(data, [(64, 64), (100, 0), (0, 0), (64, 64)])
+    sizes = {k: (v.width(), v.height()) for k, v in out.items()}
+    assert sizes == {(64, 64): (64, 32), (100, 0): (100, 50), (0, 0): (400, 200)}
+    assert decode_image(b"not an image", [(64, 64)]) == {}
+
+
+def test_concurrent_requests_share_one_download(
+    qapp: QApplication, tmp_path: Path
+) -> None:
+    url = _png(tmp_path, "logo.png", 200, 100)
+    cache = ImageCache()
+    got: list[QPixmap] = []
+    cache.request(url, got.append, width=64, height=64)
+    cache.request(url, got.append, width=340)
+    assert len(cache._fetches) == 1
+    ct.wait_until(lambda: len(got) == 2)
+    sizes = sorted((p.width(), p.height()) for p in got)
+    assert sizes == [(64, 32), (340, 170)]
+    hit: list[QPixmap] = []
+    cache.request(url, hit.append, width=64, height=64)
+    assert len(hit) == 1 and cache.hits == 1
+
+
+def test_cancel_and_errors(qapp: QApplication, tmp_path: Path) -> None:
+    url = _png(tmp_path, "p.png", 10, 10)
+    cache = ImageCache()
+    got: list[QPixmap] = []
+    cancel = cache.request(url, got.append)
+    cancel()
+    assert not cache._fetches
+    failed: list[bool] = []
+    missing = QUrl.fromLocalFile(str(tmp_path / "missing.png")).toString()
+    cache.request(missing, got.append, lambda: failed.append(True))
+    ct.wait_until(lambda: bool(failed))
+    assert failed == [True] and got == []
+
+
+def test_memory_lru_is_capped_in_bytes(qapp: QApplication, tmp_path: Path) -> None:
+    urls = [_png(tmp_path, f"{i}.png", 32, 32) for i in range(3)]
+    cache = ImageCache(memory_bytes=2 * 32 * 32 * 4)
+    got: list[QPixmap] = []
+    for u in urls:
+        cache.request(u, got.append)
+    ct.wait_until(lambda: len(got) == 3)
+    assert cache.cached(urls[0]) is None
+    assert cache.cached(urls[1]) is not None
+    assert cache.cached(urls[2]) is not None
+
+
+def test_cancel_after_download_still_caches_the_decode(
+    qapp: QApplication, tmp_path: Path
+) -> None:
+    url = _png(tmp_path, "late.png", 20, 10)
+    cache = ImageCache(batch_ms=200)
+    got: list[QPixmap] = []
+    cancel = cache.request(url, got.append, width=10)
+    ct.wait_until(lambda: cache._fetches[url].data is not None)
+    cancel()
+    ct.wait_until(lambda: cache.cached(url, 10) is not None)
+    assert got == []
+    assert cache.cached(url, 10) is not None
+    assert not cache._fetches
+
+
+def test_decodes_use_every_worker(qapp: QApplication) -> None:
+    cache = ImageCache(workers=2)
+    both = threading.Barrier(2, timeout=2)
+
+    def _decode(_token: CancelToken) -> None:
+        both.wait()
+
+    jobs = [
+        cache._decoder.submit(_decode, priority=Priority.BACKGROUND) for _ in range(2)
+    ]
+    for job in jobs:
+        job.future.result(5)
+    cache.shutdown()
@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from rarapla.services.metadata_service import MetadataService
+
+
+def test_submit_runs_on_shared_session() -> None:
+    svc = MetadataService()
+
+    async def _session_id(session: aiohttp.ClientSession) -> int:
+        return id(session)
+
+    try:
+        a = svc.submit(_session_id).result(timeout=2)
+        b = svc.submit(_session_id).result(timeout=2)
+    finally:
+        svc.stop()
+    assert a == b
+
+
+def test_cancel_does_not_block() -> None:
+    svc = MetadataService()
+    cancelled: list[bool] = []
+
+    async def _forever(session: aiohttp.ClientSession) -> None:
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    try:
+        fut = svc.submit(_forever)
+        time.sleep(0.05)
+        t0 = time.perf_counter()
+        fut.cancel()
+        assert time.perf_counter() - t0 < 0.05
+        deadline = time.monotonic() + 2
+        while not cancelled and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        svc.stop()
+    assert cancelled == [True]
+
+
+def test_stop_cancels_running_watches() -> None:
+    svc = MetadataService()
+
+    async def _forever(session: aiohttp.ClientSession) -> None:
+        await asyncio.sleep(60)
+
+    fut = svc.submit(_forever)
+    svc.stop()
+    with pytest.raises(BaseException):
+        fut.result(timeout=2)
+    assert fut.cancelled()
@@ -1,3 +1,7 @@
+from dataclasses import FrozenInstanceError, replace
+
+import pytest
+
 from rarapla.models.channel import Channel
 from rarapla.models.program import Program
 
@@ -13,3 +17,23 @@ def test_program_model_basic() -> None:
     p = Program("Title", pfm="A,B", desc="D", image="I")
     assert p.title == "Title"
     assert p.pfm == "A,B"
+
+
+def test_channel_is_frozen_with_cheap_equality() -> None:
+    a = Channel("FMT", "FM TOKYO", None, "NOW", None)
+    b = Channel("".join(["F", "MT"]), "FM TOKYO", None, "NOW", None)
+    assert a == b and hash(a) == hash(b) == a.content_hash
+    assert a.id is b.id
+    assert a != replace(a, program_title="NEXT")
+    assert replace(a, program_title="NEXT").content_hash != a.content_hash
+    assert not hasattr(a, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        a.name = "x"  # type: ignore[misc]
+    assert len({a, b}) == 1
+
+
+def test_program_interns_and_hashes() -> None:
+    p = Program("".join(["Ti", "tle"]), pfm="A")
+    assert p.title is Program("Title").title
+    assert p == Program("Title", pfm="A")
+    assert p != Program("Title", pfm="B")
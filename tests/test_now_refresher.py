@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta, timezone
+
+from rarapla.models.channel import Channel
+from rarapla.ui.controllers.now_refresher import next_refresh_delay_ms
+
+_JST = timezone(timedelta(hours=9))
+_NOW = datetime(2025, 1, 2, 12, 0, 0, tzinfo=_JST)
+
+
+def _ch(sid: str, end: datetime | None) -> Channel:
+    return Channel(sid, sid, None, "", None, program_end=end)
+
+
+def _delay(channels: list[Channel]) -> int:
+    return next_refresh_delay_ms(
+        channels, _NOW, min_ms=5000, safety_ms=600_000, grace_ms=3000, stale_sec=120
+    )
+
+
+def test_wakes_after_earliest_program_end() -> None:
+    channels = [
+        _ch("A", _NOW + timedelta(minutes=7)),
+        _ch("B", _NOW + timedelta(minutes=3)),
+        _ch("C", None),
+    ]
+    assert _delay(channels) == 3 * 60 * 1000 + 3000
+
+
+def test_safety_poll_without_known_ends() -> None:
+    assert _delay([]) == 600_000
+    assert _delay([_ch("A", None), _ch("B", _NOW + timedelta(hours=2))]) == 600_000
+
+
+def test_just_ended_program_is_retried_soon() -> None:
+    stale = [
+        _ch("A", _NOW - timedelta(seconds=30)),
+        _ch("B", _NOW + timedelta(hours=1)),
+    ]
+    assert _delay(stale) == 5000
+    long_gone = [_ch("A", _NOW - timedelta(hours=1))]
+    assert _delay(long_gone) == 600_000
+
+
+def test_never_below_minimum() -> None:
+    assert _delay([_ch("A", _NOW + timedelta(milliseconds=100))]) == 5000
@@ -0,0 +1,74 @@
+import os
+from typing import Any
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# The multimedia backend needs system audio libraries, which headless
+# machines may lack.
+pytest.importorskip("PySide6.QtMultimedia", exc_type=ImportError)
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+from rarapla.ui.controllers import playback_controller  # noqa: E402
+from rarapla.ui.controllers.playback_controller import (  # noqa: E402
+    PlaybackController,
+)
+from rarapla.ui.widgets.player_widget import PlayerWidget  # noqa: E402
+
+STREAM = "http://radio.example/stream.mp3"
+
+
+class _Watcher:
+    created: list["_Watcher"] = []
+
+    def __init__(
+        self, url: str, *_args: Any, events_url: str | None = None, **_kw: Any
+    ) -> None:
+        self.url = url
+        self.events_url = events_url
+        self.metaUpdated = self.notSupported = self.networkError = self
+        _Watcher.created.append(self)
+
+    def connect(self, *_args: Any) -> None:
+        pass
+
+    def disconnect(self, *_args: Any) -> None:
+        pass
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+@pytest.fixture
+def controller(
+    qapp: QApplication, monkeypatch: pytest.MonkeyPatch
+) -> PlaybackController:
+    monkeypatch.setattr(playback_controller, "ICY_RELAY_ENABLED", True)
+    monkeypatch.setattr(playback_controller, "IcyWatcher", _Watcher)
+    _Watcher.created.clear()
+    return PlaybackController(PlayerWidget(), "http://127.0.0.1:3999")
+
+
+def test_direct_streams_use_the_relay_while_the_proxy_is_up(
+    controller: PlaybackController,
+) -> None:
+    controller.prepare_direct(STREAM)
+    source = controller.player.svc.player.source().toString()
+    assert source.startswith("http://127.0.0.1:3999/relay?")
+    assert _Watcher.created[-1].events_url is not None
+
+
+def test_direct_streams_skip_a_failed_proxy(controller: PlaybackController) -> None:
+    controller.proxy_ok = False
+    controller.prepare_direct(STREAM)
+    assert controller.player.svc.player.source().toString() == STREAM
+    assert _Watcher.created[-1].url == STREAM
+    assert _Watcher.created[-1].events_url is None
+    controller.player.toggle_btn.setChecked(True)
+    controller.handle_user_toggled(True)
+    assert controller.player.svc.player.source().toString() == STREAM
+    controller.shutdown()
@@ -56,3 +56,28 @@ def test_handle_master_rewrite(monkeypatch: pytest.MonkeyPatch) -> None:
     assert "#EXTM3U" in out
     assert exp1 in out
     assert exp2 in out
+
+
+def test_concurrent_resolves_are_shared(monkeypatch: pytest.MonkeyPatch) -> None:
+    import asyncio
+    import rarapla.proxy.radiko_proxy as rp
+
+    monkeypatch.setattr(rp, "RADIKO_RETRY_DELAY_SEC", 0)
+    server = RadikoProxyServer()
+    calls: list[str] = []
+
+    def _resolve(station: str) -> ResolvedStream:
+        calls.append(station)
+        return ResolvedStream(station, f"https://cdn.example/{station}.m3u8")
+
+    monkeypatch.setattr(server._resolver, "resolve_live", _resolve)
+
+    async def _both() -> list[ResolvedStream | None]:
+        return await asyncio.gather(
+            server._ensure_resolved("FMT"), server._ensure_resolved("FMT")
+        )
+
+    first, second = ct.run(_both())
+    assert first is second and calls == ["FMT"]
+    assert ct.run(server._ensure_resolved("FMT")) is first
+    assert calls == ["FMT"] and not server._resolving
@@ -9,3 +9,11 @@ def test_default_port_fallback() -> None:
         s.listen()
         proxy = RadikoProxyServer()
         assert proxy.port == PROXY_PORT + 1
+
+
+def test_fixed_port_is_not_reprobed() -> None:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", PROXY_PORT))
+        s.listen()
+        proxy = RadikoProxyServer(port=PROXY_PORT, probe_port=False)
+        assert proxy.port == PROXY_PORT
@@ -0,0 +1,160 @@
+import asyncio
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import conftest as ct
+import pytest
+from rarapla.proxy import stream_relay
+from rarapla.proxy.icy_hub import IcyMetadataHub
+from rarapla.proxy.radiko_proxy import RadikoProxyServer
+from rarapla.proxy.stream_relay import playlist_target, rewrite_hls_playlist
+
+
+def _icy_body(metaint: int) -> tuple[bytes, bytes]:
+    audio = b"\xff\xfb" * metaint
+    title = b"StreamTitle='Artist - Song';"
+    block = bytes([2]) + title.ljust(32, b"\x00")
+    body = audio[:metaint] + block + audio[metaint:]
+    return body, audio
+
+
+def test_relay_strips_icy_and_reconnects_transparently(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(stream_relay, "RELAY_RECONNECT_BASE_SEC", 0.01)
+    body, audio = _icy_body(metaint=128)
+    hits: list[int] = []
+
+    async def _upstream(request: web.Request) -> web.Response:
+        assert request.headers.get("Icy-MetaData") == "1"
+        hits.append(1)
+        return web.Response(
+            body=body,
+            headers={
+                "Content-Type": "audio/mpeg",
+                "icy-metaint": "128",
+                "icy-name": "Test FM",
+            },
+        )
+
+    async def _go() -> tuple[bytes, dict[str, str], list[str]]:
+        up_app = web.Application()
+        up_app.router.add_get("/stream", _upstream)
+        seen: list[str] = []
+        async with TestServer(up_app) as up:
+            url = str(up.make_url("/stream"))
+            proxy = RadikoProxyServer()
+            proxy._relay_session = aiohttp.ClientSession()
+            proxy.icy.subscribe(url, lambda title, meta: seen.append(title))
+            try:
+                async with TestServer(proxy._app) as srv:
+                    async with aiohttp.ClientSession() as cli:
+                        relay = srv.make_url("/relay")
+                        async with cli.get(relay, params={"u": url}) as r:
+                            # Two upstream connections arrive as one stream.
+                            data = await r.content.readexactly(len(audio) * 2)
+                            headers = dict(r.headers)
+            finally:
+                for ch in list(proxy._relays.values()):
+                    await ch.close()
+                await proxy._relay_session.close()
+            return data, headers, seen
+
+    data, headers, seen = ct.run(_go())
+    assert data == audio * 2
+    assert len(hits) >= 2
+    assert headers["icy-name"] == "Test FM"
+    assert "icy-metaint" not in {k.lower() for k in headers}
+    assert seen == ["", "Artist - Song"]
+
+
+def test_relay_without_clients_closes_after_idle_timeout() -> None:
+    closed = asyncio.Event()
+
+    async def _upstream(request: web.Request) -> web.StreamResponse:
+        resp = web.StreamResponse(headers={"Content-Type": "audio/mpeg"})
+        await resp.prepare(request)
+        try:
+            while True:
+                await resp.write(b"\xff\xfb" * 64)
+                await asyncio.sleep(0.01)
+        finally:
+            closed.set()
+
+    async def _go() -> bool:
+        up_app = web.Application()
+        up_app.router.add_get("/stream", _upstream)
+        async with TestServer(up_app) as up:
+            async with aiohttp.ClientSession() as session:
+                channel = stream_relay.RelayChannel(
+                    str(up.make_url("/stream")),
+                    session,
+                    IcyMetadataHub(),
+                    idle_sec=0.2,
+                )
+                channel.start()
+                await channel.wait_ready()
+                assert not channel.closed
+                await asyncio.wait_for(closed.wait(), 5)
+                await asyncio.sleep(0)
+                return channel.closed
+
+    assert ct.run(_go())
+
+
+def test_relay_reports_unreachable_upstream() -> None:
+    async def _go() -> int:
+        proxy = RadikoProxyServer()
+        proxy._relay_session = aiohttp.ClientSession()
+        try:
+            async with TestServer(proxy._app) as srv:
+                async with aiohttp.ClientSession() as cli:
+                    params = {"u": "http://127.0.0.1:1/stream"}
+                    async with cli.get(srv.make_url("/relay"), params=params) as r:
+                        return r.status
+        finally:
+            await proxy._relay_session.close()
+
+    assert ct.run(_go()) == 502
+
+
+def test_rewrite_hls_playlist() -> None:
+    text = "\n".join(
+        [
+            "#EXTM3U",
+            '#EXT-X-KEY:METHOD=AES-128,URI="key.bin"',
+            "#EXTINF:10,",
+            "seg1.aac",
+            "https://cdn.example/other/variant.m3u8",
+        ]
+    )
+    out = rewrite_hls_playlist(text, "https://host/live/index.m3u8")
+    assert '/seg?u=https%3A%2F%2Fhost%2Flive%2Fkey.bin"' in out
+    assert "/seg?u=https%3A%2F%2Fhost%2Flive%2Fseg1.aac" in out
+    assert "/relay?u=https%3A%2F%2Fcdn.example%2Fother%2Fvariant.m3u8" in out
+
+
+def test_playlist_target() -> None:
+    pls = "[playlist]\nNumberOfEntries=1\nFile1=http://s/live\nTitle1=x\n"
+    assert playlist_target(pls) == "http://s/live"
+    assert playlist_target("#EXTM3U\n#EXTINF:-1,x\nhttp://s/a\n") == "http://s/a"
+    assert playlist_target("[playlist]\n") is None
+
+
+def test_icy_events_streams_published_titles() -> None:
+    async def _go() -> list[bytes]:
+        proxy = RadikoProxyServer()
+        proxy.icy.publish("http://x/s", "Now", {"Title": "Now"})
+        async with TestServer(proxy._app) as srv:
+            async with aiohttp.ClientSession() as cli:
+                params = {"u": "http://x/s"}
+                async with cli.get(srv.make_url("/icy/events"), params=params) as r:
+                    first = await r.content.readline()
+                    proxy.icy.publish("http://x/s", "Next", {"Title": "Next"})
+                    second = await asyncio.wait_for(r.content.readline(), 2)
+        return [first, second]
+
+    first, second = ct.run(_go())
+    assert b'"title": "Now"' in first
+    assert b'"title": "Next"' in second
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 import pytest
 import conftest as ct
 from rarapla.data.radiko_client import RadikoClient
@@ -11,6 +13,46 @@ def test_get_area_id(sample_area_html: str, monkeypatch: pytest.MonkeyPatch) ->
     assert area == "JP12"
 
 
+def test_get_area_id_is_cached(sample_area_html: str) -> None:
+    calls: list[str] = []
+
+    class _CountingSession(ct.FakeRequestsSession):
+        def get(self, url: str, timeout: float | None = None) -> ct.FakeResponse:
+            calls.append(url)
+            return super().get(url, timeout)
+
+    table = {"https://api.radiko.jp/apparea/area": __build_resp(sample_area_html)}
+    cli = RadikoClient(session=_CountingSession(table))
+    assert cli.get_area_id() == "JP12"
+    assert cli.get_area_id() == "JP12"
+    assert len(calls) == 1
+    cli.invalidate_area_id()
+    assert cli.get_area_id() == "JP12"
+    assert len(calls) == 2
+    assert cli.get_area_id(refresh=True) == "JP12"
+    assert len(calls) == 3
+
+
+def test_get_area_id_expires_after_ttl(
+    sample_area_html: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import rarapla.data.radiko_client as rc
+
+    clock = [1000.0]
+    monkeypatch.setattr(rc.time, "monotonic", lambda: clock[0])
+    table = {"https://api.radiko.jp/apparea/area": __build_resp(sample_area_html)}
+    fake = __build_session(table)
+    cli = RadikoClient(session=fake, area_ttl_sec=60)
+    assert cli.get_area_id() == "JP12"
+    fake._table["https://api.radiko.jp/apparea/area"] = __build_resp(
+        '<div class="JP13">Tokyo</div>'
+    )
+    clock[0] += 30
+    assert cli.get_area_id() == "JP12"
+    clock[0] += 31
+    assert cli.get_area_id() == "JP13"
+
+
 def test_fetch_now_programs_selects_current(
     station_list_xml: str, now_xml_current_hit: str, patch_radiko_client_datetime: bool
 ) -> None:
@@ -27,6 +69,34 @@ def test_fetch_now_programs_selects_current(
     tbs = [c for c in channels if c.id == "TBS"][0]
     assert tbs.program_title == "TBS-NOW"
     assert tbs.logo_url == "http://cdn/logo_tbs_large.png"
+    assert fmt.program_end is not None
+    assert fmt.program_end.strftime("%Y%m%d%H%M%S") == "20250102125959"
+    assert fmt.program_end.utcoffset() == timedelta(hours=9)
+
+
+def test_station_logos_are_cached_per_area(
+    station_list_xml: str, now_xml_current_hit: str, patch_radiko_client_datetime: bool
+) -> None:
+    calls: list[str] = []
+
+    class _CountingSession(ct.FakeRequestsSession):
+        def get(self, url: str, timeout: float | None = None) -> ct.FakeResponse:
+            calls.append(url)
+            return super().get(url, timeout)
+
+    logos_url = "https://radiko.jp/v2/station/list/JP12.xml"
+    table = {
+        logos_url: __build_resp(station_list_xml),
+        "http://radiko.jp/v3/program/now/JP12.xml": __build_resp(now_xml_current_hit),
+    }
+    cli = RadikoClient(session=_CountingSession(table))
+    assert cli.station_logos("JP12")["FMT"] == "http://cdn/logo_fmt_med.png"
+    cli.fetch_now_programs("JP12")
+    cli.fetch_now_programs("JP12")
+    assert calls.count(logos_url) == 1
+    cli.invalidate_area_id()
+    cli.fetch_now_programs("JP12")
+    assert calls.count(logos_url) == 2
 
 
 def test_fetch_program_detail_date_preferred(
@@ -0,0 +1,145 @@
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import pytest
+import rarapla.data.radio_browser_catalog as rbc
+from rarapla.data.radio_browser_catalog import RadioBrowserCatalog
+from rarapla.data.radio_browser_client import RadioBrowserClient
+
+
+def _station(uuid: str, name: str, **extra: Any) -> dict[str, Any]:
+    item: dict[str, Any] = {
+        "stationuuid": uuid,
+        "name": name,
+        "url_resolved": f"http://stream/{uuid}",
+        "favicon": "",
+        "tags": "",
+        "countrycode": "JP",
+        "codec": "MP3",
+        "bitrate": 128,
+        "clickcount": 0,
+        "lastcheckok": 1,
+        "lastchangetime_iso8601": "2025-01-01T00:00:00Z",
+    }
+    item.update(extra)
+    return item
+
+
+STATIONS = [
+    _station("a", "Tokyo Jazz Cafe", tags="jazz,lounge", clickcount=50),
+    _station("b", "J-Pop Hits", tags="jpop,pop", clickcount=90),
+    _station("c", "Berlin Jazz", tags="jazz", countrycode="DE", clickcount=70),
+    _station("d", "Broken JP", tags="jpop", lastcheckok=0, clickcount=999),
+    _station("e", "アニソン ラジオ", tags="anime,jpop", clickcount=10),
+    _station("f", "Rock Classics", tags="classic rock", countrycode="US"),
+]
+
+
+def _ids(channels: list[Any]) -> list[str]:
+    return [c.id for c in channels]
+
+
+def test_search_japan_orders_by_clicks_and_hides_broken() -> None:
+    cat = RadioBrowserCatalog(":memory:")
+    cat.store(STATIONS)
+    assert _ids(cat.search_japan(10)) == ["rb:b", "rb:a", "rb:e"]
+
+
+def test_search_by_tag_and_text() -> None:
+    cat = RadioBrowserCatalog(":memory:")
+    cat.store(STATIONS)
+    assert _ids(cat.search_by_tag("jazz", 10)) == ["rb:c", "rb:a"]
+    assert cat.search_by_tag("jazz", 10)[1].tags == ("jazz", "lounge")
+    assert _ids(cat.search_by_tag("JPOP", 10)) == ["rb:b", "rb:e"]
+    assert _ids(cat.search_by_tag("rock", 10)) == ["rb:f"]
+    assert _ids(cat.search_text("jazz", 10)) == ["rb:c", "rb:a"]
+    assert _ids(cat.search_text("アニソン", 10)) == ["rb:e"]
+    assert _ids(cat.search_text("po", 10)) == ["rb:b", "rb:e"]
+
+
+def test_store_updates_and_replaces() -> None:
+    cat = RadioBrowserCatalog(":memory:")
+    cat.store(STATIONS)
+    cat.store([_station("a", "Renamed Jazz", tags="jazz", clickcount=500)])
+    assert cat.search_text("renamed", 10)[0].name == "Renamed Jazz"
+    assert cat.search_text("cafe", 10) == []
+    cat.store([_station("z", "Only One")], replace=True)
+    assert cat.count() == 1
+
+
+class _PagingClient:
+    def __init__(self, stations: list[dict[str, Any]]) -> None:
+        self.stations = stations
+        self.changed: list[dict[str, Any]] = []
+
+    def fetch_stations_page(self, offset: int, limit: int) -> list[dict[str, Any]]:
+        return self.stations[offset : offset + limit]
+
+    def fetch_changed_stations(self, offset: int, limit: int) -> list[dict[str, Any]]:
+        return self.changed[offset : offset + limit]
+
+
+def test_sync_full_then_incremental() -> None:
+    cat = RadioBrowserCatalog(":memory:")
+    client = _PagingClient(STATIONS)
+    assert cat.sync(client) == len(STATIONS)
+    assert not cat.needs_refresh()
+    client.changed = [
+        _station("g", "New Station", lastchangetime_iso8601="2025-02-01T00:00:00Z"),
+        _station("a", "Old", lastchangetime_iso8601="2024-01-01T00:00:00Z"),
+    ]
+    assert cat.sync(client) == 1
+    assert cat.count() == len(STATIONS) + 1
+
+
+def test_sync_full_does_not_lock_the_database_while_downloading(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = str(tmp_path / "catalog.sqlite3")
+    cat = RadioBrowserCatalog(path)
+    cat.store([_station("old", "Old Station", tags="rock")])
+    monkeypatch.setattr(rbc, "RB_CATALOG_PAGE_SIZE", 2)
+    seen: list[tuple[int, int]] = []
+
+    class _WritingClient(_PagingClient):
+        def fetch_stations_page(self, offset: int, limit: int) -> list[dict[str, Any]]:
+            conn = sqlite3.connect(path, timeout=0.1)
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('probe', ?)",
+                    (str(offset),),
+                )
+                staged = conn.execute("SELECT COUNT(*) FROM staged_stations")
+                seen.append((staged.fetchone()[0], cat.count()))
+            conn.close()
+            return super().fetch_stations_page(offset, limit)
+
+    assert cat.sync(_WritingClient(STATIONS)) == len(STATIONS)
+    # Pages are staged as they arrive; readers keep the old list until then.
+    assert seen == [(0, 1), (2, 1), (4, 1), (6, 1)]
+    assert cat.count() == len(STATIONS)
+    assert _ids(cat.search_by_tag("rock", 10)) == ["rb:f"]
+    assert _ids(cat.search_by_tag("jazz", 10)) == ["rb:c", "rb:a"]
+
+
+def test_is_populated_follows_replacements() -> None:
+    cat = RadioBrowserCatalog(":memory:")
+    assert not cat.is_populated()
+    cat.store(STATIONS)
+    assert cat.is_populated()
+    cat.store([], replace=True)
+    assert not cat.is_populated()
+
+
+def test_client_uses_populated_catalog() -> None:
+    class _NoNetwork:
+        headers: dict[str, str] = {}
+
+        def get(self, *args: Any, **kwargs: Any) -> Any:
+            raise AssertionError("network used")
+
+    cat = RadioBrowserCatalog(":memory:")
+    cat.store(STATIONS)
+    cli = RadioBrowserClient(base="http://api", session=_NoNetwork(), catalog=cat)
+    assert _ids(cli.search_by_tag("jazz", 1)) == ["rb:c"]
@@ -1,5 +1,15 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
-from rarapla.data.radio_browser_client import RadioBrowserClient
+import requests
+from rarapla.data.radio_browser_client import (
+    RadioBrowserClient,
+    abort_response,
+    iter_json_array,
+)
 from rarapla.models.channel import Channel
 
 
@@ -30,6 +40,7 @@ class DummySession:
         url: str,
         params: dict[str, str] | None = None,
         timeout: float | None = None,
+        stream: bool = False,
     ):
         self.last_url = url
         self.last_params = params
@@ -43,6 +54,7 @@ def test_search_japan_parses_response() -> None:
             "name": "Test Station",
             "favicon": "http://logo.png",
             "url_resolved": "http://stream",
+            "tags": "Jazz, lounge,,jazz",
         },
         {
             "stationuuid": "",  # invalid item should be ignored
@@ -66,6 +78,7 @@ def test_search_japan_parses_response() -> None:
     assert ch.name == "Test Station"
     assert ch.logo_url == "http://logo.png"
     assert ch.stream_url == "http://stream"
+    assert ch.tags == ("jazz", "lounge")
 
 
 def test_search_by_tag_builds_params(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -101,3 +114,95 @@ def test_notify_click_ignores_errors() -> None:
     # Should not raise even though session.get raises
     cli.notify_click("uuid123")
     assert called["url"] == "http://api/json/url/uuid123"
+
+
+def test_iter_json_array_across_chunk_boundaries() -> None:
+    raw = json.dumps(
+        [{"name": "ラジオ", "n": 1}, {"name": "b", "n": [1, 2]}, 3, "x"],
+        ensure_ascii=False,
+    ).encode("utf-8")
+    chunks = [raw[i : i + 5] for i in range(0, len(raw), 5)]
+    assert list(iter_json_array(chunks)) == [
+        {"name": "ラジオ", "n": 1},
+        {"name": "b", "n": [1, 2]},
+        3,
+        "x",
+    ]
+    assert list(iter_json_array([b" [ ] "])) == []
+
+
+def test_iter_search_pages_with_offset() -> None:
+    stations = [
+        {"stationuuid": f"u{i}", "name": f"S{i}", "url": f"http://s/{i}"}
+        for i in range(7)
+    ]
+    calls: list[dict[str, str]] = []
+
+    class _StreamResp:
+        status_code = 200
+
+        def __init__(self, items: list[dict[str, str]]) -> None:
+            self._raw = json.dumps(items).encode()
+
+        def raise_for_status(self) -> None:
+            pass
+
+        def iter_content(self, size: int):
+            return iter([self._raw[i : i + 7] for i in range(0, len(self._raw), 7)])
+
+        def close(self) -> None:
+            pass
+
+    class _PagedSession:
+        headers: dict[str, str] = {}
+
+        def get(self, url, params=None, timeout=None, stream=False):
+            calls.append(params)
+            off, lim = int(params["offset"]), int(params["limit"])
+            return _StreamResp(stations[off : off + lim])
+
+    cli = RadioBrowserClient(base="http://api", session=_PagedSession())
+    batches = list(cli.iter_by_tag("jazz", limit=100, page_size=3))
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert batches[2][0].id == "rb:u6"
+    assert [c["offset"] for c in calls] == ["0", "3", "6"]
+    assert all(c["tag"] == "jazz" for c in calls)
+    calls.clear()
+    assert sum(len(b) for b in cli.iter_japan(limit=4, page_size=3)) == 4
+    assert [c["limit"] for c in calls] == ["3", "1"]
+
+
+class _SlowStations(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b"[")
+        for i in range(50):
+            item = {"stationuuid": f"u{i}", "name": "S", "url": "http://s"}
+            try:
+                self.wfile.write(json.dumps(item).encode() + b",")
+                self.wfile.flush()
+            except OSError:
+                return
+            time.sleep(0.1)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def test_abort_response_stops_a_blocked_download() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowStations)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    opened: list[requests.Response] = []
+    cli = RadioBrowserClient(base=f"http://127.0.0.1:{server.server_address[1]}")
+    threading.Timer(0.3, lambda: abort_response(opened[0])).start()
+    started = time.monotonic()
+    try:
+        with pytest.raises(ValueError):
+            list(cli.iter_japan(limit=50, page_size=50, on_response=opened.append))
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert time.monotonic() - started < 2
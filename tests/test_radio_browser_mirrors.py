@@ -0,0 +1,158 @@
+import threading
+from typing import Any
+
+import pytest
+import requests
+from rarapla.data.radio_browser_client import RadioBrowserClient
+from rarapla.data.radio_browser_mirrors import RadioBrowserMirrors, parse_server_list
+
+
+class _Resp:
+    def __init__(self, json_data: Any = None, status_code: int = 200) -> None:
+        self._json = json_data
+        self.status_code = status_code
+        self.closed = False
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+    def json(self) -> Any:
+        return self._json
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _MirrorSession:
+    """Answer requests per host.
+
+    Hosts in ``down`` refuse connections and hosts in ``broken`` answer 503.
+    """
+
+    def __init__(
+        self,
+        servers: Any,
+        down: set[str] | None = None,
+        broken: set[str] | None = None,
+    ) -> None:
+        self.servers = servers
+        self.down = down or set()
+        self.broken = broken or set()
+        self.headers: dict[str, str] = {}
+        self.calls: list[str] = []
+        self.responses: list[_Resp] = []
+
+    def get(
+        self, url: str, params: Any = None, timeout: Any = None, stream: bool = False
+    ) -> _Resp:
+        self.calls.append(url)
+        host = url.split("/")[2]
+        if host in self.down:
+            raise requests.ConnectionError(host)
+        if host in self.broken and url.endswith("/json/stations/search"):
+            self.responses.append(_Resp(status_code=503))
+            return self.responses[-1]
+        if url.endswith("/json/servers"):
+            return _Resp(self.servers)
+        if url.endswith("/json/stations/search"):
+            return _Resp([])
+        return _Resp({})
+
+
+def test_parse_server_list(rb_servers_json: list[dict[str, str]]) -> None:
+    assert parse_server_list(rb_servers_json) == [
+        "https://de1.api.radio-browser.info",
+        "https://de2.api.radio-browser.info",
+        "https://fi1.api.radio-browser.info",
+    ]
+
+
+def test_discover_falls_back_to_server_list(
+    rb_servers_json: list[dict[str, str]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    sess = _MirrorSession(rb_servers_json)
+    mirrors = RadioBrowserMirrors(sess)
+    monkeypatch.setattr(mirrors, "_discover_dns", lambda: [])
+    assert len(mirrors.discover()) == 3
+
+
+def test_fastest_mirror_is_pinned(
+    rb_servers_json: list[dict[str, str]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    mirrors = RadioBrowserMirrors(_MirrorSession(rb_servers_json))
+    monkeypatch.setattr(mirrors, "_discover_dns", lambda: [])
+    latency = {
+        "https://de1.api.radio-browser.info": 0.30,
+        "https://de2.api.radio-browser.info": 0.05,
+        "https://fi1.api.radio-browser.info": None,
+    }
+    monkeypatch.setattr(mirrors, "_probe_one", latency.__getitem__)
+    assert mirrors.candidates() == [
+        "https://de2.api.radio-browser.info",
+        "https://de1.api.radio-browser.info",
+        "https://fi1.api.radio-browser.info",
+    ]
+    mirrors.mark_failed("https://de2.api.radio-browser.info")
+    assert mirrors.current() == "https://de1.api.radio-browser.info"
+
+
+def test_search_fails_over_to_next_mirror() -> None:
+    sess = _MirrorSession([], down={"a.example"})
+    mirrors = RadioBrowserMirrors(
+        sess, servers=["http://a.example", "http://b.example"]
+    )
+    mirrors._probe_one = lambda base: 0.1 if "a." in base else 0.2
+    cli = RadioBrowserClient(session=sess, mirrors=mirrors)
+    assert cli.search_japan(limit=1) == []
+    assert sess.calls[-1] == "http://b.example/json/stations/search"
+    assert cli.base == "http://b.example"
+
+
+def test_server_error_response_is_closed_before_failover() -> None:
+    sess = _MirrorSession([], broken={"a.example"})
+    mirrors = RadioBrowserMirrors(
+        sess, servers=["http://a.example", "http://b.example"]
+    )
+    mirrors._probe_one = lambda base: 0.1 if "a." in base else 0.2
+    cli = RadioBrowserClient(session=sess, mirrors=mirrors)
+    assert cli.search_japan(limit=1) == []
+    assert [r.closed for r in sess.responses] == [True]
+    assert cli.base == "http://b.example"
+
+
+def test_discovery_runs_once_and_outside_the_lock(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    mirrors = RadioBrowserMirrors(_MirrorSession([]))
+    entered = threading.Event()
+    release = threading.Event()
+    calls: list[int] = []
+
+    def _slow_discover() -> list[str]:
+        calls.append(1)
+        entered.set()
+        assert release.wait(5)
+        return ["http://only.example"]
+
+    monkeypatch.setattr(mirrors, "discover", _slow_discover)
+    results: list[list[str]] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(mirrors.candidates()))
+        for _ in range(3)
+    ]
+    for t in threads:
+        t.start()
+    try:
+        assert entered.wait(5)
+        # The lock stays free while the slow discovery runs.
+        demote = threading.Thread(target=mirrors.mark_failed, args=("http://x",))
+        demote.start()
+        demote.join(1)
+        assert not demote.is_alive()
+    finally:
+        release.set()
+        for t in threads:
+            t.join(5)
+    assert calls == [1]
+    assert results == [["http://only.example"]] * 3
@@ -0,0 +1,24 @@
+from rarapla.services.result_cache import ResultCache
+
+
+def test_entries_expire_after_ttl() -> None:
+    now = [0.0]
+    cache: ResultCache[str, list[int]] = ResultCache(60, 4, clock=lambda: now[0])
+    cache.put("jazz", [1, 2])
+    now[0] = 59.0
+    assert cache.get("jazz") == [1, 2]
+    now[0] = 60.0
+    assert cache.get("jazz") is None
+    assert cache.get("missing") is None
+
+
+def test_least_recently_used_is_dropped() -> None:
+    cache: ResultCache[str, int] = ResultCache(60, 2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    cache.clear()
+    assert cache.get("a") is None
@@ -0,0 +1,58 @@
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from rarapla.data.session_store import SessionStore
+from rarapla.models.channel import Channel
+from rarapla.models.session import SessionState
+
+_JST = timezone(timedelta(hours=9))
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    channels = [
+        Channel(
+            "FMT",
+            "TOKYO FM",
+            "http://logo/fmt.png",
+            "Morning",
+            None,
+            program_end=datetime(2025, 1, 2, 13, 0, tzinfo=_JST),
+        ),
+        Channel(
+            "rb:1", "Jazz FM", None, "", None, stream_url="http://s/1", tags=("jazz",)
+        ),
+    ]
+    state = SessionState("RB: Jazz", "rb:1", 40, "0a0b", channels, 1_700_000_000.0)
+    store = SessionStore(str(tmp_path / "session.json"))
+    store.save(state)
+    assert store.load() == state
+    assert [p.name for p in tmp_path.iterdir()] == ["session.json"]
+
+
+def test_missing_or_broken_files(tmp_path: Path) -> None:
+    path = tmp_path / "session.json"
+    store = SessionStore(str(path))
+    assert store.load() is None
+    path.write_text("{not json", encoding="utf-8")
+    assert store.load() is None
+    path.write_text(
+        json.dumps(
+            {
+                "source": "radiko (area)",
+                "volume": "loud",
+                "saved_at": "yesterday",
+                "channels": [
+                    {"id": "FMT", "name": "TOKYO FM"},
+                    {"name": "no id"},
+                    {"id": "X", "name": "X", "program_end": "soon"},
+                    "junk",
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    state = store.load()
+    assert state is not None
+    assert [ch.id for ch in state.channels] == ["FMT"]
+    assert state.volume is None and state.saved_at == 0.0
@@ -0,0 +1,78 @@
+import os
+import threading
+from collections.abc import Callable
+
+import conftest as ct
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+from rarapla.services.task_executor import CancelToken  # noqa: E402
+from rarapla.ui.controllers.startup_orchestrator import (  # noqa: E402
+    StartupOrchestrator,
+)
+from rarapla.ui.utils.task_runner import TaskRunner  # noqa: E402
+
+
+def test_phases_run_side_by_side(qapp: QApplication) -> None:
+    tasks = TaskRunner()
+    startup = StartupOrchestrator(tasks)
+    both_running = threading.Barrier(2, timeout=2)
+    events: list[str] = []
+
+    def _phase(name: str) -> Callable[[CancelToken], str]:
+        def _fn(_token: CancelToken) -> str:
+            both_running.wait()
+            return name
+
+        return _fn
+
+    startup.phaseFinished.connect(lambda name, _ms: events.append(name))
+    startup.run("area", _phase("area"), lambda r: events.append(f"got {r}"))
+    startup.run("proxy", _phase("proxy"))
+    startup.after("proxy", lambda: events.append("after proxy"))
+    ct.wait_until(lambda: startup.is_done("area") and startup.is_done("proxy"))
+    tasks.shutdown()
+    assert events.index("got area") < events.index("area")
+    assert events.index("proxy") < events.index("after proxy")
+    assert set(startup.finished_at()) == {"area", "proxy"}
+
+
+def test_after_a_finished_phase_runs_at_once_and_failures_drop_waiters(
+    qapp: QApplication,
+) -> None:
+    tasks = TaskRunner()
+    startup = StartupOrchestrator(tasks)
+    calls: list[str] = []
+    failed: list[tuple[str, str]] = []
+    startup.phaseFailed.connect(lambda name, msg: failed.append((name, msg)))
+    startup.finish("channels")
+    startup.finish("channels")
+    startup.after("channels", lambda: calls.append("channels"))
+    assert calls == ["channels"]
+
+    def _boom(_token: CancelToken) -> None:
+        raise RuntimeError("no network")
+
+    startup.after("resolve", lambda: calls.append("resolve"))
+    startup.run("resolve", _boom)
+    ct.wait_until(lambda: bool(failed))
+    tasks.shutdown()
+    assert failed == [("resolve", "no network")]
+    assert calls == ["channels"] and not startup.is_done("resolve")
+
+
+def test_failed_phase_calls_failure_callbacks(qapp: QApplication) -> None:
+    tasks = TaskRunner()
+    startup = StartupOrchestrator(tasks)
+    calls: list[str] = []
+    startup.after("proxy", lambda: calls.append("ready"))
+    startup.after("proxy", lambda: calls.append("ready"), calls.append)
+    startup.fail("proxy", "port in use")
+    assert calls == ["port in use"]
+    assert startup.error("proxy") == "port in use"
+    startup.after("proxy", lambda: calls.append("ready"), calls.append)
+    assert calls == ["port in use", "port in use"]
+    startup.finish("proxy")
+    assert startup.error("proxy") is None and startup.is_done("proxy")
+    tasks.shutdown()
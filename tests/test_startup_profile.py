@@ -0,0 +1,48 @@
+import subprocess
+import sys
+
+from rarapla.startup_profile import format_report, parse_importtime
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _json
+import time:       300 |        420 | json
+import time:      5000 |       5000 |     aiohttp.connector
+import time:       900 |       5900 |   aiohttp
+import time:      1000 |       6900 | rarapla.proxy
+some other stderr line
+"""
+
+
+def test_parse_importtime_reads_depth_and_times() -> None:
+    timings = parse_importtime(SAMPLE.splitlines())
+    assert [(t.module, t.depth) for t in timings] == [
+        ("_json", 1),
+        ("json", 0),
+        ("aiohttp.connector", 2),
+        ("aiohttp", 1),
+        ("rarapla.proxy", 0),
+    ]
+    assert timings[2].self_us == 5000
+    assert timings[4].cumulative_us == 6900
+
+
+def test_format_report_lists_phases_packages_and_modules() -> None:
+    timings = parse_importtime(SAMPLE.splitlines())
+    text = format_report(timings, [("imports", 12.5), ("window", 40.0)], 99.0)
+    assert "+   27.5  window" in text
+    assert "6.9 ms  rarapla" in text
+    assert text.index("aiohttp.connector") < text.index("rarapla.proxy")
+
+
+def test_window_side_modules_defer_network_stacks() -> None:
+    code = (
+        "import sys\n"
+        "import rarapla.data.radiko_resolver, rarapla.services.stream_prober\n"
+        "import rarapla.services.icy_watcher, rarapla.proxy.ports\n"
+        "print(sorted(m for m in ('aiohttp', 'streamlink') if m in sys.modules))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "[]"
@@ -0,0 +1,149 @@
+import asyncio
+from typing import Any
+
+import aiohttp
+import conftest as ct
+import pytest
+from rarapla.models.channel import Channel
+from rarapla.services.stream_prober import (
+    StreamHealth,
+    StreamProber,
+    bitrate_from_headers,
+    codec_from_headers,
+    rank_channels,
+)
+from rarapla.services.task_executor import CancelToken, TaskCancelled
+
+
+class _Content:
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def read(self, n: int) -> bytes:
+        return self._body[:n]
+
+
+class _Resp:
+    def __init__(self, status: int, headers: dict[str, str], body: bytes) -> None:
+        self.status = status
+        self.headers = headers
+        self.content = _Content(body)
+
+    async def __aenter__(self) -> "_Resp":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> bool:
+        return False
+
+
+class _Session:
+    def __init__(self, table: dict[str, Any]) -> None:
+        self._table = table
+        self.calls: list[str] = []
+        self.active = 0
+        self.max_active = 0
+
+    def get(self, url: str, headers: dict[str, str] | None = None) -> Any:
+        self.calls.append(url)
+        entry = self._table.get(url)
+        session = self
+
+        class _Ctx:
+            async def __aenter__(self) -> _Resp:
+                session.active += 1
+                session.max_active = max(session.max_active, session.active)
+                await asyncio.sleep(0.01)
+                if isinstance(entry, Exception):
+                    raise entry
+                if entry is None:
+                    return _Resp(404, {}, b"")
+                return _Resp(*entry)
+
+            async def __aexit__(self, *exc: Any) -> bool:
+                session.active -= 1
+                return False
+
+        return _Ctx()
+
+
+def _ch(n: int) -> Channel:
+    return Channel(f"rb:{n}", f"S{n}", None, "", None, f"http://s/{n}")
+
+
+def test_codec_and_bitrate_from_headers() -> None:
+    assert codec_from_headers({"Content-Type": "audio/aacp; charset=x"}) == "AAC+"
+    assert codec_from_headers({}, b"OggS\x00") == "OGG"
+    assert codec_from_headers({}, b"#EXTM3U\n#EXT-X-VERSION:3") == "HLS"
+    assert bitrate_from_headers({"icy-br": "128,128"}) == 128
+    info = {"ice-audio-info": "ice-samplerate=44100;ice-bitrate=192"}
+    assert bitrate_from_headers(info) == 192
+    assert bitrate_from_headers({"icy-br": "n/a"}) is None
+
+
+def test_probe_all_records_health() -> None:
+    sess = _Session(
+        {
+            "http://s/1": (200, {"Content-Type": "audio/mpeg", "icy-br": "64"}, b"ID3"),
+            "http://s/2": (503, {}, b""),
+            "http://s/3": aiohttp.ClientConnectionError("refused"),
+        }
+    )
+    prober = StreamProber(session=sess)
+    res = ct.run(prober.probe_all(["http://s/1", "http://s/2", "http://s/3"]))
+    assert res["http://s/1"].ok
+    assert res["http://s/1"].codec == "MP3"
+    assert res["http://s/1"].bitrate == 64
+    assert res["http://s/1"].connect_sec is not None
+    assert not res["http://s/2"].ok and res["http://s/2"].error == "HTTP 503"
+    assert not res["http://s/3"].ok
+
+
+def test_probe_all_bounds_parallelism_and_caches() -> None:
+    urls = [f"http://s/{i}" for i in range(10)]
+    sess = _Session({u: (200, {}, b"\xff\xfb") for u in urls})
+    prober = StreamProber(session=sess, concurrency=3)
+    ct.run(prober.probe_all(urls))
+    assert sess.max_active <= 3
+    ct.run(prober.probe_all(urls))
+    assert len(sess.calls) == 10
+    assert prober.cached("http://s/0") is not None
+
+
+def test_cancelled_run_stops_and_keeps_finished_probes() -> None:
+    urls = [f"http://s/{i}" for i in range(10)]
+    token = CancelToken()
+
+    class _Cancelling(_Session):
+        def get(self, url: str, headers: dict[str, str] | None = None) -> Any:
+            if len(self.calls) == 3:
+                token.cancel()
+            return super().get(url, headers)
+
+    sess = _Cancelling({u: (200, {}, b"\xff\xfb") for u in urls})
+    prober = StreamProber(session=sess, concurrency=1)
+    with pytest.raises(TaskCancelled):
+        prober.probe_many(urls, token)
+    assert len(sess.calls) == 4
+    done = [u for u in urls if prober.cached(u) is not None]
+    assert done == urls[:3]
+    prober.probe_many(urls)
+    assert sess.calls[4:] == urls[3:]
+
+
+def test_cache_expires() -> None:
+    sess = _Session({"http://s/1": (200, {}, b"x")})
+    prober = StreamProber(session=sess, ttl_sec=0)
+    ct.run(prober.probe_all(["http://s/1"]))
+    ct.run(prober.probe_all(["http://s/1"]))
+    assert len(sess.calls) == 2
+
+
+def test_rank_channels_puts_fast_healthy_first() -> None:
+    chs = [_ch(i) for i in range(4)]
+    health = {
+        "http://s/0": StreamHealth("http://s/0", ok=False, error="timeout"),
+        "http://s/1": StreamHealth("http://s/1", ok=True, connect_sec=0.5),
+        "http://s/2": StreamHealth("http://s/2", ok=True, connect_sec=0.1),
+    }
+    ranked = rank_channels(chs, health)
+    assert [c.id for c in ranked] == ["rb:2", "rb:1", "rb:3", "rb:0"]
@@ -0,0 +1,152 @@
+import threading
+
+import pytest
+
+from rarapla.services.task_executor import (
+    CancelToken,
+    Priority,
+    TaskCancelled,
+    TaskExecutor,
+)
+
+
+def _blocker(ex: TaskExecutor) -> threading.Event:
+    """Occupy the executor's single worker until the event is set."""
+    gate = threading.Event()
+    started = threading.Event()
+
+    def _block(_token: CancelToken) -> None:
+        started.set()
+        gate.wait(5)
+
+    ex.submit(_block)
+    assert started.wait(5)
+    return gate
+
+
+def test_runs_most_urgent_first() -> None:
+    ex = TaskExecutor(max_workers=1)
+    gate = _blocker(ex)
+    order: list[str] = []
+    handles = [
+        ex.submit(lambda _t: order.append("bg"), priority=Priority.BACKGROUND),
+        ex.submit(lambda _t: order.append("normal")),
+        ex.submit(lambda _t: order.append("user"), priority=Priority.USER),
+    ]
+    gate.set()
+    for h in handles:
+        h.future.result(5)
+    assert order == ["user", "normal", "bg"]
+    ex.shutdown(wait=True)
+
+
+def test_same_key_shares_one_run_and_promotes() -> None:
+    ex = TaskExecutor(max_workers=1)
+    gate = _blocker(ex)
+    calls: list[int] = []
+    order: list[str] = []
+    first = ex.submit(
+        lambda _t: calls.append(1) or order.append("keyed") or "now",
+        priority=Priority.BACKGROUND,
+        key="radiko:now",
+    )
+    ex.submit(lambda _t: order.append("normal"))
+    second = ex.submit(lambda _t: "other", priority=Priority.USER, key="radiko:now")
+    assert second is first
+    gate.set()
+    assert first.future.result(5) == "now"
+    assert calls == [1]
+    ex.shutdown(wait=True)
+    assert order[0] == "keyed"
+    assert ex.metrics().deduplicated == 1
+
+
+def test_cancel_queued_and_running() -> None:
+    ex = TaskExecutor(max_workers=1)
+    running = threading.Event()
+
+    def _loop(token: CancelToken) -> None:
+        running.set()
+        while True:
+            token.raise_if_cancelled()
+            threading.Event().wait(0.01)
+
+    busy = ex.submit(_loop, key="loop")
+    queued = ex.submit(lambda _t: "never")
+    assert running.wait(5)
+    queued.cancel()
+    ex.cancel_key("loop")
+    with pytest.raises(TaskCancelled):
+        busy.future.result(5)
+    assert queued.future.cancelled()
+    again = ex.submit(lambda _t: "fresh", key="loop")
+    assert again is not busy
+    assert again.future.result(5) == "fresh"
+    ex.shutdown(wait=True)
+    m = ex.metrics()
+    assert m.cancelled == 2
+    assert m.completed == 1
+
+
+def test_metrics_and_shutdown() -> None:
+    ex = TaskExecutor(max_workers=2)
+
+    def _boom(_token: CancelToken) -> None:
+        raise ValueError("boom")
+
+    assert ex.submit(lambda _t: 42).future.result(5) == 42
+    with pytest.raises(ValueError):
+        ex.submit(_boom).future.result(5)
+    m = ex.metrics()
+    assert (m.completed, m.failed, m.queued, m.running) == (1, 1, 0, 0)
+    assert m.avg_wait_ms >= 0 and m.avg_run_ms >= 0
+    ex.shutdown(wait=True)
+    with pytest.raises(RuntimeError):
+        ex.submit(lambda _t: None)
+
+
+def test_cancel_callbacks_abort_blocking_work() -> None:
+    ex = TaskExecutor(max_workers=1)
+    aborted = threading.Event()
+    calls: list[str] = []
+
+    def _download(token: CancelToken) -> None:
+        token.add_callback(aborted.set)
+        token.add_callback(lambda: calls.append("once"))
+        aborted.wait(5)
+        raise OSError("connection closed")
+
+    handle = ex.submit(_download)
+    threading.Event().wait(0.05)
+    handle.cancel()
+    handle.cancel()
+    with pytest.raises(TaskCancelled):
+        handle.future.result(5)
+    ex.shutdown(wait=True)
+    assert calls == ["once"]
+    assert (ex.metrics().cancelled, ex.metrics().failed) == (1, 0)
+    late = CancelToken()
+    late.cancel()
+    late.add_callback(lambda: calls.append("late"))
+    assert calls == ["once", "late"]
+
+
+def test_background_jobs_leave_a_worker_for_user_tasks() -> None:
+    ex = TaskExecutor(max_workers=4, reserve_user_worker=True)
+    gate = threading.Event()
+    started = threading.Semaphore(0)
+
+    def _long(_token: CancelToken) -> None:
+        started.release()
+        gate.wait(5)
+
+    background = [ex.submit(_long, priority=Priority.BACKGROUND) for _ in range(6)]
+    for _ in range(3):
+        assert started.acquire(timeout=5)
+    assert not started.acquire(timeout=0.1)
+    user = ex.submit(lambda _t: "user", priority=Priority.USER)
+    assert user.future.result(1) == "user"
+    gate.set()
+    for h in background:
+        h.future.result(5)
+    ex.shutdown(wait=True)
@@ -0,0 +1,41 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import Qt  # noqa: E402
+from PySide6.QtGui import QFont, QFontMetrics  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+from rarapla.ui.utils.text_layout import TextLayoutCache, soft_wrap  # noqa: E402
+
+
+def test_soft_wrap_breaks_long_latin_runs() -> None:
+    assert soft_wrap("abcdefghij", chunk=4) == "abcd\u200befgh\u200bij"
+    assert soft_wrap("short 番組", chunk=8) == "short 番組"
+    assert soft_wrap("") == ""
+
+
+def test_elide_is_memoized_per_font_and_width(qapp: QApplication) -> None:
+    cache = TextLayoutCache()
+    font = QFont()
+    text = "A fairly long program title that will not fit"
+    out = cache.elide(text, font, 80)
+    assert out == QFontMetrics(font).elidedText(text, Qt.TextElideMode.ElideRight, 80)
+    assert cache.elide(text, font, 80) is out
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.elide(text, font, 120)
+    bold = QFont(font)
+    bold.setBold(True)
+    cache.elide(text, bold, 80)
+    assert cache.misses == 3
+    cache.invalidate()
+    cache.elide(text, font, 80)
+    assert cache.misses == 4
+
+
+def test_entries_are_capped(qapp: QApplication) -> None:
+    cache = TextLayoutCache(max_entries=2)
+    for word in ("one", "two", "three"):
+        cache.soft_wrap(word)
+    cache.soft_wrap("three")
+    cache.soft_wrap("one")
+    assert (cache.hits, cache.misses) == (1, 4)